@@ -1,3 +1,4 @@
+import os
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -7,84 +8,100 @@ import streamlit as st
 import plotly.express as px
 import plotly.graph_objects as go
 
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+import ipl_analytics
+
 st.set_page_config(
     page_title="IPL Analytics Dashboard",
     page_icon="🏏",
     layout="wide"
 )
 
-# --- ROBUST CSV LOADING FUNCTION ---
-def robust_csv_load(file_path):
+@st.cache_resource
+def get_result_cache():
+    # One LRU per process, shared by every session (size: IPL_RESULT_CACHE_SIZE)
+    return ipl_analytics.ResultCache()
+
+# Built figures are reused while their input data and options are unchanged
+FIGURE_CACHE_SIZE = int(os.environ.get("IPL_FIGURE_CACHE_SIZE", "128"))
+# Line / scatter series at least this long are drawn with WebGL traces
+WEBGL_MIN_POINTS = 1000
+# Seasons simulated for the Overview's forecast (IPL_FORECAST_SIMULATIONS)
+FORECAST_SIMULATIONS = int(os.environ.get("IPL_FORECAST_SIMULATIONS", "20000"))
+
+@st.cache_resource(max_entries=FIGURE_CACHE_SIZE)
+def build_figure(kind, data_hash, _data, traces=None, layout=None, **kwargs):
+    # Keyed on the content hash of the data (not the frame object), so an
+    # identical chart on a later rerun or in another session is not rebuilt.
+    # The returned figure is shared: never mutate it.
+    if kind == "binned":
+        # Pre-binned histogram (see ipl_analytics.stats.binned_counts)
+        fig = px.bar(_data, x="bin_mid", y="count", hover_data=["bin_start", "bin_end"], **kwargs)
+        fig.update_traces(width=(_data["bin_end"] - _data["bin_start"]).to_numpy())
+    else:
+        if kind in ("line", "scatter") and len(_data) >= WEBGL_MIN_POINTS:
+            kwargs["render_mode"] = "webgl"
+        fig = getattr(px, kind)(_data, **kwargs)
+    if traces:
+        fig.update_traces(**traces)
+    if layout:
+        fig.update_layout(**layout)
+    return fig
+
+def figure(kind, data, traces=None, layout=None, **kwargs):
+    """A plotly.express chart of `data`, cached by the hash of its contents and options."""
+    return build_figure(kind, ipl_analytics.frame_hash(data), data, traces, layout, **kwargs)
+
+@st.cache_resource
+def load_engine(version):
+    # All loading, filtering and statistics live in the headless ipl_analytics
+    # engine; this app only renders its results. One engine per dataset version.
+    # IPL_BACKEND=sqlite answers the same queries from a shared on-disk store.
+    backend = ipl_analytics.loader.BACKEND
+    if backend not in ipl_analytics.loader.BACKENDS:
+        raise ValueError(f"Unknown IPL_BACKEND '{backend}'; use one of {', '.join(ipl_analytics.loader.BACKENDS)}")
+    if backend == "sqlite":
+        return ipl_analytics.SQLEngine.load(result_cache=get_result_cache())
+    return ipl_analytics.IPLEngine.load(result_cache=get_result_cache())
+
+# Per-run stage timings: shown in the sidebar, logged as JSON lines (IPL_PROFILE_LOG).
+# A full rerun records into `profiler`; a section rerunning on its own (a
+# fragment-only run) gets its own profiler and run id, see fragment_profiler.
+ipl_analytics.profiling.configure_log()
+# Recent runs of this session (full reruns and fragment runs) kept for the sidebar
+PROFILE_HISTORY = 20
+
+def start_profiled_run(**context):
+    run = ipl_analytics.RunProfiler(app="dashboard", **context)
+    runs = st.session_state.setdefault("profiled_runs", [])
+    runs.append(run)
+    del runs[:-PROFILE_HISTORY]
+    return run
+
+def fragment_profiler(section):
     """
-    Handles CSV files where the entire row is wrapped in quotes, 
-    causing pandas to read it as a single column.
-    
-    This version includes a fix for mismatched column counts between 
-    the header and data rows.
+    The profiler for this run of a section: the page's during a full rerun,
+    a new one when only the section's fragment reruns (the page's belongs
+    to an earlier run by then).
     """
-    
-    # 1. Read the file assuming potential single-column structure
-    df_temp = pd.read_csv(file_path, header=None, encoding='utf-8')
-    
-    if df_temp.shape[1] == 1:
-        data_series = df_temp.iloc[:, 0]
-        
-        # Clean the header (first element) to get the true column names
-        header_str = data_series.iloc[0].strip().strip('"')
-        new_cols = [col.strip().strip('"') for col in header_str.split(',')]
-        
-        # Create a new DataFrame by splitting the remaining rows (data)
-        data_rows = data_series.iloc[1:]
-        
-        # Split and clean each row string, expanding into multiple columns
-        new_data = data_rows.str.strip().str.strip('"').str.split(',', expand=True)
-        
-        # Slice the data columns to match the length of the cleaned header
-        num_header_cols = len(new_cols)
-        
-        if new_data.shape[1] != num_header_cols:
-            new_data = new_data.iloc[:, :num_header_cols]
-        
-        new_data.columns = new_cols
-        
-        # Convert known numeric columns
-        numeric_cols = ['id', 'match_id', 'season', 'batsman_runs', 'extra_runs', 'total_runs', 'is_wicket', 'result_margin', 'target_runs', 'target_overs']
-        for col in numeric_cols:
-            if col in new_data.columns:
-                new_data[col] = pd.to_numeric(new_data[col], errors='coerce')
-        
-        return new_data
-    else:
-        # If the file was read correctly, return it
-        return df_temp
-
-@st.cache_data
-def load_data():
-    # Load data using the robust function with your local paths
-    match_path = "C:\\Users\\simar\\OneDrive\\Desktop\\data\\matches (2).csv"
-    deliv_path = "C:\\Users\\simar\\OneDrive\\Desktop\\data\\deliveries (1).csv"
-    
-    matches = robust_csv_load(match_path)
-    deliveries = robust_csv_load(deliv_path)
-    
-    # FIX APPLIED HERE: Ensure 'season' is a float before conversion below
-    if 'season' in matches.columns and matches['season'].dtype == object:
-        # This extracts the year (e.g., '2007/08' -> 2008.0)
-        matches['season'] = pd.to_numeric(matches['season'].astype(str).str.extract(r'(\d{4})')[0], errors='coerce')
-        
-    return matches, deliveries
+    ctx = get_script_run_ctx()
+    if ctx is not None and ctx.fragment_ids_this_run:
+        return start_profiled_run(fragment=section)
+    return profiler
+
+profiler = start_profiled_run()
 
 # Load data, suppressing the error that occurred previously
 try:
-    matches, deliveries = load_data()
+    with profiler.stage("data_load") as stage:
+        # Fingerprint of the source files; every cached result below is keyed on it
+        engine = load_engine(ipl_analytics.dataset_version())
+        stage["rows"] = engine.delivery_count()
 except ValueError as e:
     st.error(f"Data Loading Error: {e}. Please ensure your CSV files are correctly formatted and the paths are accurate.")
     st.stop() 
 
-
-if "date" in matches.columns:
-    matches["date"] = pd.to_datetime(matches["date"])
-
 st.title("🏏 IPL Analytics Dashboard")
 
 st.markdown(
@@ -96,31 +113,15 @@ Use the sidebar filters and tabs to explore teams, players, venues and seasons.
 
 st.sidebar.header("Filters")
 
-# FIX APPLIED HERE: Convert seasons to integer (or string) after cleaning NaNs
-if "season" in matches.columns:
-    # Drop NaN, convert to int (which removes the .0), and then sort
-    seasons = sorted(matches["season"].dropna().astype(int).unique())
-else:
-    seasons = []
-    
+seasons = engine.seasons
+
 selected_seasons = st.sidebar.multiselect(
     "Select Seasons",
     options=seasons,
     default=seasons
 )
 
-teams = sorted(
-    pd.unique(
-        pd.concat(
-            [
-                matches["team1"],
-                matches["team2"],
-                matches["winner"]
-            ],
-            axis=0
-        ).dropna()
-    )
-)
+teams = engine.teams
 
 selected_team = st.sidebar.selectbox(
     "Focus Team (optional)",
@@ -128,26 +129,37 @@ selected_team = st.sidebar.selectbox(
     index=0
 )
 
-if selected_seasons:
-    matches_f = matches[matches["season"].isin(selected_seasons)]
-else:
-    matches_f = matches.copy()
+with profiler.stage("season_filter") as stage:
+    matches_f = engine.matches_for(selected_seasons)
+    delivery_rows = engine.delivery_count(selected_seasons)
+    stage["rows"] = len(matches_f) + delivery_rows
 
-deliveries_f = deliveries[deliveries["match_id"].isin(matches_f["id"])]
+TAB_NAMES = [
+    "Overview", "Team Analysis", "Batting Analysis", "Bowling Analysis", "Phases & Partnerships",
+    "Auction Value",
+]
 
-tab1, tab2, tab3, tab4 = st.tabs(
-    ["Overview", "Team Analysis", "Batting Analysis", "Bowling Analysis"]
-)
+# "lazy" (default) renders only the selected section; "tabs" restores
+# st.tabs, which runs every tab body on each rerun.
+TAB_MODE = os.environ.get("IPL_TAB_MODE", "lazy")
+
+# Each section is a fragment: its own widgets (top-N sliders, venue, batter
+# and bowler pickers) rerun just that section, not the whole page.
 # ----------------------------------------------------------------------
 ## Tab 1: Overview
 # ----------------------------------------------------------------------
-with tab1:
+@st.fragment
+def render_overview():
+    profiler = fragment_profiler("overview")
     st.subheader("Overall Tournament Overview")
 
     col1, col2, col3, col4 = st.columns(4)
-    total_matches = len(matches_f)
-    total_seasons = matches_f["season"].nunique() if "season" in matches_f.columns else 0
-    total_venues = matches_f["venue"].nunique() if "venue" in matches_f.columns else 0
+    with profiler.stage("overview.aggregate", rows=len(matches_f)):
+        overview = engine.overview(selected_seasons)
+    totals = overview["totals"]
+    total_matches = totals["matches"]
+    total_seasons = totals["seasons"]
+    total_venues = totals["venues"]
     total_teams = len(teams)
 
     col1.metric("Total Matches", total_matches)
@@ -156,114 +168,157 @@ with tab1:
     col4.metric("Teams", total_teams)
 
     if "season" in matches_f.columns:
-        matches_per_season = (
-            matches_f.groupby("season")["id"]
-            .count()
-            .reset_index()
-            .rename(columns={"id": "matches"})
-        )
-        # Ensure x-axis values are integers for display
-        matches_per_season['season'] = matches_per_season['season'].astype(int)
+        matches_per_season = overview["matches_per_season"]
         
-        fig_mps = px.bar(
-            matches_per_season,
-            x="season",
-            y="matches",
-            title="Matches per Season",
-            text="matches"
-        )
-        fig_mps.update_traces(textposition="outside")
-        st.plotly_chart(fig_mps, use_container_width=True)
+        with profiler.stage("overview.figure.matches_per_season", rows=len(matches_per_season)):
+            fig_mps = figure(
+                "bar",
+                matches_per_season,
+                x="season",
+                y="matches",
+                title="Matches per Season",
+                text="matches",
+                traces={"textposition": "outside"}
+            )
+            st.plotly_chart(fig_mps, width="stretch")
 
     if "toss_decision" in matches_f.columns:
-        toss_counts = matches_f["toss_decision"].value_counts().reset_index()
-        toss_counts.columns = ["toss_decision", "toss_count"]
-        toss_counts = toss_counts.rename(columns={"toss_decision": "decision"})
-
-        fig_toss = px.pie(
-            toss_counts,
-            names="decision",
-            values="toss_count",
-            title="Toss Decision (Bat vs Field)",
-            hole=0.4
-        )
-        st.plotly_chart(fig_toss, use_container_width=True)
+        toss_counts = overview["toss_counts"]
+
+        with profiler.stage("overview.figure.toss_decision", rows=len(toss_counts)):
+            fig_toss = figure(
+                "pie",
+                toss_counts,
+                names="decision",
+                values="toss_count",
+                title="Toss Decision (Bat vs Field)",
+                hole=0.4
+            )
+            st.plotly_chart(fig_toss, width="stretch")
+
+        with profiler.stage("overview.aggregate.toss_outcomes", rows=len(matches_f)):
+            toss_outcomes = engine.toss_outcomes(selected_seasons)
+
+        with profiler.stage("overview.figure.toss_outcomes", rows=len(toss_outcomes)):
+            fig_toss_win = figure(
+                "bar",
+                toss_outcomes,
+                x="decision",
+                y="win_pct",
+                title="Toss Winner's Match Win % by Decision",
+                labels={"decision": "Toss Decision", "win_pct": "Win %"},
+                hover_data=["won", "lost", "no_result"],
+                text="win_pct",
+                traces={"texttemplate": "%{text:.1f}%", "textposition": "outside"}
+            )
+            st.plotly_chart(fig_toss_win, width="stretch")
 
     if "result" in matches_f.columns:
-        result_counts = matches_f["result"].value_counts().reset_index()
-        result_counts.columns = ["result_type", "result_count"]
-
-        fig_res = px.bar(
-            result_counts,
-            x="result_type",
-            y="result_count",
-            title="Result Type Distribution",
-            text="result_count",
-            labels={"result_type": "Result", "result_count": "Count"}
+        result_counts = overview["result_counts"]
+
+        with profiler.stage("overview.figure.result_type", rows=len(result_counts)):
+            fig_res = figure(
+                "bar",
+                result_counts,
+                x="result_type",
+                y="result_count",
+                title="Result Type Distribution",
+                text="result_count",
+                labels={"result_type": "Result", "result_count": "Count"},
+                traces={"textposition": "outside"}
+            )
+            st.plotly_chart(fig_res, width="stretch")
+
+    if engine.outcome_model is not None:
+        # Whole selection scored in one batch by the saved model (see train-outcome)
+        with profiler.stage("overview.aggregate.predictions", rows=len(matches_f)):
+            predictions = engine.predict_outcomes(selected_seasons)
+        decided = predictions[predictions["winner"].notna()]
+        accuracy = (decided["predicted_winner"] == decided["winner"]).mean() if len(decided) else 0
+
+        st.markdown("### 🔮 Predicted Match Outcomes")
+        st.caption(
+            f"Model {engine.outcome_model.version} · "
+            f"agrees with the actual winner in {accuracy:.1%} of {len(decided)} decided matches "
+            f"(in-sample; hold-out accuracy {engine.outcome_model.metadata.get('test_accuracy', 0):.1%})"
         )
-        fig_res.update_traces(textposition="outside")
-        st.plotly_chart(fig_res, use_container_width=True)
+        st.dataframe(predictions, hide_index=True, width="stretch")
+
+        # Monte Carlo replays of the latest selected season's league fixtures
+        forecast_season = max(selected_seasons) if selected_seasons else engine.seasons[-1]
+        st.markdown(f"### 🏆 {forecast_season} Season Forecast")
+        season_matches = engine.matches_for([forecast_season])
+        final = (
+            season_matches[(season_matches["match_type"] == "Final") & season_matches["winner"].notna()]
+            if "match_type" in season_matches.columns else season_matches.iloc[0:0]
+        )
+        # Thousands of replayed seasons take seconds: only run them on request
+        simulate = st.toggle(f"Simulate {FORECAST_SIMULATIONS:,} seasons", key="overview_forecast")
+        if not simulate and len(final):
+            st.caption(f"{final['winner'].iloc[-1]} won the {forecast_season} final.")
+        if simulate:
+            # Results played before today are kept, so a finished season's league
+            # table is the real one and only the playoffs are replayed
+            as_of = pd.Timestamp.today().normalize()
+            with profiler.stage("overview.aggregate.season_forecast", rows=FORECAST_SIMULATIONS):
+                forecast = engine.season_forecast(forecast_season, FORECAST_SIMULATIONS, seed=0, as_of=as_of)
+            st.caption(
+                f"{FORECAST_SIMULATIONS:,} simulated seasons: league fixtures played before "
+                f"{as_of:%Y-%m-%d} keep their results, the rest are drawn, then Qualifier 1, "
+                "Eliminator, Qualifier 2 and Final between the top four"
+                + (f" (the real final was won by {final['winner'].iloc[-1]})" if len(final) else "")
+            )
+            with profiler.stage("overview.figure.season_forecast", rows=len(forecast)):
+                fig_forecast = figure(
+                    "bar",
+                    forecast,
+                    x="team",
+                    y=["title_pct", "playoffs_pct"],
+                    barmode="group",
+                    title="Title and Playoff Odds (%)",
+                    labels={"value": "%", "team": "Team", "variable": "Odds"}
+                )
+            st.plotly_chart(fig_forecast, width="stretch")
+            st.dataframe(forecast, hide_index=True, width="stretch")
 
-    if "win_by_runs" in matches_f.columns and "win_by_wickets" in matches_f.columns:
+    if {"result", "result_margin"}.issubset(matches_f.columns):
+        # Binned with NumPy on the server: the browser gets one bar per bin
+        with profiler.stage("overview.aggregate.victory_margins", rows=len(matches_f)):
+            margins = engine.victory_margins(selected_seasons)
         col_a, col_b = st.columns(2)
 
         with col_a:
-            runs_wins = matches_f[matches_f["win_by_runs"] > 0].copy()
-            fig_runs = px.histogram(
-                runs_wins,
-                x="win_by_runs",
-                nbins=30,
-                title="Distribution of Victory Margin (Runs)",
-                labels={"win_by_runs": "Run Margin"}
-            )
-            st.plotly_chart(fig_runs, use_container_width=True)
+            runs_bins = margins["runs"]
+            with profiler.stage("overview.figure.margin_runs", rows=len(runs_bins)):
+                fig_runs = figure(
+                    "binned",
+                    runs_bins,
+                    title="Distribution of Victory Margin (Runs)",
+                    labels={"bin_mid": "Run Margin", "count": "Matches"}
+                )
+                st.plotly_chart(fig_runs, width="stretch")
 
         with col_b:
-            wk_wins = matches_f[matches_f["win_by_wickets"] > 0].copy()
-            fig_wk = px.histogram(
-                wk_wins,
-                x="win_by_wickets",
-                nbins=10,
-                title="Distribution of Victory Margin (Wickets)",
-                labels={"win_by_wickets": "Wicket Margin"}
-            )
-            st.plotly_chart(fig_wk, use_container_width=True)
+            wk_bins = margins["wickets"]
+            with profiler.stage("overview.figure.margin_wickets", rows=len(wk_bins)):
+                fig_wk = figure(
+                    "binned",
+                    wk_bins,
+                    title="Distribution of Victory Margin (Wickets)",
+                    labels={"bin_mid": "Wicket Margin", "count": "Matches"}
+                )
+                st.plotly_chart(fig_wk, width="stretch")
 
 # ----------------------------------------------------------------------
 ## Tab 2: Team Analysis
 # ----------------------------------------------------------------------
-with tab2:
+@st.fragment
+def render_team_analysis():
+    profiler = fragment_profiler("teams")
     st.subheader("Team Performance Analysis")
 
-    team_matches1 = (
-        matches_f.groupby("team1")["id"]
-        .count()
-        .reset_index()
-        .rename(columns={"team1": "team", "id": "matches_home"})
-    )
-    team_matches2 = (
-        matches_f.groupby("team2")["id"]
-        .count()
-        .reset_index()
-        .rename(columns={"team2": "team", "id": "matches_away"})
-    )
-    team_matches = pd.merge(team_matches1, team_matches2, on="team", how="outer").fillna(0)
-    team_matches["matches_played"] = team_matches["matches_home"] + team_matches["matches_away"]
-
-    team_wins = (
-        matches_f.groupby("winner")["id"]
-        .count()
-        .reset_index()
-        .rename(columns={"winner": "team", "id": "wins"})
-    )
-
-    team_stats = pd.merge(team_matches, team_wins, on="team", how="left").fillna(0)
-    team_stats["win_pct"] = np.where(
-        team_stats["matches_played"] > 0,
-        (team_stats["wins"] / team_stats["matches_played"]) * 100,
-        0
-    )
-    team_stats = team_stats.sort_values("wins", ascending=False)
+    with profiler.stage("teams.aggregate", rows=len(matches_f)):
+        team_stats = engine.team_stats(selected_seasons)
 
     if selected_team == "All":
         st.markdown("Showing **overall team comparison** across selected seasons.")
@@ -271,30 +326,54 @@ with tab2:
         col1, col2 = st.columns(2)
 
         with col1:
-            fig_team_wins = px.bar(
-                team_stats,
-                x="team",
-                y="wins",
-                title="Total Wins by Team",
-                text="wins"
-            )
-            fig_team_wins.update_layout(xaxis_tickangle=-45)
-            fig_team_wins.update_traces(textposition="outside")
-            st.plotly_chart(fig_team_wins, use_container_width=True)
+            with profiler.stage("teams.figure.wins", rows=len(team_stats)):
+                fig_team_wins = figure(
+                    "bar",
+                    team_stats,
+                    x="team",
+                    y="wins",
+                    title="Total Wins by Team",
+                    text="wins",
+                    layout={"xaxis_tickangle": -45},
+                    traces={"textposition": "outside"}
+                )
+                st.plotly_chart(fig_team_wins, width="stretch")
 
         with col2:
-            fig_team_winpct = px.bar(
-                team_stats,
-                x="team",
-                y="win_pct",
-                title="Win Percentage by Team",
-                labels={"win_pct": "Win %"},
-                text="win_pct"
+            with profiler.stage("teams.figure.win_pct", rows=len(team_stats)):
+                fig_team_winpct = figure(
+                    "bar",
+                    team_stats,
+                    x="team",
+                    y="win_pct",
+                    title="Win Percentage by Team",
+                    labels={"win_pct": "Win %"},
+                    text="win_pct",
+                    layout={"xaxis_tickangle": -45},
+                    traces={"textposition": "outside"}
+                )
+                st.plotly_chart(fig_team_winpct, width="stretch")
+
+        # Sliced from the per-season head-to-head tensors built at load
+        with profiler.stage("teams.aggregate.head_to_head", rows=len(matches_f)):
+            h2h_wins, h2h_played = engine.head_to_head(selected_seasons)
+        h2h_pct = (h2h_wins / h2h_played.where(h2h_played > 0) * 100).round(1)
+
+        with profiler.stage("teams.figure.head_to_head", rows=h2h_pct.size):
+            fig_h2h = figure(
+                "imshow",
+                h2h_pct,
+                text_auto=True,
+                aspect="auto",
+                color_continuous_scale="RdYlGn",
+                zmin=0,
+                zmax=100,
+                title="Head-to-Head Win % (row team vs column team)",
+                labels={"x": "Opponent", "y": "Team", "color": "Win %"},
+                layout={"height": 700, "xaxis_tickangle": -45}
             )
-            fig_team_winpct.update_layout(xaxis_tickangle=-45)
-            fig_team_winpct.update_traces(textposition="outside")
-            st.plotly_chart(fig_team_winpct, use_container_width=True)
-            
+            st.plotly_chart(fig_h2h, width="stretch")
+
     else:
         # --- Team Specific Summary ---
         st.markdown(f"### 🏆 **{selected_team} Summary**")
@@ -322,60 +401,78 @@ with tab2:
             st.markdown("---")
             st.markdown("#### Key Match Metrics")
 
-            team_matches_f = matches_f[(matches_f["team1"] == selected_team) | (matches_f["team2"] == selected_team)].copy()
+            with profiler.stage("teams.aggregate.toss", rows=len(matches_f)):
+                toss_dec_counts, toss_perf = engine.team_toss_tables(selected_team, selected_seasons)
             
             # 1. Win/Loss Pie Chart
             col_kpi_1, col_kpi_2 = st.columns(2)
             with col_kpi_1:
-                fig_wl = px.pie(
-                    wl_df,
-                    names="Result",
-                    values="Count",
-                    title=f"{selected_team} Win/Loss Split",
-                    hole=0.4
-                )
-                st.plotly_chart(fig_wl, use_container_width=True)
+                with profiler.stage("teams.figure.win_loss", rows=len(wl_df)):
+                    fig_wl = figure(
+                        "pie",
+                        wl_df,
+                        names="Result",
+                        values="Count",
+                        title=f"{selected_team} Win/Loss Split",
+                        hole=0.4
+                    )
+                    st.plotly_chart(fig_wl, width="stretch")
 
             # 2. Toss Decision Outcomes
             with col_kpi_2:
-                toss_outcomes = team_matches_f[team_matches_f["toss_winner"] == selected_team]
-                toss_dec_counts = toss_outcomes["toss_decision"].value_counts().reset_index()
-                toss_dec_counts.columns = ["decision", "count"]
-
-                fig_toss_dec = px.bar(
-                    toss_dec_counts,
-                    x="decision",
-                    y="count",
-                    title=f"{selected_team} Toss Decisions",
-                    text="count"
-                )
-                fig_toss_dec.update_traces(textposition="outside")
-                st.plotly_chart(fig_toss_dec, use_container_width=True)
+                with profiler.stage("teams.figure.toss_decisions", rows=len(toss_dec_counts)):
+                    fig_toss_dec = figure(
+                        "bar",
+                        toss_dec_counts,
+                        x="decision",
+                        y="count",
+                        title=f"{selected_team} Toss Decisions",
+                        text="count",
+                        traces={"textposition": "outside"}
+                    )
+                    st.plotly_chart(fig_toss_dec, width="stretch")
 
             # 3. Performance when Chasing vs Defending (Toss Win)
             st.markdown("---")
             st.markdown("#### Toss Performance: Win/Loss after Winning Toss")
 
-            toss_wins = team_matches_f[team_matches_f["toss_winner"] == selected_team]
-            
-            # Helper to check if the team won the match
-            toss_wins['match_won'] = toss_wins['winner'] == selected_team
-            
-            toss_perf = toss_wins.groupby('toss_decision')['match_won'].agg(['sum', 'count']).reset_index()
-            toss_perf['win_pct'] = (toss_perf['sum'] / toss_perf['count']) * 100
-            toss_perf = toss_perf.rename(columns={'sum': 'Wins', 'count': 'Total Matches'})
-
-            fig_toss_perf = px.bar(
-                toss_perf,
-                x='toss_decision',
-                y='win_pct',
-                title=f"{selected_team} Win % After Winning Toss",
-                labels={'toss_decision': 'Toss Decision', 'win_pct': 'Win %'},
-                text=toss_perf.apply(lambda row: f"{row['win_pct']:.1f}% ({row['Wins']}/{row['Total Matches']})", axis=1)
-            )
-            fig_toss_perf.update_traces(textposition="outside")
-            st.plotly_chart(fig_toss_perf, use_container_width=True)
-            
+            with profiler.stage("teams.figure.toss_performance", rows=len(toss_perf)):
+                toss_perf = toss_perf.assign(
+                    label=toss_perf.apply(lambda row: f"{row['win_pct']:.1f}% ({row['Wins']}/{row['Total Matches']})", axis=1)
+                )
+                fig_toss_perf = figure(
+                    "bar",
+                    toss_perf,
+                    x='toss_decision',
+                    y='win_pct',
+                    title=f"{selected_team} Win % After Winning Toss",
+                    labels={'toss_decision': 'Toss Decision', 'win_pct': 'Win %'},
+                    text="label",
+                    traces={"textposition": "outside"}
+                )
+                st.plotly_chart(fig_toss_perf, width="stretch")
+
+            # 4. Head-to-head record against each opponent
+            st.markdown("---")
+            st.markdown("#### Head-to-Head Record")
+
+            with profiler.stage("teams.aggregate.team_record", rows=len(matches_f)):
+                team_record = engine.team_record(selected_team, selected_seasons)
+
+            with profiler.stage("teams.figure.team_record", rows=len(team_record)):
+                fig_record = figure(
+                    "bar",
+                    team_record,
+                    x="opponent",
+                    y=["won", "lost"],
+                    title=f"{selected_team} Wins and Losses by Opponent",
+                    labels={"opponent": "Opponent", "value": "Matches", "variable": "Result"},
+                    hover_data=["played", "win_pct"],
+                    barmode="group",
+                    layout={"xaxis_tickangle": -45}
+                )
+                st.plotly_chart(fig_record, width="stretch")
+
         else:
             st.warning(f"No match data found for {selected_team} in the selected seasons.")
 
@@ -383,94 +480,124 @@ with tab2:
         st.markdown("---")
         st.markdown("### Top Venues by Matches Played")
         # Rest of Venue Analysis (remains the same as original)
-        venue_match_count = (
-            matches_f.groupby("venue")["id"]
-            .count()
-            .reset_index()
-            .rename(columns={"id": "matches"})
-            .sort_values("matches", ascending=False)
-        )
+        with profiler.stage("venues.aggregate", rows=len(matches_f)):
+            venue_match_count = engine.venue_stats(selected_seasons)
         top_venues = venue_match_count.head(15)
 
-        fig_venue = px.bar(
-            top_venues,
-            x="venue",
-            y="matches",
-            title="Most Used Venues",
-            text="matches"
-        )
-        fig_venue.update_layout(xaxis_tickangle=-60)
-        fig_venue.update_traces(textposition="outside")
-        st.plotly_chart(fig_venue, use_container_width=True)
+        with profiler.stage("venues.figure.top_venues", rows=len(top_venues)):
+            fig_venue = figure(
+                "bar",
+                top_venues,
+                x="venue",
+                y="matches",
+                title="Most Used Venues",
+                text="matches",
+                layout={"xaxis_tickangle": -60},
+                traces={"textposition": "outside"}
+            )
+            st.plotly_chart(fig_venue, width="stretch")
 
         venue_sel = st.selectbox(
             "Select a Venue to see team performance there",
-            options=sorted(matches_f["venue"].dropna().unique())
+            options=sorted(venue_match_count["venue"])
         )
 
-        venue_df = matches_f[matches_f["venue"] == venue_sel]
-        venue_team_wins = (
-            venue_df.groupby("winner")["id"]
-            .count()
-            .reset_index()
-            .rename(columns={"winner": "team", "id": "wins_at_venue"})
-            .sort_values("wins_at_venue", ascending=False)
-        )
+        with profiler.stage("venues.aggregate.team_wins", rows=len(matches_f)):
+            venue_team_wins = engine.venue_team_wins(venue_sel, selected_seasons)
 
-        fig_venue_team = px.bar(
-            venue_team_wins,
-            x="team",
-            y="wins_at_venue",
-            title=f"Wins by Team at {venue_sel}",
-            text="wins_at_venue"
-        )
-        fig_venue_team.update_layout(xaxis_tickangle=-45)
-        fig_venue_team.update_traces(textposition="outside")
-        st.plotly_chart(fig_venue_team, use_container_width=True)
+        with profiler.stage("venues.figure.team_wins", rows=len(venue_team_wins)):
+            fig_venue_team = figure(
+                "bar",
+                venue_team_wins,
+                x="team",
+                y="wins_at_venue",
+                title=f"Wins by Team at {venue_sel}",
+                text="wins_at_venue",
+                layout={"xaxis_tickangle": -45},
+                traces={"textposition": "outside"}
+            )
+            st.plotly_chart(fig_venue_team, width="stretch")
+
+        with profiler.stage("venues.aggregate.innings_results", rows=len(matches_f)):
+            venue_results = engine.venue_results(selected_seasons)
+        venue_row = venue_results[venue_results["venue"] == venue_sel]
+        innings_split = pd.DataFrame({
+            "Won By": ["Batting First", "Chasing"],
+            "Matches": [int(venue_row["bat_first_wins"].sum()), int(venue_row["chase_wins"].sum())]
+        })
+
+        with profiler.stage("venues.figure.innings_results", rows=len(innings_split)):
+            fig_venue_innings = figure(
+                "pie",
+                innings_split,
+                names="Won By",
+                values="Matches",
+                title=f"Batting First vs Chasing Wins at {venue_sel}",
+                hole=0.4
+            )
+            st.plotly_chart(fig_venue_innings, width="stretch")
+
+def render_similar_players(name, role, profiler):
+    # Career k-NN over normalized rate vectors (see ipl_analytics.similar);
+    # the index is built once per dataset version, so a query is a lookup
+    st.markdown(f"### Players Like {name}")
+    k = st.slider("Similar players to show", 3, 15, 5, key=f"similar_{role}")
+    with profiler.stage(f"{role}.aggregate.similar", rows=len(engine.player_index(role).players)):
+        similar = engine.similar_players(name, role, k)
+    if similar.empty:
+        st.info(f"{name} has too few career balls to be compared.")
+        return
+    st.caption(
+        "Closest career profiles over all seasons by strike rate, boundary and dot %, "
+        "phase split and phase rates" if role == "batting" else
+        "Closest career profiles over all seasons by economy, wicket rate, dot and boundary %, "
+        "extras, phase split and phase economies"
+    )
+    st.dataframe(similar, hide_index=True, width="stretch")
 
 # ----------------------------------------------------------------------
 ## Tab 3: Batting Analysis
 # ----------------------------------------------------------------------
-with tab3:
+@st.fragment
+def render_batting_analysis():
+    profiler = fragment_profiler("batting")
     st.subheader("Batting Analysis")
 
-    if {"batter", "batsman_runs"}.issubset(deliveries_f.columns):
-        batter_runs = (
-            deliveries_f.groupby("batter")["batsman_runs"]
-            .sum()
-            .reset_index()
-            .sort_values("batsman_runs", ascending=False)
-        )
+    if {"batter", "batsman_runs"}.issubset(engine.delivery_columns):
+        with profiler.stage("batting.aggregate", rows=delivery_rows):
+            batter_runs = engine.batter_runs(selected_seasons)
 
         top_n_bat = st.slider("Top N batters by runs", 5, 30, 10)
         top_batters = batter_runs.head(top_n_bat)
 
         top_batters = top_batters.rename(columns={"batsman_runs": "total_runs"})
 
-        fig_top_bat = px.bar(
-            top_batters,
-            x="batter",
-            y="total_runs",
-            title=f"Top {top_n_bat} Run Scorers",
-            labels={"batter": "Batter", "total_runs": "Runs"},
-            text="total_runs"
-        )
-        fig_top_bat.update_layout(xaxis_tickangle=-45)
-        fig_top_bat.update_traces(textposition="outside")
-        st.plotly_chart(fig_top_bat, use_container_width=True)
+        with profiler.stage("batting.figure.top_batters", rows=len(top_batters)):
+            fig_top_bat = figure(
+                "bar",
+                top_batters,
+                x="batter",
+                y="total_runs",
+                title=f"Top {top_n_bat} Run Scorers",
+                labels={"batter": "Batter", "total_runs": "Runs"},
+                text="total_runs",
+                layout={"xaxis_tickangle": -45},
+                traces={"textposition": "outside"}
+            )
+            st.plotly_chart(fig_top_bat, width="stretch")
 
         selected_batter = st.selectbox(
             "Select a batter for detailed view",
             options=top_batters["batter"]
         )
 
-        p_df = deliveries_f[deliveries_f["batter"] == selected_batter]
-
-        total_runs = int(p_df["batsman_runs"].sum())
-        total_balls = int(p_df.shape[0])
-        fours = int((p_df["batsman_runs"] == 4).sum())
-        sixes = int((p_df["batsman_runs"] == 6).sum())
-        strike_rate = round((total_runs / total_balls) * 100, 2) if total_balls > 0 else 0
+        with profiler.stage("batting.aggregate.profile", rows=delivery_rows):
+            batter = engine.batter_profile(selected_batter, selected_seasons)
+        total_runs = batter["runs"]
+        total_balls = batter["balls"]
+        fours = batter["fours"]
+        sixes = batter["sixes"]
+        strike_rate = batter["strike_rate"]
 
         c1, c2, c3, c4, c5 = st.columns(5)
         c1.metric("Runs", total_runs)
@@ -480,108 +607,81 @@ with tab3:
         c5.metric("Strike Rate", strike_rate)
 
         if "season" in matches_f.columns:
-            bat_season = deliveries_f.merge(
-                matches_f[["id", "season"]],
-                left_on="match_id",
-                right_on="id",
-                how="left"
-            )
-            bat_season = bat_season[bat_season["batter"] == selected_batter]
-            bat_season_grp = (
-                bat_season.groupby("season")["batsman_runs"]
-                .sum()
-                .reset_index()
-                .sort_values("season")
-            )
-            bat_season_grp = bat_season_grp.rename(columns={"batsman_runs": "season_runs"})
-
-            fig_season_runs = px.line(
-                bat_season_grp,
-                x="season",
-                y="season_runs",
-                markers=True,
-                title=f"Season-wise Runs: {selected_batter}",
-                labels={"season_runs": "Runs"}
-            )
-            st.plotly_chart(fig_season_runs, use_container_width=True)
+            bat_season_grp = batter["season_runs"]
+
+            with profiler.stage("batting.figure.season_runs", rows=len(bat_season_grp)):
+                fig_season_runs = figure(
+                    "line",
+                    bat_season_grp,
+                    x="season",
+                    y="season_runs",
+                    markers=True,
+                    title=f"Season-wise Runs: {selected_batter}",
+                    labels={"season_runs": "Runs"}
+                )
+                st.plotly_chart(fig_season_runs, width="stretch")
 
         st.markdown("### Boundary Distribution")
         boundary_counts = pd.DataFrame({
             "boundary_type": ["4s", "6s"],
             "boundary_count": [fours, sixes]
         })
-        fig_boundary = px.pie(
-            boundary_counts,
-            names="boundary_type",
-            values="boundary_count",
-            title=f"Boundary Split for {selected_batter}",
-            hole=0.4
-        )
-        st.plotly_chart(fig_boundary, use_container_width=True)
+        with profiler.stage("batting.figure.boundaries", rows=len(boundary_counts)):
+            fig_boundary = figure(
+                "pie",
+                boundary_counts,
+                names="boundary_type",
+                values="boundary_count",
+                title=f"Boundary Split for {selected_batter}",
+                hole=0.4
+            )
+            st.plotly_chart(fig_boundary, width="stretch")
+
+        render_similar_players(selected_batter, "batting", profiler)
     else:
         st.write("Required columns for batting analysis are missing in deliveries dataset.")
 
 # ----------------------------------------------------------------------
 ## Tab 4: Bowling Analysis
 # ----------------------------------------------------------------------
-with tab4:
+@st.fragment
+def render_bowling_analysis():
+    profiler = fragment_profiler("bowling")
     st.subheader("Bowling Analysis")
 
     needed_cols = {"bowler", "is_wicket", "dismissal_kind", "total_runs"}
-    if needed_cols.issubset(deliveries_f.columns):
-        wicket_df = deliveries_f[
-            (deliveries_f["is_wicket"] == 1) &
-            (~deliveries_f["dismissal_kind"].isin(["run out", "retired hurt", "obstructing the field"]))
-        ]
-
-        bowler_wk = (
-            wicket_df.groupby("bowler")["is_wicket"]
-            .count()
-            .reset_index()
-            .rename(columns={"is_wicket": "wickets_taken"})
-            .sort_values("wickets_taken", ascending=False)
-        )
+    if needed_cols.issubset(engine.delivery_columns):
+        with profiler.stage("bowling.aggregate", rows=delivery_rows):
+            bowler_wk = engine.bowler_wickets(selected_seasons)
 
         top_n_bowl = st.slider("Top N bowlers by wickets", 5, 30, 10)
         top_bowlers = bowler_wk.head(top_n_bowl)
 
-        fig_top_bowl = px.bar(
-            top_bowlers,
-            x="bowler",
-            y="wickets_taken",
-            title=f"Top {top_n_bowl} Wicket Takers",
-            labels={"bowler": "Bowler", "wickets_taken": "Wickets"},
-            text="wickets_taken"
-        )
-        fig_top_bowl.update_layout(xaxis_tickangle=-45)
-        fig_top_bowl.update_traces(textposition="outside")
-        st.plotly_chart(fig_top_bowl, use_container_width=True)
+        with profiler.stage("bowling.figure.top_bowlers", rows=len(top_bowlers)):
+            fig_top_bowl = figure(
+                "bar",
+                top_bowlers,
+                x="bowler",
+                y="wickets_taken",
+                title=f"Top {top_n_bowl} Wicket Takers",
+                labels={"bowler": "Bowler", "wickets_taken": "Wickets"},
+                text="wickets_taken",
+                layout={"xaxis_tickangle": -45},
+                traces={"textposition": "outside"}
+            )
+            st.plotly_chart(fig_top_bowl, width="stretch")
 
         selected_bowler = st.selectbox(
             "Select a bowler for detailed view",
             options=top_bowlers["bowler"]
         )
 
-        b_df = deliveries_f[deliveries_f["bowler"] == selected_bowler]
-        
-        # FIX for legal_del calculation
-        if 'extras_type' in b_df.columns:
-            legal_del = b_df[~b_df["extras_type"].isin(["wides", "noballs", "wide", "noball"])]
-        elif 'extra_runs' in b_df.columns:
-            # Fallback (using extra_runs=0 as a proxy for legal ball)
-            legal_del = b_df[b_df['extra_runs'] == 0]
-        else:
-             # Last resort: count all balls
-            legal_del = b_df 
-
-        runs_conceded = int(b_df["total_runs"].sum())
-        balls_bowled = int(legal_del.shape[0])
-        overs = balls_bowled / 6 if balls_bowled > 0 else 0
-        economy = round(runs_conceded / overs, 2) if overs > 0 else 0
-        
-        wickets_taken = int(
-            wicket_df[wicket_df["bowler"] == selected_bowler].shape[0]
-        )
+        with profiler.stage("bowling.aggregate.profile", rows=delivery_rows):
+            bowler = engine.bowler_profile(selected_bowler, selected_seasons)
+        runs_conceded = bowler["runs_conceded"]
+        balls_bowled = bowler["legal_balls"]
+        economy = bowler["economy"]
+        wickets_taken = bowler["wickets"]
 
         c1, c2, c3, c4 = st.columns(4)
         c1.metric("Wickets", wickets_taken)
@@ -590,33 +690,340 @@ with tab4:
         c4.metric("Economy", economy)
 
         if "season" in matches_f.columns:
-            bowl_season = deliveries_f.merge(
-                matches_f[["id", "season"]],
-                left_on="match_id",
-                right_on="id",
-                how="left"
+            bowl_season_grp = bowler["season_wickets"]
+
+            with profiler.stage("bowling.figure.season_wickets", rows=len(bowl_season_grp)):
+                fig_season_wk = figure(
+                    "line",
+                    bowl_season_grp,
+                    x="season",
+                    y="season_wickets",
+                    markers=True,
+                    title=f"Season-wise Wickets: {selected_bowler}",
+                    labels={"season_wickets": "Wickets"}
+                )
+                st.plotly_chart(fig_season_wk, width="stretch")
+
+        render_similar_players(selected_bowler, "bowling", profiler)
+    else:
+        st.write("Required columns for bowling analysis are missing in deliveries dataset.")
+
+# ----------------------------------------------------------------------
+## Tab 5: Phases & Partnerships
+# ----------------------------------------------------------------------
+@st.fragment
+def render_phases():
+    profiler = fragment_profiler("phases")
+    st.subheader("Phases & Partnerships")
+
+    # Per-innings phase and partnership segments (see ipl_analytics.phases)
+    with profiler.stage("phases.aggregate", rows=delivery_rows):
+        phase_summary = engine.phase_summary(selected_seasons)
+
+    st.markdown("#### Powerplay (1–6), Middle (7–15) and Death (16–20) Overs")
+    for col, row in zip(st.columns(len(phase_summary)), phase_summary.itertuples()):
+        col.metric(f"{row.phase.title()} Run Rate", f"{row.run_rate:.2f}")
+        col.caption(
+            f"{row.runs_per_innings} runs and {row.wickets_per_innings} wickets per innings · "
+            f"boundaries {row.boundary_pct}% · dots {row.dot_pct}% of balls"
+        )
+
+    side = st.radio("Teams", ["Batting", "Bowling"], horizontal=True, key="phase_side")
+    with profiler.stage("phases.aggregate.teams", rows=delivery_rows):
+        team_phases = engine.team_phases(selected_seasons, f"{side.lower()}_team")
+    if selected_team != "All":
+        team_phases = team_phases[team_phases["team"] == selected_team]
+
+    with profiler.stage("phases.figure.teams", rows=len(team_phases)):
+        fig_team_phases = figure(
+            "bar",
+            team_phases,
+            x="team",
+            y="run_rate",
+            color="phase",
+            barmode="group",
+            title=f"Run Rate by Phase ({'scored' if side == 'Batting' else 'conceded'})",
+            labels={"team": "Team", "run_rate": "Run Rate", "phase": "Phase"},
+            hover_data=["innings", "runs_per_innings", "wickets_per_innings"],
+            layout={"xaxis_tickangle": -45}
+        )
+        st.plotly_chart(fig_team_phases, width="stretch")
+
+    st.markdown("---")
+    st.markdown("#### Phase Specialists")
+    col_a, col_b = st.columns(2)
+    phase = col_a.selectbox("Phase", ipl_analytics.phases.PHASES, index=len(ipl_analytics.phases.PHASES) - 1)
+    min_balls = col_b.slider("Minimum balls faced in the phase", 30, 300, 100, step=10)
+
+    with profiler.stage("phases.aggregate.batters", rows=delivery_rows):
+        phase_batters = engine.batter_phase_table(phase, selected_seasons, min_balls).head(15)
+
+    with profiler.stage("phases.figure.batters", rows=len(phase_batters)):
+        fig_phase_bat = figure(
+            "bar",
+            phase_batters,
+            x="batter",
+            y="strike_rate",
+            title=f"Highest {phase.title()} Strike Rates (min {min_balls} balls)",
+            labels={"batter": "Batter", "strike_rate": "Strike Rate"},
+            hover_data=["runs", "balls", "average", "boundary_pct"],
+            text="strike_rate",
+            layout={"xaxis_tickangle": -45},
+            traces={"textposition": "outside"}
+        )
+        st.plotly_chart(fig_phase_bat, width="stretch")
+
+    st.markdown("---")
+    st.markdown("#### Batting Partnerships")
+
+    with profiler.stage("partnerships.aggregate", rows=delivery_rows):
+        by_wicket = engine.wicket_partnerships(selected_seasons)
+        pairs = engine.pair_partnerships(selected_seasons).head(15)
+        top_stands = engine.top_partnerships(selected_seasons, 10)
+
+    col_w, col_p = st.columns(2)
+    with col_w:
+        with profiler.stage("partnerships.figure.by_wicket", rows=len(by_wicket)):
+            fig_by_wicket = figure(
+                "bar",
+                by_wicket,
+                x="wicket",
+                y="average",
+                title="Average Partnership by Wicket",
+                labels={"wicket": "Wicket", "average": "Average Runs"},
+                hover_data=["stands", "best", "fifties"],
+                text="average",
+                traces={"textposition": "outside"}
             )
-            bowl_season = bowl_season[
-                (bowl_season["bowler"] == selected_bowler) &
-                (bowl_season["is_wicket"] == 1) &
-                (~bowl_season["dismissal_kind"].isin(["run out", "retired hurt", "obstructing the field"]))
-            ]
-            bowl_season_grp = (
-                bowl_season.groupby("season")["is_wicket"]
-                .count()
-                .reset_index()
-                .rename(columns={"is_wicket": "season_wickets"})
-                .sort_values("season")
+            st.plotly_chart(fig_by_wicket, width="stretch")
+
+    with col_p:
+        with profiler.stage("partnerships.figure.pairs", rows=len(pairs)):
+            fig_pairs = figure(
+                "bar",
+                pairs,
+                x="runs",
+                y="pair",
+                orientation="h",
+                title="Most Partnership Runs by Pair",
+                labels={"runs": "Runs", "pair": "Pair"},
+                hover_data=["stands", "average", "best", "fifties", "hundreds"],
+                layout={"yaxis": {"autorange": "reversed"}}
             )
+            st.plotly_chart(fig_pairs, width="stretch")
+
+    st.markdown("##### Highest Partnerships")
+    st.dataframe(
+        top_stands[["pair", "runs", "balls", "wicket", "batting_team", "season", "match_id"]],
+        hide_index=True,
+        width="stretch"
+    )
 
-            fig_season_wk = px.line(
-                bowl_season_grp,
+# ----------------------------------------------------------------------
+## Tab 6: Auction Value
+# ----------------------------------------------------------------------
+LAKH = 1e5
+
+@st.fragment
+def render_auction_value():
+    profiler = fragment_profiler("auction")
+    st.subheader("Auction Value")
+
+    with profiler.stage("auction.aggregate", rows=delivery_rows):
+        value = engine.auction_value(selected_seasons)
+    if value is None:
+        st.write("Auction data (IPLPlayerAuctionData.csv) is not available.")
+        return
+    if value.empty:
+        st.write("No auction buys in the selected seasons.")
+        return
+
+    with profiler.stage("auction.aggregate.seasons", rows=len(value)):
+        by_season = ipl_analytics.players.season_value(value)
+        by_season["lakh_per_run"] = (by_season["cost_per_run"] / LAKH).round(2)
+        by_season["lakh_per_wicket"] = (by_season["cost_per_wicket"] / LAKH).round(2)
+
+    c1, c2, c3 = st.columns(3)
+    c1.metric("Resolved Buys", len(value))
+    c2.metric("Spend (₹ crore)", f"{value['amount'].sum() / 1e7:,.1f}")
+    c3.metric("Players", value["player_id"].nunique())
+
+    col1, col2 = st.columns(2)
+    with col1:
+        with profiler.stage("auction.figure.cost_per_run", rows=len(by_season)):
+            fig_cpr = figure(
+                "bar",
+                by_season,
                 x="season",
-                y="season_wickets",
-                markers=True,
-                title=f"Season-wise Wickets: {selected_bowler}",
-                labels={"season_wickets": "Wickets"}
+                y="lakh_per_run",
+                title="Auction Spend per Run (₹ lakh)",
+                labels={"season": "Season", "lakh_per_run": "₹ lakh per run"},
+                text="lakh_per_run"
             )
-            st.plotly_chart(fig_season_wk, use_container_width=True)
-    else:
-        st.write("Required columns for bowling analysis are missing in deliveries dataset.")
\ No newline at end of file
+            st.plotly_chart(fig_cpr, width="stretch")
+    with col2:
+        with profiler.stage("auction.figure.cost_per_wicket", rows=len(by_season)):
+            fig_cpw = figure(
+                "bar",
+                by_season,
+                x="season",
+                y="lakh_per_wicket",
+                title="Auction Spend per Wicket (₹ lakh)",
+                labels={"season": "Season", "lakh_per_wicket": "₹ lakh per wicket"},
+                text="lakh_per_wicket"
+            )
+            st.plotly_chart(fig_cpw, width="stretch")
+
+    measure = st.radio("Best value by", ["Cost per run", "Cost per wicket"], horizontal=True)
+    column, stat = ("cost_per_run", "runs") if measure == "Cost per run" else ("cost_per_wicket", "wickets")
+    minimum = st.slider(f"Minimum {stat} in the season", 1, 300 if stat == "runs" else 20, 100 if stat == "runs" else 8)
+    best = value[value[stat] >= minimum].nsmallest(10, column)
+    best = best.assign(label=best["player"] + " (" + best["season"].astype(str) + ")")
+    best["lakh"] = (best[column] / LAKH).round(2)
+
+    with profiler.stage("auction.figure.best_value", rows=len(best)):
+        fig_best = figure(
+            "bar",
+            best,
+            x="label",
+            y="lakh",
+            color="team",
+            title=f"Best Value Buys by {measure} (₹ lakh)",
+            labels={"label": "Player (season)", "lakh": f"₹ lakh per {stat[:-1]}", "team": "Team"},
+            text="lakh",
+            layout={"xaxis_tickangle": -45}
+        )
+        st.plotly_chart(fig_best, width="stretch")
+
+# ----------------------------------------------------------------------
+## Tab 7: Live (only with IPL_LIVE_FEED)
+# ----------------------------------------------------------------------
+@st.cache_resource
+def get_live_feed(spec, _score_model):
+    # One follower thread per process: every session reads its latest snapshot.
+    # First innings are projected by the score model trained on the history.
+    return ipl_analytics.live.LiveFeed(spec, score_model=_score_model).start_in_thread()
+
+@st.fragment(run_every=ipl_analytics.live.PUSH_INTERVAL)
+def render_live():
+    st.subheader("Live")
+
+    feed = get_live_feed(ipl_analytics.live.LIVE_FEED, engine.score_model)
+    if feed.error is not None:
+        st.error(f"Live feed stopped: {feed.error}")
+    snapshot = feed.snapshot
+    latency = feed.latency_report()
+    st.caption(
+        f"{feed.spec} · {snapshot['balls']} balls · "
+        f"update p95 {latency['update']['p95_ms']} ms · push p95 {latency['push']['p95_ms']} ms"
+    )
+    if not snapshot["innings"]:
+        st.write("Waiting for the first ball…")
+        return
+
+    for state, col in zip(snapshot["innings"][-2:], st.columns(2)):
+        col.metric(
+            f"{state['batting_team']} (innings {state['inning']})",
+            f"{state['runs']}/{state['wickets']}",
+            f"{state['overs']} ov · RR {state['run_rate']}"
+            + (f" · projected {state['projected']}" if state.get("projected") is not None else ""),
+            delta_color="off"
+        )
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("**Top batters**")
+        st.dataframe(
+            pd.DataFrame(snapshot["batters"], columns=["batter", "runs", "balls", "fours", "sixes"]),
+            hide_index=True, width="stretch"
+        )
+    with col2:
+        st.markdown("**Top bowlers**")
+        st.dataframe(
+            pd.DataFrame(snapshot["bowlers"], columns=["bowler", "wickets", "runs_conceded", "legal_balls"]),
+            hide_index=True, width="stretch"
+        )
+
+# ----------------------------------------------------------------------
+## Render the selected section(s)
+# ----------------------------------------------------------------------
+RENDERERS = [
+    render_overview, render_team_analysis, render_batting_analysis, render_bowling_analysis,
+    render_phases, render_auction_value,
+]
+if ipl_analytics.live.LIVE_FEED:
+    TAB_NAMES = TAB_NAMES + ["Live"]
+    RENDERERS.append(render_live)
+
+if TAB_MODE == "tabs":
+    for tab, render in zip(st.tabs(TAB_NAMES), RENDERERS):
+        with tab:
+            render()
+else:
+    active_tab = st.segmented_control(
+        "Section",
+        options=TAB_NAMES,
+        default=TAB_NAMES[0],
+        key="active_tab",
+        label_visibility="collapsed"
+    )
+    RENDERERS[TAB_NAMES.index(active_tab or TAB_NAMES[0])]()
+
+# ----------------------------------------------------------------------
+## Sidebar: result cache counters (after this rerun's lookups)
+# ----------------------------------------------------------------------
+with st.sidebar.expander("Result cache"):
+    cache_stats = get_result_cache().stats()
+    st.caption(
+        f"{cache_stats['entries']}/{cache_stats['maxsize']} entries · "
+        f"{cache_stats['hits']} hits · {cache_stats['misses']} misses · "
+        f"{cache_stats['evictions']} evictions · hit rate {cache_stats['hit_rate']:.0%}"
+    )
+# ----------------------------------------------------------------------
+## Sidebar: memory shared by all sessions vs held by each session
+# ----------------------------------------------------------------------
+@st.cache_resource
+def session_memory():
+    # Session id -> bytes that session holds beyond the shared engine data,
+    # measured after its latest rerun; one dict per process
+    return {}
+
+with st.sidebar.expander("Memory"):
+    sessions = session_memory()
+    ctx = get_script_run_ctx()
+    if ctx is not None:
+        sessions[ctx.session_id] = engine.session_bytes(dict(st.session_state))
+    if st.runtime.exists():
+        runtime = st.runtime.get_instance()
+        for session_id in list(sessions):
+            if not runtime.is_active_session(session_id):
+                sessions.pop(session_id, None)
+    shared = engine.memory_report()
+    st.caption(
+        f"Shared per process: data {shared.get('data', 0) / 2**20:.1f} MB · "
+        f"aggregates {shared.get('aggregates', 0) / 2**20:.1f} MB · "
+        f"cached results {shared.get('results', 0) / 2**20:.1f} MB"
+    )
+    st.caption(
+        f"{len(sessions)} active sessions hold {sum(sessions.values()) / 2**10:.1f} KB of their own "
+        f"(this session {sessions.get(ctx.session_id, 0) / 2**10 if ctx else 0:.1f} KB)"
+    )
+
+# ----------------------------------------------------------------------
+## Sidebar: per-stage timings of this rerun (debug)
+# ----------------------------------------------------------------------
+if st.sidebar.checkbox("Show stage timings", value=False):
+    with st.sidebar.expander("Stage timings", expanded=True):
+        st.caption(f"Run {profiler.run_id} · {profiler.total_seconds() * 1000:.1f} ms in {len(profiler.records)} stages")
+        # Newest first: this rerun, then earlier reruns and section-only (fragment) runs
+        st.dataframe(
+            pd.DataFrame(
+                [
+                    {"run_id": run.run_id, "section": run.context.get("fragment", "page"), **record}
+                    for run in reversed(st.session_state["profiled_runs"]) for record in run.records
+                ],
+                columns=["run_id", "section", "stage", "seconds", "rows", "mem_delta_mb", "rss_mb"]
+            ),
+            hide_index=True,
+            width="stretch"
+        )
@@ -0,0 +1,268 @@
+"""
+Benchmarks the dashboard's hot paths on synthetic data at growing scales.
+
+    python -m benchmarks.run --scales 1 10 --output bench-head.json
+    python -m benchmarks.run compare bench-base.json bench-head.json
+
+Each case is timed `--repeat` times and reported as min / median seconds
+with the rows it processed, so two result files from different commits
+can be compared case by case. `compare` exits non-zero when a case got
+slower than `--threshold` times its baseline.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from ipl_analytics import cache, encoding, features, loader, parallel, phases, stats
+from ipl_analytics.cube import build_player_cube
+from ipl_analytics.engine import IPLEngine
+from ipl_analytics.index import build_delivery_index
+from ipl_analytics.tensors import build_match_tensors
+
+from . import synthetic
+
+DEFAULT_SCALES = [1, 10]
+DEFAULT_REPEAT = 3
+
+
+def _timed(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        )
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# --- CASES ---
+# Each returns [(case name, callable, rows processed)], mirroring one stage
+# of a dashboard rerun with the cache layers (ResultCache, Arrow) bypassed.
+def load_cases(matches, deliveries, workdir):
+    match_csv = os.path.join(workdir, "matches.csv")
+    deliv_csv = os.path.join(workdir, "deliveries.csv")
+    synthetic.write_wrapped_csv(matches, match_csv)
+    synthetic.write_wrapped_csv(deliveries, deliv_csv)
+
+    cache_dir = os.path.join(workdir, "cache")
+    ingest_dir = os.path.join(workdir, "ingested")
+    cache.build_cache(match_csv, deliv_csv, cache_dir)
+    rows = len(matches) + len(deliveries)
+    return [
+        ("load.csv", lambda: loader.load_data(match_csv, deliv_csv), rows),
+        ("load.arrow_cache", lambda: cache.load_cached_data(match_csv, deliv_csv, cache_dir, ingest_dir=ingest_dir), rows),
+    ]
+
+
+def build_cases(matches, deliveries):
+    return [
+        ("build.encode_shared", lambda: encoding.encode_shared(matches, deliveries), len(deliveries)),
+        ("build.delivery_index", lambda: build_delivery_index(matches, deliveries), len(deliveries)),
+        ("build.player_cube", lambda: build_player_cube(matches, deliveries), len(deliveries)),
+        ("build.innings_features", lambda: features.innings_features(deliveries), len(deliveries)),
+        ("build.match_tensors", lambda: build_match_tensors(matches), len(matches)),
+        ("build.innings_phases", lambda: phases.innings_phases(matches, deliveries), len(deliveries)),
+        ("build.partnerships", lambda: phases.partnerships(matches, deliveries), len(deliveries)),
+        ("build.batter_phases", lambda: phases.batter_phases(matches, deliveries), len(deliveries)),
+    ]
+
+
+def scaling_cases(matches, deliveries, index, worker_counts):
+    """
+    Sharded aggregation (player cube + team wins) at each worker count, and
+    the bare cost of starting a pool of that size: the overhead the shards
+    have to repay. Below parallel.MIN_SHARD_ROWS deliveries per shard the
+    aggregation stays in-process, so small scales show no pool at all.
+    """
+    cases = []
+    for workers in worker_counts:
+        cases.append((
+            f"parallel.aggregate_w{workers}",
+            lambda workers=workers: parallel.aggregate(matches, deliveries, workers, index=index),
+            len(deliveries),
+        ))
+        if workers > 1:
+            cases.append((
+                f"parallel.pool_start_w{workers}",
+                lambda workers=workers: parallel.map_tasks(abs, list(range(workers)), workers),
+                workers,
+            ))
+    return cases
+
+
+def filter_cases(matches, deliveries, index, seasons):
+    matches_f = matches[matches["season"].isin(seasons)]
+    return [
+        ("filter.matches_isin", lambda: matches[matches["season"].isin(seasons)], len(matches)),
+        ("filter.deliveries_isin", lambda: deliveries[deliveries["match_id"].isin(matches_f["id"])], len(deliveries)),
+        ("filter.deliveries_index", lambda: index.for_seasons(seasons), len(deliveries)),
+    ]
+
+
+def tab_cases(engine, seasons):
+    matches_f = engine.matches[engine.matches["season"].isin(seasons)]
+    team = engine.teams[0]
+    venue = stats.venue_match_count(matches_f)["venue"].iloc[0]
+    batter = stats.batter_runs(engine.player_cube, seasons)["batter"].iloc[0]
+    bowler = stats.bowler_wickets(engine.player_cube, seasons)["bowler"].iloc[0]
+
+    def overview():
+        stats.overview_totals(matches_f)
+        stats.matches_per_season(matches_f)
+        stats.toss_decision_counts(matches_f)
+        stats.result_type_counts(matches_f)
+
+    def teams():
+        stats.team_stats(matches_f)
+        stats.team_toss_tables(matches_f, team)
+        stats.venue_match_count(matches_f)
+        stats.venue_team_wins(matches_f, venue)
+
+    def teams_tensors():
+        tensors = engine.match_tensors
+        tensors.team_stats(seasons)
+        tensors.team_toss_tables(team, seasons)
+        tensors.venue_match_count(seasons)
+        tensors.venue_team_wins(venue, seasons)
+
+    def batting():
+        stats.batter_runs(engine.player_cube, seasons)
+        engine.batter_profile(batter, seasons)
+
+    def bowling():
+        stats.bowler_wickets(engine.player_cube, seasons)
+        engine.bowler_profile(bowler, seasons)
+
+    # Player tabs read the season x player cube, so their size is its cell count
+    cells = len(engine.player_cube.seasons) * len(engine.player_cube.players)
+    return [
+        ("tab.overview", overview, len(matches_f)),
+        ("tab.teams_venues", teams, len(matches_f)),
+        ("tab.teams_venues_tensors", teams_tensors, len(matches_f)),
+        ("tab.batting", batting, cells),
+        ("tab.bowling", bowling, cells),
+    ]
+
+
+def run_scale(scale, repeat, workdir, skip_load=False, worker_counts=(1,)):
+    matches, deliveries = synthetic.make_dataset(scale)
+    matches, deliveries, _ = encoding.encode_shared(matches, deliveries)
+    all_seasons = sorted(matches["season"].unique())
+    # A typical selection: the most recent half of the seasons
+    seasons = [int(s) for s in all_seasons[len(all_seasons) // 2:]]
+
+    cases = []
+    if not skip_load:
+        cases += load_cases(matches, deliveries, workdir)
+    cases += build_cases(matches, deliveries)
+    engine = IPLEngine(matches, deliveries)
+    cases += filter_cases(matches, deliveries, engine.index, seasons)
+    cases += scaling_cases(matches, deliveries, engine.index, worker_counts)
+    cases += tab_cases(engine, seasons)
+
+    results = []
+    for name, fn, rows in cases:
+        times = _timed(fn, repeat)
+        results.append({
+            "scale": scale,
+            "case": name,
+            "rows": int(rows),
+            "repeat": repeat,
+            "min_s": round(min(times), 6),
+            "median_s": round(statistics.median(times), 6),
+        })
+        print(f"{scale:>5}x  {name:<26} {min(times):10.4f}s  ({rows:,} rows)", file=sys.stderr)
+    return results
+
+
+def run(args):
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "scales": {str(scale): synthetic.dimensions(scale) for scale in args.scales},
+        "results": [],
+    }
+    cores = parallel.resolve_workers(0)
+    worker_counts = args.workers or sorted({1, 2, 4, cores} & set(range(1, cores + 1)))
+    report["meta"]["cores"] = cores
+    for scale in args.scales:
+        with tempfile.TemporaryDirectory(dir=args.workdir) as workdir:
+            report["results"] += run_scale(scale, args.repeat, workdir, args.skip_load, worker_counts)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            fh.write(text + "\n")
+    else:
+        print(text)
+
+
+def compare(args):
+    def by_case(path):
+        with open(path, encoding="utf-8") as fh:
+            return {(r["scale"], r["case"]): r for r in json.load(fh)["results"]}
+
+    base, head = by_case(args.base), by_case(args.head)
+    regressions = 0
+    for key in sorted(base.keys() & head.keys()):
+        ratio = head[key]["min_s"] / base[key]["min_s"] if base[key]["min_s"] > 0 else 1.0
+        flag = ""
+        if ratio > args.threshold:
+            regressions += 1
+            flag = "  <-- slower"
+        print(f"{key[0]:>5}x  {key[1]:<26} {base[key]['min_s']:10.4f}s -> {head[key]['min_s']:10.4f}s  x{ratio:5.2f}{flag}")
+    return 1 if regressions else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run")
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES,
+                        help="Multiples of the bundled data size, e.g. 1 10 100 1000")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Timed runs per case")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    parser.add_argument("--workdir", help="Directory for the generated CSVs and cache (default: system temp)")
+    parser.add_argument("--workers", type=int, nargs="+",
+                        help="Worker counts for the sharded aggregation cases (default: 1, 2, 4 and all cores)")
+    parser.add_argument("--skip-load", action="store_true", help="Skip the CSV / Arrow load cases")
+    parser.set_defaults(func=run)
+
+    commands = parser.add_subparsers(dest="command")
+    cmp = commands.add_parser("compare", help="Compare two JSON reports")
+    cmp.add_argument("base")
+    cmp.add_argument("head")
+    cmp.add_argument("--threshold", type=float, default=1.2, help="Slowdown ratio reported as a regression")
+    cmp.set_defaults(func=compare)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
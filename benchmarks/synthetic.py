@@ -0,0 +1,168 @@
+"""
+Synthetic matches / deliveries with the bundled schema, scaled by a factor
+of the bundled size (1095 matches, ~261k deliveries). Match and delivery
+counts scale linearly; seasons and players grow with sqrt(scale), as they
+do in real multi-league feeds; teams, venues and dismissal kinds stay at
+their real cardinalities.
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+
+BASE_MATCHES = 1095
+BASE_SEASONS = 17
+BASE_PLAYERS = 741
+N_TEAMS = 19
+N_VENUES = 58
+FIRST_SEASON = 2008
+
+TOSS_DECISIONS = ["bat", "field"]
+RESULTS = ["no result", "runs", "tie", "wickets"]
+RESULT_P = [0.005, 0.455, 0.012, 0.528]
+EXTRAS = ["byes", "legbyes", "noballs", "penalty", "wides"]
+DISMISSALS = [
+    "bowled", "caught", "caught and bowled", "hit wicket", "lbw",
+    "obstructing the field", "retired hurt", "retired out", "run out", "stumped",
+]
+DISMISSAL_P = [0.169, 0.617, 0.028, 0.001, 0.061, 0.0002, 0.0011, 0.0002, 0.0853, 0.0372]
+RUNS = [0, 1, 2, 3, 4, 6]
+RUNS_P = [0.38, 0.37, 0.07, 0.003, 0.115, 0.062]
+
+
+def dimensions(scale):
+    growth = math.ceil(math.sqrt(scale))
+    return {
+        "matches": BASE_MATCHES * scale,
+        "seasons": BASE_SEASONS * growth,
+        "players": BASE_PLAYERS * growth,
+    }
+
+
+def _categorical(codes, categories):
+    return pd.Categorical.from_codes(codes, categories=categories)
+
+
+def make_matches(scale=1, seed=0):
+    rng = np.random.default_rng(seed)
+    dims = dimensions(scale)
+    n = dims["matches"]
+    teams = [f"Team {i:02d}" for i in range(N_TEAMS)]
+    venues = [f"Venue {i:02d}, City {i % 36:02d}" for i in range(N_VENUES)]
+    players = [f"Player {i:05d}" for i in range(dims["players"])]
+
+    season_idx = np.sort(rng.integers(0, dims["seasons"], n))
+    team1 = rng.integers(0, N_TEAMS, n)
+    team2 = (team1 + rng.integers(1, N_TEAMS, n)) % N_TEAMS
+    toss_winner = np.where(rng.random(n) < 0.5, team1, team2)
+    result = rng.choice(len(RESULTS), n, p=RESULT_P)
+    winner = np.where(rng.random(n) < 0.5, team1, team2)
+    winner = np.where(result == 0, -1, winner)
+    margin = np.where(result == 1, rng.integers(1, 120, n), rng.integers(1, 10, n)).astype("float32")
+    margin[(result == 0) | (result == 2)] = np.nan
+
+    dates = pd.Timestamp(f"{FIRST_SEASON}-03-20") + pd.to_timedelta(
+        season_idx * 365 + rng.integers(0, 60, n), unit="D"
+    )
+    return pd.DataFrame({
+        "id": np.arange(1_000_000, 1_000_000 + n, dtype=np.int64),
+        "season": (FIRST_SEASON + season_idx).astype(np.int16),
+        "city": _categorical(rng.integers(0, 36, n), [f"City {i:02d}" for i in range(36)]),
+        "date": dates,
+        "match_type": _categorical(np.zeros(n, dtype=np.int8), ["League"]),
+        "player_of_match": _categorical(rng.integers(0, len(players), n), players),
+        "venue": _categorical(rng.integers(0, N_VENUES, n), venues),
+        "team1": _categorical(team1, teams),
+        "team2": _categorical(team2, teams),
+        "toss_winner": _categorical(toss_winner, teams),
+        "toss_decision": _categorical(rng.integers(0, 2, n), TOSS_DECISIONS),
+        "winner": _categorical(winner, teams),
+        "result": _categorical(result, RESULTS),
+        "result_margin": margin,
+        "target_runs": rng.integers(100, 260, n).astype("float32"),
+        "target_overs": np.full(n, 20.0, dtype="float32"),
+        "super_over": _categorical((result == 2).astype(np.int8), ["N", "Y"]),
+        "method": _categorical(np.full(n, -1, dtype=np.int8), ["D/L"]),
+        "umpire1": _categorical(rng.integers(0, 60, n), [f"Umpire {i:02d}" for i in range(60)]),
+        "umpire2": _categorical(rng.integers(0, 60, n), [f"Umpire {i:02d}" for i in range(60)]),
+    })
+
+
+def make_deliveries(matches, seed=1):
+    """~238 balls per match: two innings of 20 overs plus extras, 6 legal balls an over."""
+    rng = np.random.default_rng(seed)
+    n_players = len(matches["player_of_match"].cat.categories)
+    players = list(matches["player_of_match"].cat.categories)
+    teams = list(matches["team1"].cat.categories)
+
+    n_matches = len(matches)
+    balls_per_innings = rng.integers(112, 128, size=(n_matches, 2))
+    innings_len = balls_per_innings.ravel()
+    n = int(innings_len.sum())
+
+    match_pos = np.repeat(np.arange(n_matches), balls_per_innings.sum(axis=1))
+    inning = np.repeat(np.tile([1, 2], n_matches), innings_len).astype(np.int8)
+    starts = np.repeat(np.cumsum(innings_len) - innings_len, innings_len)
+    ball_no = np.arange(n) - starts
+    over = np.minimum(ball_no // 6, 19).astype(np.int8)
+    ball = (ball_no % 6 + 1).astype(np.int8)
+
+    team1 = matches["team1"].cat.codes.to_numpy().astype(np.int64)[match_pos]
+    team2 = matches["team2"].cat.codes.to_numpy().astype(np.int64)[match_pos]
+    batting = np.where(inning == 1, team1, team2)
+    bowling = np.where(inning == 1, team2, team1)
+
+    batsman_runs = np.asarray(RUNS, dtype=np.int8)[rng.choice(len(RUNS), n, p=RUNS_P)]
+    is_extra = rng.random(n) < 0.055
+    extras_type = np.where(is_extra, rng.choice(len(EXTRAS), n, p=[0.05, 0.2, 0.1, 0.002, 0.648]), -1)
+    extra_runs = np.where(is_extra, rng.integers(1, 3, n), 0).astype(np.int8)
+    batsman_runs = np.where(is_extra, 0, batsman_runs).astype(np.int8)
+    is_wicket = (rng.random(n) < 0.05).astype(np.int8)
+    dismissal = np.where(is_wicket == 1, rng.choice(len(DISMISSALS), n, p=np.divide(DISMISSAL_P, sum(DISMISSAL_P))), -1)
+
+    # Squads: each team draws from its own slice of the player pool
+    per_team = max(n_players // len(teams), 11)
+    batter = (batting * per_team + rng.integers(0, per_team, n)) % n_players
+    non_striker = (batting * per_team + rng.integers(0, per_team, n)) % n_players
+    bowler = (bowling * per_team + rng.integers(0, per_team, n)) % n_players
+    dismissed = np.where(is_wicket == 1, batter, -1)
+    fielder = np.where(is_wicket == 1, (bowling * per_team + rng.integers(0, per_team, n)) % n_players, -1)
+
+    return pd.DataFrame({
+        "match_id": matches["id"].to_numpy()[match_pos],
+        "inning": inning,
+        "batting_team": _categorical(batting, teams),
+        "bowling_team": _categorical(bowling, teams),
+        "over": over,
+        "ball": ball,
+        "batter": _categorical(batter, players),
+        "bowler": _categorical(bowler, players),
+        "non_striker": _categorical(non_striker, players),
+        "batsman_runs": batsman_runs,
+        "extra_runs": extra_runs,
+        "total_runs": (batsman_runs + extra_runs).astype(np.int8),
+        "extras_type": _categorical(extras_type, EXTRAS),
+        "is_wicket": is_wicket,
+        "player_dismissed": _categorical(dismissed, players),
+        "dismissal_kind": _categorical(dismissal, DISMISSALS),
+        "fielder": _categorical(fielder, players),
+    })
+
+
+def make_dataset(scale=1, seed=0):
+    matches = make_matches(scale, seed)
+    return matches, make_deliveries(matches, seed + 1)
+
+
+def write_wrapped_csv(df, path, chunk_rows=500_000):
+    """
+    Writes `df` in the bundled export layout (every row wrapped in quotes),
+    so load benchmarks exercise the same parsing path as the real files.
+    """
+    with open(path, "w", encoding="utf-8", newline="") as fh:
+        for start in range(0, len(df), chunk_rows):
+            chunk = df.iloc[start:start + chunk_rows]
+            body = chunk.to_csv(index=False, header=start == 0, lineterminator="\n", na_rep="NA")
+            lines = body.rstrip("\n").split("\n")
+            fh.write("".join('"' + line.replace('"', '""') + '"\n' for line in lines))
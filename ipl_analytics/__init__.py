@@ -0,0 +1,30 @@
+"""
+Data access and analytics for the IPL dashboard, importable without
+Streamlit or Plotly.
+"""
+
+from .cache import build_cache, dataset_version, load_cached_data
+from .cube import PlayerCube, build_player_cube
+from .encoding import DOMAINS, encode_shared
+from .engine import IPLEngine
+from .features import InningsFeatureStream, innings_features
+from .index import DeliveryIndex, build_delivery_index
+from .ingest import IngestStore, ingest_batch, ingest_csv
+from .live import LiveAggregates, LiveFeed
+from .loader import (
+    DELIVERIES_SCHEMA,
+    MATCHES_SCHEMA,
+    load_data,
+    load_deliveries,
+    load_matches,
+    read_csv_typed,
+)
+from .memo import ResultCache, filter_key, frame_hash
+from .profiling import RunProfiler
+from .similar import PlayerIndex, build_player_index
+from .simulate import forecast_season, simulate_seasons
+from .outcome import OutcomeModel, train_outcome_model
+from .phases import PHASES, batter_phases, innings_phases, partnerships
+from .players import NameIndex, load_auction, player_map
+from .sqlstore import SQLEngine, SQLStore
+from .tensors import MatchTensors, build_match_tensors
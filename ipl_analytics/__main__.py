@@ -0,0 +1,294 @@
+"""
+Command line entry point: `python -m ipl_analytics <command>`.
+"""
+
+import argparse
+import sys
+import time
+
+from . import cache, ingest, outcome, preprocess
+
+
+def _build_cache(args):
+    paths = cache.build_cache(args.matches, args.deliveries, args.cache_dir, args.key)
+    for path in paths:
+        print(f"✅ {path}")
+
+
+def _ingest(args):
+    version = ingest.ingest_csv(args.matches, args.deliveries, ingest.IngestStore(args.ingest_dir))
+    print(f"✅ Ingested {args.matches} + {args.deliveries} (dataset version {version})")
+
+
+def _build_sql(args):
+    from .sqlstore import open_store
+
+    store = open_store(args.matches, args.deliveries, args.path)
+    print(f"✅ {store.path} (dataset version {store.version()})")
+
+
+def _preprocess(args):
+    import resource
+
+    start = time.perf_counter()
+    manifest = preprocess.preprocess(
+        args.matches, args.deliveries, args.output, args.chunk_rows, args.buckets, args.workers, args.merged
+    )
+    elapsed = time.perf_counter() - start
+    for table, seasons in manifest["tables"].items():
+        rows_in = sum(s["rows_in"] for s in seasons.values())
+        rows_out = sum(s["rows_out"] for s in seasons.values())
+        # Merged rows are the deduplicated deliveries joined on, so nothing is dropped there
+        dropped = f" ({rows_in - rows_out:,} duplicates dropped)" if table != "merged" else ""
+        print(f"{table}: {rows_out:,} rows in {len(seasons)} season partitions{dropped}")
+    # ru_maxrss is KiB on Linux; the pool's workers report their own
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(
+        f"✅ {args.output or preprocess.PREPROCESS_DIR} in {elapsed:.1f} s · "
+        f"{manifest['buckets']} buckets per season · peak RSS {peak:.0f} MB",
+        file=sys.stderr
+    )
+
+
+def _train_outcome(args):
+    version = cache.dataset_version()
+    matches, _ = cache.load_cached_data()
+    model = outcome.train_outcome_model(matches, version, n_estimators=args.n_estimators)
+    path = model.save(args.model_dir)
+    print(f"✅ {path} (hold-out accuracy {model.metadata['test_accuracy']:.3f})")
+
+
+def _predict_outcomes(args):
+    from .engine import IPLEngine
+
+    model = outcome.load_model(args.model_dir)
+    if model is None:
+        raise SystemExit("No trained outcome model; run `python -m ipl_analytics train-outcome` first.")
+    matches = IPLEngine.load().matches_for(args.seasons)
+
+    timings = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        predictions = model.predict(matches)
+        timings.append(time.perf_counter() - start)
+    best = min(timings)
+
+    if args.output:
+        predictions.to_csv(args.output, index=False)
+    else:
+        print(predictions.to_string(index=False))
+    print(
+        f"✅ {len(predictions)} matches · model {model.version} · "
+        f"best {best * 1000:.1f} ms of {args.repeat} · {len(predictions) / best:,.0f} matches/s",
+        file=sys.stderr
+    )
+
+
+def _serve_outcomes(args):
+    from .engine import IPLEngine
+    from .service import serve
+
+    model = outcome.load_model(args.model_dir)
+    if model is None:
+        raise SystemExit("No trained outcome model; run `python -m ipl_analytics train-outcome` first.")
+    serve(IPLEngine.load(), model, args.host, args.port)
+
+
+def _simulate_season(args):
+    import pandas as pd
+
+    from . import simulate
+    from .engine import IPLEngine
+
+    model = outcome.load_model(args.model_dir)
+    if model is None:
+        raise SystemExit("No trained outcome model; run `python -m ipl_analytics train-outcome` first.")
+    engine = IPLEngine.load()
+    season = args.season or engine.seasons[-1]
+    if args.fixtures:
+        fixtures = pd.read_csv(args.fixtures)
+    else:
+        fixtures = simulate.league_fixtures(engine.matches_for([season]), season)
+    margins = simulate.run_rate_margins(engine.innings_phases())
+
+    start = time.perf_counter()
+    table = simulate.forecast_season(
+        model, fixtures, season, args.sims, seed=args.seed, workers=args.workers,
+        margins=margins, as_of=args.as_of, playoff_venue=args.playoff_venue
+    )
+    elapsed = time.perf_counter() - start
+    print(table.to_string(index=False))
+    print(
+        f"✅ {season}: {len(fixtures)} fixtures · {args.sims:,} seasons in {elapsed:.2f} s "
+        f"({args.sims / elapsed:,.0f} seasons/s) · model {model.version}",
+        file=sys.stderr
+    )
+
+    if args.scaling:
+        teams = sorted(set(fixtures["team1"].astype(str)) | set(fixtures["team2"].astype(str)))
+        fixture_p, pairwise = simulate.match_probabilities(model, fixtures, teams, season, args.playoff_venue)
+        lookup = pd.Index(teams)
+        report = simulate.throughput(
+            lookup.get_indexer(fixtures["team1"].astype(str)), lookup.get_indexer(fixtures["team2"].astype(str)),
+            fixture_p, pairwise, args.scaling, seed=args.seed, workers=args.workers, margins=margins
+        )
+        for n_sims, best, rate in report:
+            print(f"   {n_sims:>10,} seasons · best {best * 1000:9.1f} ms · {rate:12,.0f} seasons/s", file=sys.stderr)
+
+
+def _resolve_players(args):
+    from . import players
+    from .engine import IPLEngine
+
+    engine = IPLEngine.load()
+    auction = players.load_auction(args.auction)
+    start = time.perf_counter()
+    mapping = players.player_map(
+        auction, engine.player_cube.players,
+        lambda: players.appearances(engine.matches, engine.deliveries),
+        args.output, rebuild=args.rebuild, version=engine.version
+    )
+    elapsed = time.perf_counter() - start
+    counts = mapping["method"].value_counts()
+    print(" · ".join(f"{method} {count}" for method, count in counts.items()))
+    print(f"✅ {players.map_path(args.output)} ({len(mapping)} auction names, {elapsed:.2f} s)")
+
+
+def _follow_live(args):
+    import asyncio
+
+    from . import live
+
+    def show(snapshot):
+        scores = " | ".join(
+            f"{s['batting_team']} {s['runs']}/{s['wickets']} ({s['overs']})"
+            + (f" → {s['projected']}" if s["projected"] is not None else "")
+            for s in snapshot["innings"][-2:]
+        )
+        print(f"[{snapshot['balls']} balls] {scores}")
+
+    spec = args.feed or live.LIVE_FEED
+    if not spec:
+        raise SystemExit("No feed; pass --feed or set IPL_LIVE_FEED.")
+    score_model = None
+    if args.project:
+        from .engine import IPLEngine
+
+        score_model = IPLEngine.load().score_model
+    feed = live.LiveFeed(spec, args.push_interval, show, from_start=not args.tail, score_model=score_model)
+    try:
+        asyncio.run(feed.run(max_balls=args.max_balls))
+    except KeyboardInterrupt:
+        pass
+    report = feed.latency_report()
+    for name, stats in report.items():
+        print(
+            f"✅ {name} latency over {stats['count']} balls: p50 {stats['p50_ms']} ms · "
+            f"p95 {stats['p95_ms']} ms · p99 {stats['p99_ms']} ms · max {stats['max_ms']} ms",
+            file=sys.stderr
+        )
+
+
+def _replay_live(args):
+    import asyncio
+
+    from . import live
+    from .engine import IPLEngine
+
+    deliveries = IPLEngine.load().deliveries_for(args.seasons)
+    if args.match_id:
+        deliveries = deliveries[deliveries["match_id"].isin(args.match_id)]
+    sent = asyncio.run(live.replay(deliveries, args.target, args.rate))
+    print(f"✅ Replayed {sent} balls to {args.target}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m ipl_analytics")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build-cache", help="Pre-build the columnar data cache")
+    build.add_argument("--matches", help="Path to the matches CSV")
+    build.add_argument("--deliveries", help="Path to the deliveries CSV")
+    build.add_argument("--cache-dir", help="Cache directory (default: IPL_CACHE_DIR)")
+    build.add_argument("--key", choices=["mtime", "sha256"], help="Source fingerprint method")
+    build.set_defaults(func=_build_cache)
+
+    sql = commands.add_parser("build-sql", help="Build (or refresh) the SQLite query store")
+    sql.add_argument("--matches", help="Path to the matches CSV")
+    sql.add_argument("--deliveries", help="Path to the deliveries CSV")
+    sql.add_argument("--path", help="SQLite file (default: IPL_SQL_PATH)")
+    sql.set_defaults(func=_build_sql)
+
+    add = commands.add_parser("ingest", help="Append new matches and deliveries")
+    add.add_argument("--matches", required=True, help="CSV of new matches rows")
+    add.add_argument("--deliveries", required=True, help="CSV of new deliveries rows")
+    add.add_argument("--ingest-dir", help="Segment store (default: IPL_INGEST_DIR)")
+    add.set_defaults(func=_ingest)
+
+    prep = commands.add_parser("preprocess", help="Clean, deduplicate and season-partition the sources")
+    prep.add_argument("--matches", help="Path to the matches CSV")
+    prep.add_argument("--deliveries", help="Path to the deliveries CSV")
+    prep.add_argument("--output", help="Output directory (default: IPL_PREPROCESS_DIR)")
+    prep.add_argument("--chunk-rows", type=int, default=200_000, help="Rows per streamed chunk")
+    prep.add_argument("--buckets", type=int, help="Hash buckets per season (default: by input size)")
+    prep.add_argument("--workers", type=int, default=1, help="Processes for the dedup pass (0 = every core)")
+    prep.add_argument("--merged", action="store_true", help="Also write deliveries joined with their matches")
+    prep.set_defaults(func=_preprocess)
+
+    train = commands.add_parser("train-outcome", help="Train and save the match-outcome model")
+    train.add_argument("--model-dir", help="Artifact directory (default: IPL_MODEL_DIR)")
+    train.add_argument("--n-estimators", type=int, default=200, help="Trees in the random forest")
+    train.set_defaults(func=_train_outcome)
+
+    predict = commands.add_parser("predict-outcomes", help="Batch-predict match winners")
+    predict.add_argument("--seasons", type=int, nargs="*", help="Seasons to score (default: all)")
+    predict.add_argument("--model-dir", help="Artifact directory (default: IPL_MODEL_DIR)")
+    predict.add_argument("--output", help="Write predictions to this CSV instead of stdout")
+    predict.add_argument("--repeat", type=int, default=5, help="Timed runs for the latency figure")
+    predict.set_defaults(func=_predict_outcomes)
+
+    serve = commands.add_parser("serve-outcomes", help="Serve batch predictions over local HTTP")
+    serve.add_argument("--model-dir", help="Artifact directory (default: IPL_MODEL_DIR)")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.set_defaults(func=_serve_outcomes)
+
+    forecast = commands.add_parser("simulate-season", help="Monte Carlo playoff and title odds for a season")
+    forecast.add_argument("--season", type=int, help="Season whose fixtures to simulate (default: latest)")
+    forecast.add_argument("--fixtures", help="CSV of team1, team2, venue fixtures instead of the season's")
+    forecast.add_argument("--sims", type=int, default=100_000, help="Simulated seasons")
+    forecast.add_argument("--seed", type=int, help="Seed for reproducible odds")
+    forecast.add_argument("--workers", type=int, default=1, help="Processes (0 = every core)")
+    forecast.add_argument("--as-of", help="Keep the results of fixtures played before this date")
+    forecast.add_argument("--playoff-venue", help="Venue the playoffs are scored at (default: busiest)")
+    forecast.add_argument("--scaling", type=int, nargs="*", help="Also time these simulation counts")
+    forecast.add_argument("--model-dir", help="Artifact directory (default: IPL_MODEL_DIR)")
+    forecast.set_defaults(func=_simulate_season)
+
+    resolve = commands.add_parser("resolve-players", help="Map auction names to ball-by-ball player names")
+    resolve.add_argument("--auction", help="Path to the auction CSV")
+    resolve.add_argument("--output", help="Player map CSV (default: IPL_PLAYER_MAP or the cache directory)")
+    resolve.add_argument("--rebuild", action="store_true", help="Re-resolve every name; overrides still apply")
+    resolve.set_defaults(func=_resolve_players)
+
+    follow = commands.add_parser("follow-live", help="Follow a live ball-by-ball feed and report latency")
+    follow.add_argument("--feed", help="Feed file or tcp://host:port (default: IPL_LIVE_FEED)")
+    follow.add_argument("--push-interval", type=float, help="Seconds between KPI pushes")
+    follow.add_argument("--max-balls", type=int, help="Stop after this many balls")
+    follow.add_argument("--tail", action="store_true", help="Skip lines already in the feed file")
+    follow.add_argument("--project", action="store_true", help="Project first-innings totals (trains a score model)")
+    follow.set_defaults(func=_follow_live)
+
+    replay = commands.add_parser("replay-live", help="Replay historical balls into a live feed")
+    replay.add_argument("target", help="Feed file or tcp://host:port")
+    replay.add_argument("--seasons", type=int, nargs="*", help="Seasons to replay (default: all)")
+    replay.add_argument("--match-id", type=int, nargs="*", help="Only these matches")
+    replay.add_argument("--rate", type=float, default=6.0, help="Balls per second (0 = unthrottled)")
+    replay.set_defaults(func=_replay_live)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,249 @@
+import hashlib
+import os
+import tempfile
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from . import loader
+from .cube import PlayerCube, build_player_cube
+from .encoding import encode_shared
+
+# --- CACHE LOCATION & KEYING ---
+# Replicas that point IPL_CACHE_DIR at the same directory share one cache.
+CACHE_DIR = os.environ.get("IPL_CACHE_DIR", os.path.join(loader.DATA_DIR, ".ipl_cache"))
+
+# "mtime" keys on size + modification time (free); "sha256" hashes the file
+# contents, which survives copies that reset mtimes across deployments.
+CACHE_KEY = os.environ.get("IPL_CACHE_KEY", "mtime")
+
+# Bump when the schemas, parsing rules or file layout change so stale caches
+# are ignored (2: one record batch per table, so columns can be mapped).
+CACHE_FORMAT = 2
+
+# Player cubes of this many most recent dataset versions are kept, so
+# replicas on neighbouring versions (mid-rollout, or just after an ingest)
+# do not delete each other's cube.
+CUBE_VERSIONS = 4
+
+
+def source_fingerprint(file_path, key=None):
+    """Returns a short hex fingerprint identifying the contents of a source file."""
+    key = key or CACHE_KEY
+    digest = hashlib.sha256(f"v{CACHE_FORMAT}:{os.path.basename(file_path)}".encode())
+
+    if key == "sha256":
+        with open(file_path, "rb") as fh:
+            for block in iter(lambda: fh.read(1 << 20), b""):
+                digest.update(block)
+    elif key == "mtime":
+        stat = os.stat(file_path)
+        digest.update(f"{stat.st_size}:{stat.st_mtime_ns}".encode())
+    else:
+        raise ValueError(f"Unknown cache key '{key}'; use 'mtime' or 'sha256'.")
+
+    return digest.hexdigest()[:16]
+
+
+def dataset_version(match_path=None, deliv_path=None, key=None, ingest_dir=None):
+    """
+    Fingerprint of the matches + deliveries sources plus any ingested
+    segments, used to key derived results.
+    """
+    from .ingest import IngestStore
+
+    match_path, deliv_path = resolve_paths(match_path, deliv_path)
+    combined = (
+        source_fingerprint(match_path, key)
+        + source_fingerprint(deliv_path, key)
+        + IngestStore(ingest_dir).fingerprint(key)
+    )
+    return hashlib.sha256(combined.encode()).hexdigest()[:16]
+
+
+def resolve_paths(match_path, deliv_path):
+    return (
+        match_path or os.path.join(loader.DATA_DIR, loader.MATCHES_FILE),
+        deliv_path or os.path.join(loader.DATA_DIR, loader.DELIVERIES_FILE),
+    )
+
+
+def _cache_path(cache_dir, name, fingerprint):
+    return os.path.join(cache_dir, f"{name}-{fingerprint}.arrow")
+
+
+def write_table_atomic(df, path):
+    """
+    Writes an uncompressed, single-batch Arrow IPC file via a temp file +
+    rename, so a replica reading the cache never sees a half-written table
+    and every column is one contiguous buffer that `read_table` can map.
+    """
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    os.close(fd)
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        feather.write_feather(table, tmp_path, compression="uncompressed", chunksize=max(len(df), 1))
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _mapped_column(column):
+    """
+    A column of a memory-mapped table without copying it where possible:
+    null-free numeric columns become read-only NumPy views of the mapping
+    and null-free dictionary columns categoricals over their mapped
+    indices. Anything else (nulls, strings, dates) is converted.
+    """
+    if column.num_chunks == 1 and column.null_count == 0:
+        chunk = column.chunk(0)
+        if pa.types.is_integer(chunk.type) or pa.types.is_floating(chunk.type):
+            return chunk.to_numpy(zero_copy_only=True)
+        if pa.types.is_dictionary(chunk.type) and pa.types.is_integer(chunk.type.index_type):
+            dtype = pd.CategoricalDtype(chunk.dictionary.to_pandas(), ordered=chunk.type.ordered)
+            return pd.Categorical.from_codes(chunk.indices.to_numpy(zero_copy_only=True), dtype=dtype, validate=False)
+    return column.to_pandas()
+
+
+def read_table(path):
+    """
+    A cached Arrow IPC file as a DataFrame whose numeric columns and
+    category codes are views of the memory-mapped file, so processes
+    reading one cache file share its pages (see `_mapped_column`).
+    """
+    table = feather.read_table(path, memory_map=True)
+    return pd.DataFrame(
+        {name: _mapped_column(column) for name, column in zip(table.column_names, table.columns)}, copy=False
+    )
+
+
+def _remove_stale(cache_dir, name, keep):
+    for entry in os.listdir(cache_dir):
+        if entry.startswith(f"{name}-") and entry.endswith(".arrow") and entry != keep:
+            try:
+                os.remove(os.path.join(cache_dir, entry))
+            except OSError:
+                # Another replica may still be mapping it or already removed it
+                pass
+
+
+def cached_table(name, file_path, parse, cache_dir=None, key=None):
+    """
+    Returns the parsed table for `file_path`, read from the Arrow cache
+    when its fingerprint matches and parsed (then cached) otherwise.
+
+    A cache hit memory-maps the file (see `read_table`); a miss parses,
+    writes the cache and returns the frame read back from it, so the first
+    process shares the mapping too.
+    """
+    cache_dir = cache_dir or CACHE_DIR
+    fingerprint = source_fingerprint(file_path, key)
+    path = _cache_path(cache_dir, name, fingerprint)
+
+    if os.path.exists(path):
+        return read_table(path)
+
+    df = parse(file_path)
+    try:
+        write_table_atomic(df, path)
+        _remove_stale(cache_dir, name, os.path.basename(path))
+    except OSError:
+        # A read-only deployment still serves the freshly parsed frame
+        return df
+    return read_table(path)
+
+
+def load_cached_data(match_path=None, deliv_path=None, cache_dir=None, key=None, ingest_dir=None):
+    """
+    Cache-backed equivalent of `loader.load_data`, with any segments
+    appended through `ingest` concatenated after the source rows.
+    """
+    from .ingest import IngestStore
+
+    match_path, deliv_path = resolve_paths(match_path, deliv_path)
+    matches = cached_table("matches", match_path, loader.load_matches, cache_dir, key)
+    deliveries = cached_table("deliveries", deliv_path, loader.load_deliveries, cache_dir, key)
+
+    store = IngestStore(ingest_dir)
+    if store.segments():
+        matches = loader.concat_frames([matches] + store.load_segments("matches"))
+        deliveries = loader.concat_frames([deliveries] + store.load_segments("deliveries"))
+
+    matches, deliveries, _ = encode_shared(matches, deliveries)
+    return matches, deliveries
+
+
+def build_cache(match_path=None, deliv_path=None, cache_dir=None, key=None):
+    """
+    Parses the sources into the cache ahead of time; returns the cache file
+    paths. Only the source tables are cached: ingested segments are read
+    as they are, so the ingest store is not touched.
+    """
+    match_path, deliv_path = resolve_paths(match_path, deliv_path)
+    cache_dir = cache_dir or CACHE_DIR
+    cached_table("matches", match_path, loader.load_matches, cache_dir, key)
+    cached_table("deliveries", deliv_path, loader.load_deliveries, cache_dir, key)
+    return [
+        _cache_path(cache_dir, "matches", source_fingerprint(match_path, key)),
+        _cache_path(cache_dir, "deliveries", source_fingerprint(deliv_path, key)),
+    ]
+
+
+# --- PLAYER CUBES ---
+def _cube_path(cache_dir, version):
+    return os.path.join(cache_dir, f"player_cube-{version}.npz")
+
+
+def load_cube(version, cache_dir=None):
+    """The PlayerCube saved for dataset `version`, or None."""
+    path = _cube_path(cache_dir or CACHE_DIR, version)
+    return PlayerCube.load(path) if os.path.exists(path) else None
+
+
+def save_cube(cube, version, cache_dir=None):
+    """Saves the cube for `version` atomically and drops all but the CUBE_VERSIONS newest."""
+    cache_dir = cache_dir or CACHE_DIR
+    os.makedirs(cache_dir, exist_ok=True)
+    path = _cube_path(cache_dir, version)
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".npz")
+    os.close(fd)
+    cube.save(tmp_path)
+    os.chmod(tmp_path, 0o644)
+    os.replace(tmp_path, path)
+
+    cubes = []
+    for entry in os.listdir(cache_dir):
+        if entry.startswith("player_cube-") and entry.endswith(".npz"):
+            try:
+                cubes.append((os.path.getmtime(os.path.join(cache_dir, entry)), entry))
+            except OSError:
+                pass
+    for _, entry in sorted(cubes, reverse=True)[CUBE_VERSIONS:]:
+        if entry != os.path.basename(path):
+            try:
+                os.remove(os.path.join(cache_dir, entry))
+            except OSError:
+                # Another replica may already have removed it
+                pass
+
+
+def cached_cube(version, matches, deliveries, build=None, cache_dir=None):
+    """
+    The PlayerCube for dataset `version`: loaded when it was saved (e.g.
+    merged by an ingest), otherwise built from the frames with `build`
+    (default: cube.build_player_cube) and saved.
+    """
+    cube = load_cube(version, cache_dir)
+    if cube is None:
+        cube = (build or build_player_cube)(matches, deliveries)
+        try:
+            save_cube(cube, version, cache_dir)
+        except OSError:
+            pass
+    return cube
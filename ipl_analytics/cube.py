@@ -0,0 +1,190 @@
+import numpy as np
+import pandas as pd
+
+from . import encoding as enc
+
+# Dismissals that are not credited to the bowler
+NON_BOWLER_DISMISSALS = ["run out", "retired hurt", "obstructing the field"]
+ILLEGAL_EXTRAS = ["wides", "noballs", "wide", "noball"]
+
+BATTING_METRICS = ["runs", "balls", "fours", "sixes"]
+BOWLING_METRICS = ["legal_balls", "runs_conceded", "wickets"]
+
+
+def delivery_seasons(matches, deliveries):
+    """Season of every delivery, looked up through the match id (-1 if unknown)."""
+    pos = pd.Index(matches["id"]).get_indexer(deliveries["match_id"])
+    season = matches["season"].to_numpy(dtype="float64", na_value=np.nan)
+    out = np.full(len(pos), -1, dtype=np.int32)
+    found = pos >= 0
+    values = season[pos[found]]
+    out[found] = np.where(np.isnan(values), -1, values).astype(np.int32)
+    return out
+
+
+def bowler_wicket_mask(deliveries):
+    """Deliveries on which the bowler is credited with a wicket."""
+    return (
+        (deliveries["is_wicket"].to_numpy() == 1)
+        & ~deliveries["dismissal_kind"].isin(NON_BOWLER_DISMISSALS).to_numpy()
+    )
+
+
+def legal_ball_mask(deliveries):
+    """Deliveries that count towards a bowler's balls (no wides / no-balls)."""
+    if "extras_type" in deliveries.columns:
+        return ~deliveries["extras_type"].isin(ILLEGAL_EXTRAS).to_numpy()
+    if "extra_runs" in deliveries.columns:
+        # Fallback (using extra_runs=0 as a proxy for legal ball)
+        return deliveries["extra_runs"].to_numpy() == 0
+    return np.ones(len(deliveries), dtype=bool)
+
+
+class PlayerCube:
+    """
+    Dense (season x player) arrays of batting and bowling totals. Every
+    query sums rows for the selected seasons, so its cost depends on the
+    number of seasons and players, never on the number of deliveries.
+    """
+
+    def __init__(self, seasons, players, metrics):
+        self.seasons = np.asarray(seasons)
+        self.players = pd.Index(players)
+        self.metrics = metrics
+
+    def _season_rows(self, seasons):
+        if seasons is None or len(seasons) == 0:
+            return np.ones(len(self.seasons), dtype=bool)
+        return np.isin(self.seasons, np.asarray(list(seasons), dtype=self.seasons.dtype))
+
+    def totals(self, metric, seasons=None):
+        """Per-player total of `metric` over `seasons` (all seasons when empty)."""
+        return self.metrics[metric][self._season_rows(seasons)].sum(axis=0)
+
+    def batting(self, seasons=None):
+        """Batting totals per batter who faced a ball in `seasons`."""
+        balls = self.totals("balls", seasons)
+        present = np.flatnonzero(balls > 0)
+        frame = pd.DataFrame({"batter": self.players[present]})
+        for metric in BATTING_METRICS:
+            frame[metric] = self.totals(metric, seasons)[present]
+        return frame
+
+    def bowling(self, seasons=None):
+        """Bowling totals per bowler who bowled a ball in `seasons`."""
+        bowled = self.totals("balls_bowled", seasons)
+        present = np.flatnonzero(bowled > 0)
+        frame = pd.DataFrame({"bowler": self.players[present]})
+        for metric in BOWLING_METRICS:
+            frame[metric] = self.totals(metric, seasons)[present]
+        return frame
+
+    def player_totals(self, player, metrics, seasons=None):
+        """Dict of `metrics` summed over `seasons` for one player."""
+        if player not in self.players:
+            return {metric: 0 for metric in metrics}
+        col = self.players.get_loc(player)
+        rows = self._season_rows(seasons)
+        return {metric: int(self.metrics[metric][rows, col].sum()) for metric in metrics}
+
+    def player_seasons(self, player, metric, seasons=None, present_metric=None):
+        """
+        Season-wise values of `metric` for one player, limited to seasons
+        where `present_metric` (default: `metric`) is non-zero.
+        """
+        rows = self._season_rows(seasons)
+        if player not in self.players:
+            return pd.DataFrame({"season": [], metric: []})
+        col = self.players.get_loc(player)
+        values = self.metrics[metric][rows, col]
+        present = self.metrics[present_metric or metric][rows, col] > 0
+        return pd.DataFrame({
+            "season": self.seasons[rows][present],
+            metric: values[present],
+        })
+
+    def season_totals(self, metrics, seasons=None):
+        """Long (season, player, *metrics) frame of the non-zero cells for `seasons`."""
+        rows = self._season_rows(seasons)
+        values = {metric: self.metrics[metric][rows] for metric in metrics}
+        season_idx, player_idx = np.nonzero(sum(v != 0 for v in values.values()))
+        frame = pd.DataFrame({
+            "season": self.seasons[rows][season_idx],
+            "player": self.players[player_idx],
+        })
+        for metric in metrics:
+            frame[metric] = values[metric][season_idx, player_idx]
+        return frame
+
+    def merge(self, other):
+        """
+        Returns a cube holding the sum of both cubes, aligned by season and
+        player name. Cost scales with the cube sizes, not the deliveries.
+        """
+        seasons = np.union1d(self.seasons, other.seasons)
+        players = self.players.append(other.players.difference(self.players))
+        metrics = {}
+        for metric in self.metrics:
+            merged = np.zeros((len(seasons), len(players)), dtype=np.int64)
+            for cube in (self, other):
+                rows = np.searchsorted(seasons, cube.seasons)
+                cols = players.get_indexer(cube.players)
+                merged[np.ix_(rows, cols)] += cube.metrics[metric]
+            metrics[metric] = merged
+        return PlayerCube(seasons, players, metrics)
+
+    def save(self, path):
+        np.savez(
+            path,
+            seasons=self.seasons,
+            players=np.asarray(self.players, dtype=object).astype(str),
+            **{f"metric_{name}": values for name, values in self.metrics.items()}
+        )
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            metrics = {
+                key[len("metric_"):]: data[key] for key in data.files if key.startswith("metric_")
+            }
+            return cls(data["seasons"], data["players"].tolist(), metrics)
+
+
+def build_player_cube(matches, deliveries):
+    """
+    Aggregates deliveries once into a PlayerCube. Batter and bowler must
+    share one dictionary (see encoding.encode_shared).
+    """
+    season = delivery_seasons(matches, deliveries)
+    seasons = np.unique(season[season >= 0])
+    season_idx = np.searchsorted(seasons, season)
+
+    players = deliveries["batter"].cat.categories
+    n_players = len(players)
+    shape = (len(seasons), n_players)
+    valid = season >= 0
+
+    def cube(player_codes, weights=None, mask=None):
+        keep = valid & (player_codes >= 0)
+        if mask is not None:
+            keep &= mask
+        flat = season_idx[keep] * n_players + player_codes[keep]
+        w = None if weights is None else np.asarray(weights, dtype=np.float64)[keep]
+        counts = np.bincount(flat, weights=w, minlength=shape[0] * n_players)
+        return counts.reshape(shape).astype(np.int64)
+
+    batter = enc.codes(deliveries["batter"])
+    bowler = enc.codes(deliveries["bowler"])
+    runs = deliveries["batsman_runs"].to_numpy()
+
+    metrics = {
+        "runs": cube(batter, runs),
+        "balls": cube(batter),
+        "fours": cube(batter, mask=runs == 4),
+        "sixes": cube(batter, mask=runs == 6),
+        "balls_bowled": cube(bowler),
+        "legal_balls": cube(bowler, mask=legal_ball_mask(deliveries)),
+        "runs_conceded": cube(bowler, deliveries["total_runs"].to_numpy()),
+        "wickets": cube(bowler, mask=bowler_wicket_mask(deliveries)),
+    }
+    return PlayerCube(seasons, players, metrics)
@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+
+# --- SHARED DICTIONARIES ---
+# Columns in the same domain share one CategoricalDtype across both tables,
+# so a team or player has the same integer code wherever it appears.
+DOMAINS = {
+    "team": {
+        "matches": ["team1", "team2", "toss_winner", "winner"],
+        "deliveries": ["batting_team", "bowling_team"],
+    },
+    "player": {
+        "matches": ["player_of_match"],
+        "deliveries": ["batter", "bowler", "non_striker", "player_dismissed", "fielder"],
+    },
+    "venue": {
+        "matches": ["venue"],
+        "deliveries": [],
+    },
+}
+
+
+def _domain_values(tables, columns_by_table):
+    values = set()
+    for table_name, columns in columns_by_table.items():
+        df = tables[table_name]
+        for col in columns:
+            if col not in df.columns:
+                continue
+            series = df[col]
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                values.update(series.cat.categories)
+            else:
+                values.update(series.dropna().unique())
+    return values
+
+
+def _recode(series, dtype):
+    # astype() is a no-op when the category *sets* match in a different
+    # order (unordered dtypes compare equal), so recode explicitly.
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.set_categories(dtype.categories)
+    return series.astype(dtype)
+
+
+def encode_shared(matches, deliveries):
+    """
+    Recodes every domain column onto one sorted dictionary per domain.
+    Returns (matches, deliveries, dictionaries) where `dictionaries` maps a
+    domain name to the CategoricalDtype its columns now share.
+    """
+    tables = {"matches": matches.copy(deep=False), "deliveries": deliveries.copy(deep=False)}
+    dictionaries = {}
+
+    for domain, columns_by_table in DOMAINS.items():
+        dtype = pd.CategoricalDtype(sorted(_domain_values(tables, columns_by_table)))
+        dictionaries[domain] = dtype
+        for table_name, columns in columns_by_table.items():
+            df = tables[table_name]
+            for col in columns:
+                if col in df.columns:
+                    df[col] = _recode(df[col], dtype)
+
+    return tables["matches"], tables["deliveries"], dictionaries
+
+
+def codes(series):
+    """Integer codes of a categorical column (-1 for missing)."""
+    return series.cat.codes.to_numpy()
+
+
+def code_of(series, name):
+    """Dictionary code of `name` in the column's categories, or -1 if absent."""
+    categories = series.cat.categories
+    return int(categories.get_loc(name)) if name in categories else -1
+
+
+def count_by_code(series):
+    """Occurrences per category as an int array aligned to the categories."""
+    c = codes(series)
+    return np.bincount(c[c >= 0], minlength=len(series.cat.categories))
+
+
+def sum_by_code(series, values):
+    """Sum of `values` per category as an array aligned to the categories."""
+    c = codes(series)
+    mask = c >= 0
+    weights = np.asarray(values, dtype=np.float64)[mask]
+    return np.bincount(c[mask], weights=weights, minlength=len(series.cat.categories))
+
+
+def decode(categories, counts, name, value_name, present=None):
+    """
+    Turns a per-code array back into a (name, value) frame for display,
+    keeping only codes that occur (`present`, defaulting to counts > 0).
+    """
+    present = counts > 0 if present is None else present
+    idx = np.flatnonzero(present)
+    return pd.DataFrame({
+        name: np.asarray(categories)[idx],
+        value_name: counts[idx],
+    })
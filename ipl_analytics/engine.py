@@ -0,0 +1,366 @@
+import pandas as pd
+
+from . import cache, features, outcome, parallel, phases, players, similar, simulate, stats
+from .cube import BATTING_METRICS, BOWLING_METRICS
+from .index import build_delivery_index, season_slice
+from .memo import ResultCache, filter_key
+from .memory import MemoryLedger, freeze
+from .tensors import build_match_tensors
+
+
+class IPLEngine:
+    """
+    Headless analytics over one dataset version: loading, season filtering
+    and the team, venue, batting and bowling statistics the dashboard shows.
+    Results are memoized per (version, seasons[, team / venue / player]),
+    so repeated queries from notebooks, batch jobs or the app are lookups.
+
+    One engine serves every session of a process: the loaded frames and
+    aggregates are frozen (read-only buffers), season filters return views
+    of them, and results are shared. Treat returned frames as read-only.
+    """
+
+    def __init__(self, matches, deliveries, version=None, result_cache=None, player_cube=None, workers=None):
+        self.version = version or "in-memory"
+        if "season" in matches.columns and not matches["season"].is_monotonic_increasing:
+            # Season-sorted, so a season selection is a positional slice
+            matches = matches.sort_values("season", kind="stable", ignore_index=True)
+        self.matches = matches
+        self.index = build_delivery_index(matches, deliveries)
+        if player_cube is None:
+            # Sharded over `workers` processes (IPL_WORKERS) when more than one
+            def build(m, d):
+                return parallel.build_player_cube_sharded(m, d, workers, index=self.index)
+            # Versioned engines reuse the cube cached (and grown by ingest) per version
+            player_cube = (
+                cache.cached_cube(version, matches, deliveries, build=build) if version
+                else build(matches, deliveries)
+            )
+        self.player_cube = player_cube
+        # Team, venue and toss views are season slices of these (see tensors.py)
+        self.match_tensors = build_match_tensors(matches)
+        self.results = result_cache if result_cache is not None else ResultCache()
+        self._outcome_model = None
+        self._score_model = None
+        self._auction = None
+        # Similar-player indexes, built on first use and kept for the engine's
+        # (the dataset version's) lifetime, outside the evictable result cache
+        self._player_indexes = {}
+
+        freeze([self.matches, self.index.deliveries, self.player_cube.metrics, self.match_tensors.arrays])
+        self.memory = MemoryLedger()
+        self.memory.register("data", [self.matches, self.index])
+        self.memory.register("aggregates", [self.player_cube, self.match_tensors])
+        self.memory.register("similarity", self._player_indexes)
+        self.memory.register("results", self.results)
+
+    @classmethod
+    def load(cls, match_path=None, deliv_path=None, result_cache=None, workers=None):
+        """Engine over the current sources (Arrow cache + ingested segments)."""
+        version = cache.dataset_version(match_path, deliv_path)
+        matches, deliveries = cache.load_cached_data(match_path, deliv_path)
+        return cls(matches, deliveries, version, result_cache, workers=workers)
+
+    # --- memoization ---
+    def _cached(self, name, seasons, compute, extra=None):
+        key = (name,) + filter_key(self.version, seasons, extra)
+        return self.results.get(key, compute)
+
+    # --- memory ---
+    def memory_report(self):
+        """Bytes of the shared data, aggregates and cached results (each buffer counted once)."""
+        return self.memory.report()
+
+    def session_bytes(self, objects):
+        """Bytes a session's `objects` hold beyond this engine's shared buffers."""
+        return self.memory.session_bytes(objects)
+
+    # --- filters ---
+    @property
+    def deliveries(self):
+        return self.index.deliveries
+
+    @property
+    def seasons(self):
+        if "season" not in self.matches.columns:
+            return []
+        return sorted(self.matches["season"].dropna().astype(int).unique())
+
+    @property
+    def teams(self):
+        return sorted(
+            pd.unique(
+                pd.concat(
+                    [self.matches["team1"], self.matches["team2"], self.matches["winner"]],
+                    axis=0
+                ).dropna()
+            )
+        )
+
+    def matches_for(self, seasons=None):
+        """Matches of `seasons` (all matches when empty); a view when the seasons are contiguous."""
+        if not seasons:
+            return self.matches
+        return self._cached("matches", seasons, lambda: season_slice(self.matches, seasons))
+
+    def deliveries_for(self, seasons=None):
+        """Balls of `seasons` through the season range index (a view when contiguous)."""
+        return self.index.for_seasons(seasons)
+
+    @property
+    def delivery_columns(self):
+        return list(self.deliveries.columns)
+
+    def delivery_count(self, seasons=None):
+        """Number of balls in `seasons`."""
+        return len(self.deliveries_for(seasons))
+
+    # --- overview ---
+    def overview(self, seasons=None):
+        """Dict of the Overview KPIs and tables."""
+        def compute():
+            matches_f = self.matches_for(seasons)
+            out = {"totals": stats.overview_totals(matches_f)}
+            if "season" in matches_f.columns:
+                out["matches_per_season"] = stats.matches_per_season(matches_f)
+            if "toss_decision" in matches_f.columns:
+                out["toss_counts"] = stats.toss_decision_counts(matches_f)
+            if "result" in matches_f.columns:
+                out["result_counts"] = stats.result_type_counts(matches_f)
+            return out
+        return self._cached("overview", seasons, compute)
+
+    def victory_margins(self, seasons=None):
+        """Server-side histograms of winning margins: {"runs": 30 bins, "wickets": 10 bins}."""
+        def compute():
+            matches_f = self.matches_for(seasons)
+            return {
+                "runs": stats.victory_margin_bins(matches_f, "runs", 30),
+                "wickets": stats.victory_margin_bins(matches_f, "wickets", 10),
+            }
+        return self._cached("victory_margins", seasons, compute)
+
+    # --- teams & venues ---
+    def team_stats(self, seasons=None):
+        """Matches played, wins and win % per team, sorted by wins."""
+        return self._cached("team_stats", seasons, lambda: self.match_tensors.team_stats(seasons))
+
+    def head_to_head(self, seasons=None):
+        """(wins, played) team x team frames: wins.loc[a, b] is how often a beat b."""
+        return self._cached("head_to_head", seasons, lambda: self.match_tensors.head_to_head(seasons))
+
+    def team_record(self, team, seasons=None):
+        """Played, won, lost and win % of `team` against each opponent."""
+        return self._cached(
+            "team_record", seasons, lambda: self.match_tensors.team_record(team, seasons), extra=team
+        )
+
+    def team_toss_tables(self, team, seasons=None):
+        """(toss decision counts, win % after winning the toss) for `team`."""
+        return self._cached(
+            "team_toss", seasons, lambda: self.match_tensors.team_toss_tables(team, seasons), extra=team
+        )
+
+    def toss_outcomes(self, seasons=None):
+        """Toss winners' won / lost / no-result counts and win % per toss decision."""
+        return self._cached("toss_outcomes", seasons, lambda: self.match_tensors.toss_outcomes(seasons))
+
+    def venue_stats(self, seasons=None):
+        """Matches per venue, most used first."""
+        return self._cached("venue_match_count", seasons, lambda: self.match_tensors.venue_match_count(seasons))
+
+    def venue_team_wins(self, venue, seasons=None):
+        """Wins per team at `venue`."""
+        return self._cached(
+            "venue_team_wins", seasons, lambda: self.match_tensors.venue_team_wins(venue, seasons), extra=venue
+        )
+
+    def venue_results(self, seasons=None):
+        """Bat-first and chasing wins per venue."""
+        return self._cached("venue_results", seasons, lambda: self.match_tensors.venue_results(seasons))
+
+    # --- players ---
+    def batter_runs(self, seasons=None):
+        return self._cached("batter_runs", seasons, lambda: stats.batter_runs(self.player_cube, seasons))
+
+    def bowler_wickets(self, seasons=None):
+        return self._cached("bowler_wk", seasons, lambda: stats.bowler_wickets(self.player_cube, seasons))
+
+    def top_batters(self, seasons=None, n=10):
+        """Top `n` run scorers over `seasons`."""
+        return self.batter_runs(seasons).head(n)
+
+    def top_bowlers(self, seasons=None, n=10):
+        """Top `n` wicket takers over `seasons`."""
+        return self.bowler_wickets(seasons).head(n)
+
+    def batter_profile(self, name, seasons=None):
+        """Runs, balls, 4s, 6s, strike rate and season-wise runs of one batter."""
+        profile = self.player_cube.player_totals(name, BATTING_METRICS, seasons)
+        balls = profile["balls"]
+        profile["strike_rate"] = round((profile["runs"] / balls) * 100, 2) if balls > 0 else 0
+        profile["season_runs"] = (
+            self.player_cube.player_seasons(name, "runs", seasons, present_metric="balls")
+            .rename(columns={"runs": "season_runs"})
+        )
+        return profile
+
+    def bowler_profile(self, name, seasons=None):
+        """Wickets, runs conceded, legal balls, economy and season-wise wickets of one bowler."""
+        profile = self.player_cube.player_totals(name, BOWLING_METRICS, seasons)
+        # Legal deliveries exclude wides / no-balls (see cube.legal_ball_mask)
+        overs = profile["legal_balls"] / 6 if profile["legal_balls"] > 0 else 0
+        profile["economy"] = round(profile["runs_conceded"] / overs, 2) if overs > 0 else 0
+        profile["season_wickets"] = (
+            self.player_cube.player_seasons(name, "wickets", seasons)
+            .rename(columns={"wickets": "season_wickets"})
+        )
+        return profile
+
+    # --- phases & partnerships ---
+    def _phase_table(self, name, build, seasons):
+        # Built once over the full history, then cut down to `seasons`
+        table = self._cached(name, None, lambda: build(self.matches, self.deliveries))
+        return self._cached(name, seasons, lambda: phases.for_seasons(table, seasons))
+
+    def innings_phases(self, seasons=None):
+        """Runs, balls, wickets, boundaries and dots per (match, innings, phase)."""
+        return self._phase_table("innings_phases", phases.innings_phases, seasons)
+
+    def partnerships(self, seasons=None):
+        """One row per batting partnership, split at every dismissal."""
+        return self._phase_table("partnerships", phases.partnerships, seasons)
+
+    def batter_phases(self, seasons=None):
+        """Runs, balls, boundaries and dismissals per (season, batter, phase)."""
+        return self._phase_table("batter_phases", phases.batter_phases, seasons)
+
+    def phase_summary(self, seasons=None):
+        """Run rate, runs / wickets per innings, boundary % and dot % per phase."""
+        return self._cached("phase_summary", seasons, lambda: phases.phase_summary(self.innings_phases(seasons)))
+
+    def team_phases(self, seasons=None, side="batting_team"):
+        """Per-team phase rates, batting or (side="bowling_team") conceding."""
+        return self._cached(
+            "team_phases", seasons, lambda: phases.team_phases(self.innings_phases(seasons), side), extra=side
+        )
+
+    def batter_phase_table(self, phase, seasons=None, min_balls=60):
+        """Batters with at least `min_balls` in `phase`, by strike rate."""
+        return self._cached(
+            "batter_phase", seasons,
+            lambda: phases.batter_phase_table(self.batter_phases(seasons), phase, min_balls),
+            extra=(phase, min_balls)
+        )
+
+    def wicket_partnerships(self, seasons=None):
+        """Average and best stand for each wicket."""
+        return self._cached(
+            "wicket_partnerships", seasons, lambda: phases.wicket_partnerships(self.partnerships(seasons))
+        )
+
+    def top_partnerships(self, seasons=None, n=10):
+        """The `n` highest stands over `seasons`."""
+        return phases.top_partnerships(self.partnerships(seasons), n)
+
+    def pair_partnerships(self, seasons=None, min_stands=5):
+        """Partnership record of every pair with at least `min_stands` stands."""
+        return self._cached(
+            "pair_partnerships", seasons,
+            lambda: phases.pair_partnerships(self.partnerships(seasons), min_stands),
+            extra=min_stands
+        )
+
+    # --- similar players ---
+    def player_index(self, role):
+        """Career nearest-neighbour index of batters or bowlers (see similar.PlayerIndex)."""
+        if role not in self._player_indexes:
+            self._player_indexes[role] = similar.build_player_index(self.deliveries, role)
+        return self._player_indexes[role]
+
+    def similar_players(self, name, role, k=5):
+        """The `k` batters / bowlers whose career rate profile is closest to `name`'s."""
+        return self._cached(
+            f"similar_{role}", None, lambda: self.player_index(role).similar(name, k), extra=(name, k)
+        )
+
+    # --- model features ---
+    def innings_features(self, seasons=None):
+        """Cumulative runs, wickets, run rate and balls remaining per (match, innings, over)."""
+        return self._cached(
+            "innings_features", seasons, lambda: features.innings_features(self.deliveries_for(seasons))
+        )
+
+    @property
+    def score_model(self):
+        """First-innings score regressor trained on `innings_features()` (see features.train_score_model)."""
+        if self._score_model is None:
+            self._score_model = features.train_score_model(self.innings_features())
+        return self._score_model
+
+    # --- outcome model ---
+    @property
+    def outcome_model(self):
+        """The latest trained OutcomeModel (see outcome.MODEL_DIR), or None."""
+        if self._outcome_model is None:
+            self._outcome_model = outcome.load_model() or False
+        return self._outcome_model or None
+
+    def predict_outcomes(self, seasons=None, model=None):
+        """
+        Predicted winner and confidence for every match of `seasons`, scored
+        in one batch, with the actual winner alongside. None without a model.
+        """
+        model = model or self.outcome_model
+        if model is None:
+            return None
+
+        def compute():
+            matches_f = self.matches_for(seasons)
+            predictions = model.predict(matches_f)
+            predictions["winner"] = matches_f["winner"].to_numpy()
+            return predictions
+        return self._cached("outcomes", seasons, compute, extra=model.version)
+
+    def season_forecast(self, season, n_sims=100_000, seed=None, as_of=None, workers=1, model=None):
+        """
+        Playoff and title odds per team from `n_sims` simulated replays of
+        `season`'s league fixtures (results before `as_of` kept), with ties
+        broken by run-rate margins drawn from the full history. None
+        without a model.
+        """
+        model = model or self.outcome_model
+        if model is None:
+            return None
+
+        def compute():
+            return simulate.forecast_season(
+                model, simulate.league_fixtures(self.matches_for([season]), season), season, n_sims,
+                seed=seed, workers=workers, as_of=as_of,
+                margins=simulate.run_rate_margins(self.innings_phases()),
+            )
+        # Workers only change how the chunks are scheduled, not the result
+        return self._cached("forecast", [season], compute, extra=(model.version, n_sims, seed, as_of))
+
+    # --- auction ---
+    @property
+    def auction(self):
+        """(auction rows, player map) or None when the auction CSV is absent."""
+        if self._auction is None:
+            self._auction = players.load_auction_mapped(
+                self.player_cube.players, lambda: players.appearances(self.matches, self.deliveries),
+                version=self.version
+            ) or False
+        return self._auction or None
+
+    def auction_value(self, seasons=None):
+        """Auction price per run and per wicket in the season of purchase (None without auction data)."""
+        if self.auction is None:
+            return None
+        auction, mapping = self.auction
+        return self._cached(
+            "auction_value", seasons,
+            lambda: players.auction_value(
+                auction, mapping, self.player_cube.season_totals(["runs", "wickets"], seasons), seasons
+            )
+        )
@@ -0,0 +1,135 @@
+import numpy as np
+import pandas as pd
+
+from .cube import legal_ball_mask
+
+# --- INNINGS STATE FEATURES ---
+# One row per (match, innings, over) with the score state at the end of
+# that over. Batch and streaming paths share `over_totals` + `accumulate`,
+# so training features and live features are computed identically.
+INNINGS = ["match_id", "inning"]
+KEYS = INNINGS + ["over"]
+INNINGS_BALLS = 120
+FEATURE_COLUMNS = ["cum_runs", "cum_wkts", "run_rate", "balls_remaining", "over"]
+# The notebook projects the first-innings total from the first overs only
+SCORE_OVERS = 6
+
+
+def over_totals(deliveries):
+    """
+    Runs, wickets (any dismissal, as in the notebook) and legal balls per
+    (match, innings, over), with the batting / bowling team codes.
+    """
+    balls = pd.DataFrame({
+        "match_id": deliveries["match_id"].to_numpy(),
+        "inning": deliveries["inning"].to_numpy(),
+        "over": deliveries["over"].to_numpy(),
+        "runs": deliveries["total_runs"].to_numpy(dtype=np.int32),
+        "wickets": deliveries["player_dismissed"].notna().to_numpy(dtype=np.int32),
+        "legal_balls": legal_ball_mask(deliveries).astype(np.int32),
+        "batting_team": deliveries["batting_team"].cat.codes.to_numpy(),
+        "bowling_team": deliveries["bowling_team"].cat.codes.to_numpy(),
+    })
+    totals = balls.groupby(KEYS, sort=True).agg(
+        runs=("runs", "sum"),
+        wickets=("wickets", "sum"),
+        legal_balls=("legal_balls", "sum"),
+        batting_team=("batting_team", "first"),
+        bowling_team=("bowling_team", "first"),
+    ).reset_index()
+    for col in ["batting_team", "bowling_team"]:
+        totals[col] = pd.Categorical.from_codes(totals[col], dtype=deliveries[col].dtype)
+    return totals
+
+
+def accumulate(totals, start=None):
+    """
+    Adds the cumulative innings state to `over_totals` rows. `start` holds
+    the state already reached per innings (cum_runs, cum_wkts, cum_balls,
+    indexed by match_id / inning) when continuing an innings.
+    """
+    out = totals.copy()
+    cum = out.groupby(INNINGS, sort=False)[["runs", "wickets", "legal_balls"]].cumsum()
+    out["cum_runs"] = cum["runs"].to_numpy()
+    out["cum_wkts"] = cum["wickets"].to_numpy()
+    out["cum_balls"] = cum["legal_balls"].to_numpy()
+
+    if start is not None and len(start):
+        keys = pd.MultiIndex.from_frame(out[INNINGS])
+        offset = start.reindex(keys).fillna(0)
+        for col in ["cum_runs", "cum_wkts", "cum_balls"]:
+            out[col] += offset[col].to_numpy(dtype=out[col].dtype)
+
+    balls = out["cum_balls"].to_numpy()
+    out["run_rate"] = np.divide(
+        out["cum_runs"].to_numpy() * 6.0, balls, out=np.zeros(len(out)), where=balls > 0
+    ).round(4)
+    out["balls_remaining"] = np.clip(INNINGS_BALLS - balls, 0, None)
+    return out
+
+
+def innings_features(deliveries):
+    """Cumulative innings state at the end of every over of `deliveries` (batch mode)."""
+    return accumulate(over_totals(deliveries))
+
+
+def final_scores(features):
+    """Final total of every innings in a feature frame."""
+    return features.groupby(INNINGS, sort=False)["cum_runs"].max().rename("final_score").reset_index()
+
+
+def score_training_frame(features, max_over=SCORE_OVERS):
+    """
+    (X, y) for the first-innings score model: state after each of the
+    first `max_over` overs (0-based, as in the notebook) and the final total.
+    """
+    first = features[features["inning"] == 1]
+    data = first.merge(final_scores(first), on=INNINGS)
+    data = data[data["over"] <= max_over]
+    return data[FEATURE_COLUMNS], data["final_score"]
+
+
+def train_score_model(features, max_over=SCORE_OVERS, n_estimators=100, random_state=42):
+    """
+    The notebook's first-innings score regressor fitted on
+    `score_training_frame`; it predicts the final total from a feature row
+    of either mode (batch or `InningsFeatureStream`).
+    """
+    from sklearn.ensemble import RandomForestRegressor
+
+    X, y = score_training_frame(features, max_over)
+    if X.empty:
+        raise ValueError("No first innings to train the score model on")
+    model = RandomForestRegressor(n_estimators=n_estimators, random_state=random_state, n_jobs=-1)
+    model.fit(X.to_numpy(dtype=np.float64), y.to_numpy())
+    # Live projection scores one row per over: thread start-up would dominate
+    model.set_params(n_jobs=None)
+    return model
+
+
+class InningsFeatureStream:
+    """
+    Streaming mode of `innings_features`: feed each over's balls (for any
+    number of live matches) to `update` and get that over's feature rows,
+    equal to the rows the batch path produces for the same over.
+    """
+
+    def __init__(self):
+        self.state = pd.DataFrame(
+            columns=["cum_runs", "cum_wkts", "cum_balls"],
+            index=pd.MultiIndex.from_arrays([[], []], names=INNINGS),
+            dtype=np.int64,
+        )
+
+    def update(self, over_deliveries):
+        features = accumulate(over_totals(over_deliveries), self.state)
+        last = features.groupby(INNINGS, sort=False)[["cum_runs", "cum_wkts", "cum_balls"]].last()
+        self.state = pd.concat([self.state.drop(last.index, errors="ignore"), last])
+        return features
+
+    def reset(self, match_id=None):
+        """Forgets the state of one finished match (or of every match)."""
+        if match_id is None:
+            self.state = self.state.iloc[0:0]
+        else:
+            self.state = self.state.drop(match_id, level="match_id", errors="ignore")
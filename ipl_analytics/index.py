@@ -0,0 +1,142 @@
+import numpy as np
+import pandas as pd
+
+from .cube import delivery_seasons
+
+
+def _runs(keys):
+    """(values, starts, ends) of the runs of equal consecutive keys."""
+    if len(keys) == 0:
+        empty = np.array([], dtype=np.int64)
+        return keys[:0], empty, empty
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    ends = np.r_[starts[1:], len(keys)]
+    return keys[starts], starts, ends
+
+
+def _merge_ranges(ranges):
+    """Sorts (start, end) row ranges and merges adjacent ones."""
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and merged[-1][1] == start:
+            merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+class DeliveryIndex:
+    """
+    Deliveries sorted by (season, match_id) with offset tables mapping each
+    match and each season to its contiguous row range. Lookups are binary
+    searches plus positional slices, so fetching a match or a run of
+    consecutive seasons does not scan or copy the table.
+    """
+
+    def __init__(self, deliveries, match_ids, match_starts, match_ends, seasons, season_starts, season_ends):
+        self.deliveries = deliveries
+        self.match_ids = match_ids
+        self.match_starts = match_starts
+        self.match_ends = match_ends
+        self.seasons = seasons
+        self.season_starts = season_starts
+        self.season_ends = season_ends
+
+    def __len__(self):
+        return len(self.deliveries)
+
+    def match_range(self, match_id):
+        """(start, end) rows of one match, or None if it has no deliveries."""
+        pos = np.searchsorted(self.match_ids, match_id)
+        if pos < len(self.match_ids) and self.match_ids[pos] == match_id:
+            return int(self.match_starts[pos]), int(self.match_ends[pos])
+        return None
+
+    def season_range(self, season):
+        """(start, end) rows of one season, or None if it has no deliveries."""
+        pos = np.searchsorted(self.seasons, season)
+        if pos < len(self.seasons) and self.seasons[pos] == season:
+            return int(self.season_starts[pos]), int(self.season_ends[pos])
+        return None
+
+    def _slice(self, ranges):
+        ranges = _merge_ranges([r for r in ranges if r is not None])
+        if not ranges:
+            return self.deliveries.iloc[0:0]
+        if len(ranges) == 1:
+            start, end = ranges[0]
+            return self.deliveries.iloc[start:end]
+        return pd.concat([self.deliveries.iloc[start:end] for start, end in ranges])
+
+    def match(self, match_id):
+        """Balls of one match, in delivery order."""
+        return self._slice([self.match_range(match_id)])
+
+    def season(self, season):
+        """Balls of one season."""
+        return self._slice([self.season_range(season)])
+
+    def for_seasons(self, seasons):
+        """
+        Balls of several seasons. Consecutive seasons collapse into a single
+        slice (a view); only gaps in the selection require a concat.
+        """
+        if seasons is None or len(seasons) == 0:
+            return self.deliveries
+        return self._slice([self.season_range(s) for s in seasons])
+
+    def for_matches(self, match_ids):
+        """Balls of an arbitrary set of matches."""
+        return self._slice([self.match_range(m) for m in match_ids])
+
+
+def build_delivery_index(matches, deliveries):
+    """
+    Sorts deliveries by (season, match_id), keeping ball order within each
+    match, and builds the offset tables. Deliveries whose match has no
+    season sort first and belong to no season range.
+    """
+    season = delivery_seasons(matches, deliveries)
+    match_id = deliveries["match_id"].to_numpy()
+    order = np.lexsort((match_id, season))
+
+    # Sources are usually in this order already: keep their (mapped) columns
+    if (order == np.arange(len(order))).all():
+        ordered = deliveries.reset_index(drop=True)
+    else:
+        ordered = deliveries.take(order).reset_index(drop=True)
+    season = season[order]
+    match_id = match_id[order]
+
+    ids, m_starts, m_ends = _runs(match_id)
+    by_id = np.argsort(ids, kind="stable")
+    s_values, s_starts, s_ends = _runs(season)
+    known = s_values >= 0
+
+    return DeliveryIndex(
+        ordered,
+        ids[by_id], m_starts[by_id], m_ends[by_id],
+        s_values[known], s_starts[known], s_ends[known],
+    )
+
+
+def season_slice(frame, seasons, column="season"):
+    """
+    Rows of `frame` (sorted by `column`) in `seasons`, as positional slices:
+    a single view when the selected seasons are adjacent in the frame, a
+    concat of one slice per run of adjacent seasons otherwise.
+    """
+    if seasons is None or len(seasons) == 0:
+        return frame
+    values = frame[column].to_numpy()
+    wanted = np.asarray(sorted(set(seasons)), dtype=values.dtype)
+    starts = np.searchsorted(values, wanted, side="left")
+    ends = np.searchsorted(values, wanted, side="right")
+    ranges = _merge_ranges([(int(a), int(b)) for a, b in zip(starts, ends) if b > a])
+    if not ranges:
+        return frame.iloc[0:0]
+    if len(ranges) == 1:
+        start, end = ranges[0]
+        return frame.iloc[start:end]
+    return pd.concat([frame.iloc[start:end] for start, end in ranges])
+
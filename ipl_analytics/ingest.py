@@ -0,0 +1,188 @@
+import hashlib
+import json
+import os
+import tempfile
+
+import pandas as pd
+
+from . import cache, loader
+from .cube import build_player_cube
+from .encoding import encode_shared
+
+# --- APPEND-ONLY STORE ---
+# Ingested batches are primary data (unlike the parse cache), so they live
+# next to the source CSVs rather than in IPL_CACHE_DIR.
+INGEST_DIR = os.environ.get("IPL_INGEST_DIR", os.path.join(loader.DATA_DIR, "ingested"))
+MANIFEST = "manifest.json"
+
+
+def coerce_to_schema(df, schema, name):
+    """
+    Casts a batch of new rows to the declared schema. Raises ValueError
+    naming the offending column when a required column is missing or a
+    value cannot be represented in its declared dtype.
+    """
+    missing = [col for col in schema if col not in df.columns]
+    if missing:
+        raise ValueError(f"New {name} rows are missing columns: {', '.join(missing)}")
+
+    out = pd.DataFrame(index=range(len(df)))
+    for col, dtype in schema.items():
+        values = df[col].reset_index(drop=True)
+        if dtype.startswith(("int", "float")):
+            numeric = pd.to_numeric(values, errors="coerce")
+            bad = numeric.isna() & values.notna()
+            if bad.any():
+                raise ValueError(
+                    f"New {name} rows have non-numeric '{col}' values: {values[bad].head(3).tolist()}"
+                )
+            if dtype.startswith("int") and numeric.isna().any():
+                raise ValueError(f"New {name} rows have blank '{col}' values")
+            out[col] = numeric.astype(dtype)
+        elif dtype == "category":
+            out[col] = values.astype("string").astype("category")
+        else:
+            out[col] = values.astype("string")
+    return out
+
+
+def prepare_matches(new_matches):
+    matches = coerce_to_schema(new_matches, loader.MATCHES_SCHEMA, "matches")
+    for col in loader.DATE_COLUMNS:
+        matches[col] = pd.to_datetime(matches[col], errors="coerce")
+    matches["season"] = loader.parse_season(matches)
+    return matches
+
+
+def validate_batch(matches, new_matches, new_deliveries):
+    """
+    Checks that a prepared batch can be appended: match ids are new and
+    unique, and every delivery belongs to a known or newly added match.
+    """
+    new_ids = new_matches["id"]
+    if new_ids.duplicated().any():
+        raise ValueError(f"Duplicate match ids in batch: {new_ids[new_ids.duplicated()].unique()[:5].tolist()}")
+
+    existing = new_ids.isin(matches["id"])
+    if existing.any():
+        raise ValueError(
+            f"Matches already ingested (append-only): {new_ids[existing].unique()[:5].tolist()}"
+        )
+
+    known = pd.concat([matches["id"], new_ids], ignore_index=True)
+    orphan = ~new_deliveries["match_id"].isin(known)
+    if orphan.any():
+        raise ValueError(
+            f"Deliveries reference unknown match ids: {new_deliveries.loc[orphan, 'match_id'].unique()[:5].tolist()}"
+        )
+
+
+class IngestStore:
+    """
+    Append-only sequence of (matches, deliveries) segments stored as Arrow
+    IPC files, listed in a manifest that is replaced atomically on append.
+    """
+
+    def __init__(self, directory=None):
+        self.directory = directory or INGEST_DIR
+
+    def _manifest_path(self):
+        return os.path.join(self.directory, MANIFEST)
+
+    def segments(self):
+        path = self._manifest_path()
+        if not os.path.exists(path):
+            return []
+        with open(path, encoding="utf-8") as fh:
+            return json.load(fh)["segments"]
+
+    def fingerprint(self, key=None):
+        """
+        Identifies the current segments and their contents ('' when nothing
+        was ingested): each segment file of both tables is fingerprinted
+        like a source file (see cache.source_fingerprint and CACHE_KEY).
+        """
+        parts = [
+            cache.source_fingerprint(os.path.join(self.directory, segment[table]), key)
+            for segment in self.segments()
+            for table in ("matches", "deliveries")
+        ]
+        return hashlib.sha256("|".join(parts).encode()).hexdigest()[:16] if parts else ""
+
+    def load_segments(self, table):
+        """Frames of one table ("matches" or "deliveries") for every segment, in order."""
+        return [
+            cache.read_table(os.path.join(self.directory, segment[table]))
+            for segment in self.segments()
+        ]
+
+    def _write_manifest(self, segments):
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            json.dump({"segments": segments}, fh, indent=2)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, self._manifest_path())
+
+    def append(self, new_matches, new_deliveries):
+        """Writes one validated batch as a new segment; returns its manifest entry."""
+        os.makedirs(self.directory, exist_ok=True)
+        segments = self.segments()
+        seq = (segments[-1]["seq"] + 1) if segments else 1
+        entry = {
+            "seq": seq,
+            "matches": f"matches-{seq:05d}.arrow",
+            "deliveries": f"deliveries-{seq:05d}.arrow",
+            "match_rows": len(new_matches),
+            "delivery_rows": len(new_deliveries),
+        }
+        cache.write_table_atomic(new_matches, os.path.join(self.directory, entry["matches"]))
+        cache.write_table_atomic(new_deliveries, os.path.join(self.directory, entry["deliveries"]))
+        self._write_manifest(segments + [entry])
+        return entry
+
+
+def ingest_batch(new_matches, new_deliveries, store=None, match_path=None, deliv_path=None):
+    """
+    Appends new matches and deliveries without reparsing or re-aggregating
+    history: the batch is validated against the current data, written as a
+    segment, and its own cube is merged into the player cube cached for
+    the previous version (see cache.cached_cube), which is saved for the
+    new one. Returns the new dataset version.
+    """
+    store = store or IngestStore()
+    old_version = cache.dataset_version(match_path, deliv_path, ingest_dir=store.directory)
+    match_path, _ = cache.resolve_paths(match_path, deliv_path)
+    matches = loader.concat_frames(
+        [cache.cached_table("matches", match_path, loader.load_matches)] + store.load_segments("matches")
+    )
+
+    batch_matches = prepare_matches(new_matches)
+    batch_deliveries = coerce_to_schema(new_deliveries, loader.DELIVERIES_SCHEMA, "deliveries")
+    validate_batch(matches, batch_matches, batch_deliveries)
+
+    base_cube = cache.load_cube(old_version)
+    if base_cube is None:
+        # First ingest after a source change: aggregate history once
+        all_matches, all_deliveries = cache.load_cached_data(match_path, deliv_path, ingest_dir=store.directory)
+        base_cube = build_player_cube(all_matches, all_deliveries)
+
+    store.append(batch_matches, batch_deliveries)
+    new_version = cache.dataset_version(match_path, deliv_path, ingest_dir=store.directory)
+
+    # Seasons of new deliveries may come from matches ingested earlier
+    lookup = loader.concat_frames([matches[["id", "season"]], batch_matches[["id", "season"]]])
+    _, batch_deliveries_enc, _ = encode_shared(batch_matches, batch_deliveries)
+    batch_cube = build_player_cube(lookup, batch_deliveries_enc)
+    try:
+        cache.save_cube(base_cube.merge(batch_cube), new_version)
+    except OSError:
+        # The next load builds the cube from the frames instead
+        pass
+    return new_version
+
+
+def ingest_csv(match_file, deliv_file, store=None):
+    """Reads a batch of new rows from CSV files (either export layout) and ingests it."""
+    new_matches = loader.read_csv_typed(match_file, loader.MATCHES_SCHEMA)
+    new_deliveries = loader.read_csv_typed(deliv_file, loader.DELIVERIES_SCHEMA)
+    return ingest_batch(new_matches, new_deliveries, store)
@@ -0,0 +1,363 @@
+import asyncio
+import csv
+import io
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+
+import numpy as np
+import pandas as pd
+
+from . import features, loader
+from .cube import ILLEGAL_EXTRAS, NON_BOWLER_DISMISSALS
+
+# --- LIVE FEED ---
+# An append-only deliveries file (CSV with the deliveries header, or JSON
+# lines) or tcp://host:port, where feed clients connect and send the same
+# lines. Empty disables the dashboard's Live section.
+LIVE_FEED = os.environ.get("IPL_LIVE_FEED", "")
+# Refreshed KPIs are pushed at most this often (seconds), so a ball reaches
+# subscribers within one interval plus its own update time.
+PUSH_INTERVAL = float(os.environ.get("IPL_LIVE_PUSH_INTERVAL", "0.5"))
+POLL_INTERVAL = 0.05
+LATENCY_WINDOW = 10_000
+
+FEED_COLUMNS = list(loader.DELIVERIES_SCHEMA)
+INT_COLUMNS = [col for col, dtype in loader.DELIVERIES_SCHEMA.items() if dtype.startswith("int")]
+MISSING = {"", "NA", "NaN", "nan", "None"}
+
+
+def parse_ball(line, header=None):
+    """One feed line (JSON object or CSV row in `header` order) as a ball dict."""
+    line = line.strip()
+    if line.startswith("{"):
+        raw = json.loads(line)
+    else:
+        raw = dict(zip(header or FEED_COLUMNS, next(csv.reader([line]))))
+    ball = {col: (None if raw.get(col) is None or str(raw.get(col)) in MISSING else raw[col]) for col in FEED_COLUMNS}
+    for col in INT_COLUMNS:
+        ball[col] = int(float(ball[col])) if ball[col] is not None else 0
+    return ball
+
+
+def format_ball(ball):
+    """A ball dict (or deliveries row) as a CSV feed line."""
+    out = []
+    for col in FEED_COLUMNS:
+        value = ball.get(col)
+        out.append("" if value is None or value != value else str(value))
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\n").writerow(out)
+    return buffer.getvalue()
+
+
+class LatencyMeter:
+    """Rolling window of latencies (seconds) with percentile summaries in ms."""
+
+    def __init__(self, window=LATENCY_WINDOW):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+
+    def record(self, seconds):
+        self.samples.append(seconds)
+        self.count += 1
+
+    def stats(self):
+        if not self.samples:
+            return {"count": 0, "p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+        values = np.asarray(self.samples) * 1000
+        p50, p95, p99 = np.percentile(values, [50, 95, 99])
+        return {
+            "count": self.count,
+            "p50_ms": round(float(p50), 3),
+            "p95_ms": round(float(p95), 3),
+            "p99_ms": round(float(p99), 3),
+            "max_ms": round(float(values.max()), 3),
+        }
+
+
+class LiveAggregates:
+    """
+    Running team, innings, batter and bowler totals of the live balls only.
+    Each ball is an O(1) update (same definitions as the PlayerCube), so
+    nothing already aggregated, live or historical, is ever recomputed.
+    """
+
+    def __init__(self):
+        self.balls = 0
+        self.innings = {}
+        self.batters = defaultdict(lambda: {"runs": 0, "balls": 0, "fours": 0, "sixes": 0})
+        self.bowlers = defaultdict(lambda: {"legal_balls": 0, "runs_conceded": 0, "wickets": 0})
+        self.last_ball = None
+
+    def update(self, ball):
+        legal = ball["extras_type"] not in ILLEGAL_EXTRAS
+        key = (ball["match_id"], ball["inning"])
+        state = self.innings.get(key)
+        if state is None:
+            state = self.innings[key] = {
+                "match_id": ball["match_id"], "inning": ball["inning"],
+                "batting_team": ball["batting_team"], "bowling_team": ball["bowling_team"],
+                "runs": 0, "wickets": 0, "legal_balls": 0,
+            }
+        state["runs"] += ball["total_runs"]
+        state["wickets"] += ball["player_dismissed"] is not None
+        state["legal_balls"] += legal
+
+        if ball["batter"] is not None:
+            batter = self.batters[ball["batter"]]
+            batter["runs"] += ball["batsman_runs"]
+            batter["balls"] += 1
+            batter["fours"] += ball["batsman_runs"] == 4
+            batter["sixes"] += ball["batsman_runs"] == 6
+        if ball["bowler"] is not None:
+            bowler = self.bowlers[ball["bowler"]]
+            bowler["legal_balls"] += legal
+            bowler["runs_conceded"] += ball["total_runs"]
+            bowler["wickets"] += ball["is_wicket"] == 1 and ball["dismissal_kind"] not in NON_BOWLER_DISMISSALS
+
+        self.balls += 1
+        self.last_ball = ball
+
+    def snapshot(self, n=5, projected=None):
+        """
+        Plain-dict KPIs: innings scores (with the projected total from
+        `projected` when it has one), top `n` batters and bowlers, last ball.
+        """
+        projected = projected or {}
+        innings = []
+        for key, state in self.innings.items():
+            balls = state["legal_balls"]
+            innings.append(dict(
+                state,
+                overs=f"{balls // 6}.{balls % 6}",
+                run_rate=round(state["runs"] * 6 / balls, 2) if balls else 0.0,
+                projected=projected.get(key),
+            ))
+        batters = sorted(self.batters.items(), key=lambda item: (-item[1]["runs"], item[0]))[:n]
+        bowlers = sorted(
+            self.bowlers.items(), key=lambda item: (-item[1]["wickets"], item[1]["runs_conceded"], item[0])
+        )[:n]
+        return {
+            "balls": self.balls,
+            "innings": innings,
+            "batters": [dict(stats, batter=name) for name, stats in batters],
+            "bowlers": [dict(stats, bowler=name) for name, stats in bowlers],
+            "last_ball": dict(self.last_ball) if self.last_ball else None,
+        }
+
+
+class InningsProjection:
+    """
+    Projected first-innings totals from a score model (see
+    features.train_score_model). Each completed over of the first
+    `max_over` overs goes through an InningsFeatureStream, so the model
+    scores the same feature rows it was trained on.
+    """
+
+    def __init__(self, model, max_over=features.SCORE_OVERS):
+        self.model = model
+        self.max_over = max_over
+        self.stream = features.InningsFeatureStream()
+        self.projected = {}
+        self._overs = {}
+
+    def update(self, ball):
+        key = (ball["match_id"], ball["inning"])
+        current = self._overs.get(key)
+        if current is not None and current[0] != ball["over"]:
+            self._finish_over(self._overs.pop(key)[1])
+        if ball["inning"] == 1 and ball["over"] <= self.max_over:
+            self._overs.setdefault(key, (ball["over"], []))[1].append(ball)
+
+    def _finish_over(self, balls):
+        frame = pd.DataFrame(balls, columns=FEED_COLUMNS)
+        for col in ["batting_team", "bowling_team"]:
+            frame[col] = frame[col].astype("category")
+        rows = self.stream.update(frame)
+        projected = self.model.predict(rows[features.FEATURE_COLUMNS].to_numpy(dtype=np.float64))
+        for (match_id, inning), total in zip(zip(rows["match_id"], rows["inning"]), projected):
+            self.projected[(int(match_id), int(inning))] = int(round(total))
+
+
+# --- SOURCES ---
+async def tail_file(path, from_start=True, poll_interval=POLL_INTERVAL, stop=None):
+    """Lines appended to `path` (waiting for it to exist), as (line, arrival time)."""
+    while not os.path.exists(path):
+        if stop is not None and stop.is_set():
+            return
+        await asyncio.sleep(poll_interval)
+    with open(path, "r", encoding="utf-8") as fh:
+        if not from_start:
+            fh.seek(0, os.SEEK_END)
+        partial = ""
+        while stop is None or not stop.is_set():
+            chunk = fh.readline()
+            if not chunk:
+                await asyncio.sleep(poll_interval)
+                continue
+            partial += chunk
+            if partial.endswith("\n"):
+                yield partial, time.perf_counter()
+                partial = ""
+
+
+async def socket_lines(host, port, stop=None):
+    """Lines sent by any client connected to a local TCP server, as (line, arrival time)."""
+    queue = asyncio.Queue()
+
+    async def handle(reader, writer):
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            await queue.put((line.decode("utf-8"), time.perf_counter()))
+        writer.close()
+
+    server = await asyncio.start_server(handle, host, port)
+    async with server:
+        while stop is None or not stop.is_set():
+            try:
+                yield await asyncio.wait_for(queue.get(), POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                continue
+
+
+def open_source(spec, stop=None, from_start=True):
+    """Async line source for a feed spec: a file path or tcp://host:port."""
+    if spec.startswith("tcp://"):
+        host, port = spec[len("tcp://"):].rsplit(":", 1)
+        return socket_lines(host, int(port), stop)
+    return tail_file(spec, from_start=from_start, stop=stop)
+
+
+# --- FOLLOWER ---
+class LiveFeed:
+    """
+    Follows one feed: every ball updates the LiveAggregates as it arrives,
+    and a pusher publishes a fresh snapshot (and calls `on_push`) at most
+    every `push_interval` seconds while there is anything new.
+
+    `update_latency` is parse + update time per ball; `push_latency` is
+    the time from a ball's arrival until a snapshot including it is out.
+    With a `score_model`, first innings also carry a projected total.
+    """
+
+    def __init__(self, spec, push_interval=None, on_push=None, from_start=True, score_model=None):
+        self.spec = spec
+        self.push_interval = PUSH_INTERVAL if push_interval is None else push_interval
+        self.on_push = on_push
+        self.from_start = from_start
+        self.aggregates = LiveAggregates()
+        self.projection = InningsProjection(score_model) if score_model is not None else None
+        self.update_latency = LatencyMeter()
+        self.push_latency = LatencyMeter()
+        self.snapshot = self.aggregates.snapshot()
+        self.error = None
+        self._pending = []
+        self._last_push = time.perf_counter()
+        self._thread = None
+
+    def _push(self):
+        self._last_push = time.perf_counter()
+        if not self._pending:
+            return
+        self.snapshot = self.aggregates.snapshot(projected=self.projection and self.projection.projected)
+        if self.on_push is not None:
+            self.on_push(self.snapshot)
+        now = time.perf_counter()
+        for arrived in self._pending:
+            self.push_latency.record(now - arrived)
+        self._pending = []
+
+    async def _pusher(self, stop):
+        # Pushes balls that arrived just before the feed went quiet
+        while not stop.is_set():
+            wait = self._last_push + self.push_interval - time.perf_counter()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            else:
+                self._push()
+
+    async def run(self, stop=None, max_balls=None):
+        """Follows the feed until `stop` is set or `max_balls` balls were applied."""
+        stop = stop or asyncio.Event()
+        pusher = asyncio.ensure_future(self._pusher(stop))
+        header = None
+        try:
+            async for line, arrived in open_source(self.spec, stop, self.from_start):
+                if not line.strip():
+                    continue
+                if line.startswith("match_id"):
+                    header = next(csv.reader([line.strip()]))
+                    continue
+                start = time.perf_counter()
+                ball = parse_ball(line, header)
+                self.aggregates.update(ball)
+                if self.projection is not None:
+                    self.projection.update(ball)
+                self.update_latency.record(time.perf_counter() - start)
+                self._pending.append(arrived)
+                # Inline too: a busy feed never yields to the pusher task
+                if start - self._last_push >= self.push_interval:
+                    self._push()
+                if max_balls is not None and self.aggregates.balls >= max_balls:
+                    break
+        finally:
+            stop.set()
+            await pusher
+            self._push()
+
+    def latency_report(self):
+        return {"update": self.update_latency.stats(), "push": self.push_latency.stats()}
+
+    def start_in_thread(self):
+        """Runs the follower on its own event loop in a daemon thread (for the dashboard)."""
+        def target():
+            try:
+                asyncio.run(self.run())
+            except Exception as exc:  # surfaced by the dashboard
+                self.error = exc
+
+        self._thread = threading.Thread(target=target, name=f"live-feed {self.spec}", daemon=True)
+        self._thread.start()
+        return self
+
+
+# --- REPLAY ---
+async def replay(deliveries, target, rate=6.0):
+    """
+    Writes `deliveries` rows to a feed file (header first) or tcp://host:port
+    at `rate` balls per second (0 = as fast as possible). For demos and
+    latency measurements.
+    """
+    lines = [format_ball(row) for row in deliveries[FEED_COLUMNS].to_dict("records")]
+    delay = 1 / rate if rate else 0
+    if target.startswith("tcp://"):
+        host, port = target[len("tcp://"):].rsplit(":", 1)
+        _, writer = await asyncio.open_connection(host, int(port))
+        write = writer.write
+    else:
+        fh = open(target, "a", encoding="utf-8")
+        if fh.tell() == 0:
+            fh.write(",".join(FEED_COLUMNS) + "\n")
+        writer = None
+
+        def write(data):
+            fh.write(data.decode("utf-8"))
+            fh.flush()
+    try:
+        for line in lines:
+            write(line.encode("utf-8"))
+            if writer is not None:
+                await writer.drain()
+            await asyncio.sleep(delay)
+    finally:
+        if writer is not None:
+            writer.close()
+            await writer.wait_closed()
+        else:
+            fh.close()
+    return len(lines)
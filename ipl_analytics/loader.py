@@ -0,0 +1,257 @@
+import io
+import os
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from .encoding import encode_shared
+
+# --- DATA LOCATION ---
+# The bundled CSVs live next to app.py; IPL_DATA_DIR points at a full export instead.
+DATA_DIR = os.environ.get(
+    "IPL_DATA_DIR",
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+MATCHES_FILE = "matches (2).csv"
+DELIVERIES_FILE = "deliveries (1)_compressed.csv"
+
+CHUNK_ROWS = 200_000
+
+# Engine the dashboard serves from: "pandas" keeps both tables in memory;
+# "sqlite" queries an on-disk store (see sqlstore) so memory per process
+# stays flat as history grows.
+BACKENDS = ("pandas", "sqlite")
+BACKEND = os.environ.get("IPL_BACKEND", "pandas")
+
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+# --- SCHEMAS ---
+# Declared once so every chunk is parsed straight into its final dtype.
+MATCHES_SCHEMA = {
+    "id": "int64",
+    "season": "string",
+    "city": "category",
+    "date": "string",
+    "match_type": "category",
+    "player_of_match": "category",
+    "venue": "category",
+    "team1": "category",
+    "team2": "category",
+    "toss_winner": "category",
+    "toss_decision": "category",
+    "winner": "category",
+    "result": "category",
+    "result_margin": "float32",
+    "target_runs": "float32",
+    "target_overs": "float32",
+    "super_over": "category",
+    "method": "category",
+    "umpire1": "category",
+    "umpire2": "category",
+}
+
+DELIVERIES_SCHEMA = {
+    "match_id": "int64",
+    "inning": "int8",
+    "batting_team": "category",
+    "bowling_team": "category",
+    "over": "int8",
+    "ball": "int8",
+    "batter": "category",
+    "bowler": "category",
+    "non_striker": "category",
+    "batsman_runs": "int8",
+    "extra_runs": "int8",
+    "total_runs": "int8",
+    "extras_type": "category",
+    "is_wicket": "int8",
+    "player_dismissed": "category",
+    "dismissal_kind": "category",
+    "fielder": "category",
+}
+
+DATE_COLUMNS = ["date"]
+
+
+def _open_binary(file_path):
+    """
+    Opens a data file for binary streaming, transparently decompressing
+    zstd input. The bundled deliveries export repeats the frame magic
+    number, so a doubled magic is skipped before decoding.
+    """
+    fh = open(file_path, "rb")
+    head = fh.read(8)
+    if not head.startswith(ZSTD_MAGIC):
+        fh.seek(0)
+        return fh
+
+    try:
+        import zstandard
+    except ImportError:
+        fh.close()
+        raise ValueError(
+            f"{file_path} is zstd-compressed; install the 'zstandard' package to read it."
+        )
+
+    fh.seek(4 if head[4:] == ZSTD_MAGIC else 0)
+    return zstandard.ZstdDecompressor().stream_reader(fh, closefd=True)
+
+
+def _is_wrapped(first_line):
+    """True when the whole row is one quoted field (the single-column export)."""
+    line = first_line.strip()
+    return len(line) > 1 and line[0] == '"' and line[-1] == '"' and '","' not in line
+
+
+def _unwrap_block(block):
+    """
+    Strips the outer quote at the start and end of every line in a block of
+    whole lines and un-doubles the inner quotes, using bulk string replaces
+    instead of a per-line Python loop.
+    """
+    block = block.replace("\r\n", "\n")
+    if not block.endswith("\n"):
+        block += "\n"
+    block = ("\n" + block).replace('\n"', "\n").replace('"\n', "\n")[1:]
+    return block.replace('""', '"')
+
+
+class _RowStream(io.TextIOBase):
+    """
+    Text stream that replays the already-consumed header line. With
+    `unwrap`, it also removes the outer quotes wrapping each row and
+    un-doubles the inner quotes, so the result is ordinary CSV and quoted
+    fields like "Punjab Cricket Association Stadium, Mohali" survive intact.
+    """
+
+    def __init__(self, text_stream, first_line, unwrap):
+        self._stream = text_stream
+        self._pending = [first_line]
+        self._unwrap = unwrap
+        self._buffer = ""
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        while size < 0 or len(self._buffer) < size:
+            lines = self._pending or self._stream.readlines(1 << 16)
+            self._pending = []
+            if not lines:
+                break
+            block = "".join(lines)
+            self._buffer += _unwrap_block(block) if self._unwrap else block
+
+        if size < 0:
+            size = len(self._buffer)
+        out, self._buffer = self._buffer[:size], self._buffer[size:]
+        return out
+
+
+def _concat_column(parts, col):
+    """One column's parts as one Series, unifying categoricals so they stay categorical."""
+    if isinstance(parts[0].dtype, pd.CategoricalDtype):
+        if len({str(part.cat.categories.dtype) for part in parts}) > 1:
+            # e.g. appended batches typed as "string"; align on plain object categories
+            parts = [part.cat.set_categories(part.cat.categories.astype(object)) for part in parts]
+        return pd.Series(union_categoricals(parts), name=col)
+    return pd.concat(parts, ignore_index=True)
+
+
+def concat_frames(chunks):
+    """Concatenates parsed chunks, unifying categoricals so they stay categorical."""
+    if not chunks:
+        return pd.DataFrame()
+    if len(chunks) == 1:
+        return chunks[0]
+    return pd.DataFrame({col: _concat_column([chunk[col] for chunk in chunks], col) for col in chunks[0].columns})
+
+
+def iter_csv_typed(file_path, schema, chunksize=CHUNK_ROWS):
+    """
+    Streams a CSV once, yielding chunks of at most `chunksize` rows with
+    every column parsed directly into the dtype declared in `schema`.
+    Handles both ordinary CSV and the export where the entire row is
+    wrapped in quotes. Columns missing from the schema are read as
+    strings; schema columns missing from the file are ignored.
+    """
+    with _open_binary(file_path) as raw:
+        text = io.TextIOWrapper(raw, encoding="utf-8-sig", newline="")
+        first_line = text.readline()
+        wrapped = _is_wrapped(first_line)
+        source = _RowStream(text, first_line, unwrap=wrapped)
+
+        header = _unwrap_block(first_line) if wrapped else first_line
+        columns = list(pd.read_csv(io.StringIO(header), nrows=0).columns)
+        dtypes = {col: schema[col] for col in columns if col in schema and schema[col] != "string"}
+        int_cols = {col: dt for col, dt in dtypes.items() if dt.startswith("int")}
+        # Integer columns are parsed as float so a stray blank does not abort the load
+        read_dtypes = {col: ("float64" if col in int_cols else dt) for col, dt in dtypes.items()}
+
+        for chunk in pd.read_csv(source, dtype=read_dtypes, chunksize=chunksize):
+            for col, dt in int_cols.items():
+                values = chunk[col]
+                if values.isna().any():
+                    chunk[col] = values.astype(dt.capitalize())
+                else:
+                    chunk[col] = values.astype(dt)
+            yield chunk
+
+
+def read_csv_typed(file_path, schema, chunksize=CHUNK_ROWS):
+    """
+    The whole CSV as one frame (see `iter_csv_typed`), categoricals unified
+    across chunks. The typed chunks are combined one column at a time and
+    each column is dropped from them once combined, so the peak is about
+    the frame plus one column's chunks rather than two copies of the frame.
+    """
+    chunks = list(iter_csv_typed(file_path, schema, chunksize))
+    if len(chunks) <= 1:
+        return concat_frames(chunks)
+    combined = {}
+    for col in list(chunks[0].columns):
+        combined[col] = _concat_column([chunk.pop(col) for chunk in chunks], col)
+    return pd.DataFrame(combined)
+
+
+def parse_season(matches):
+    """
+    Converts labels like '2007/08' to the playing year. The match date is
+    authoritative (the '2009/10' season was played in 2010); the first
+    four-digit year is the fallback when no date is present.
+    """
+    season = matches["season"]
+    year = pd.to_numeric(season.astype(str).str.extract(r"(\d{4})")[0], errors="coerce")
+    if "date" in matches.columns and pd.api.types.is_datetime64_any_dtype(matches["date"]):
+        year = matches["date"].dt.year.where(matches["date"].notna(), year)
+    return year.astype("Int16") if year.isna().any() else year.astype("int16")
+
+
+def load_matches(file_path=None, chunksize=CHUNK_ROWS):
+    """Loads the matches table with its declared dtypes and an integer season."""
+    file_path = file_path or os.path.join(DATA_DIR, MATCHES_FILE)
+    matches = read_csv_typed(file_path, MATCHES_SCHEMA, chunksize=chunksize)
+
+    for col in DATE_COLUMNS:
+        if col in matches.columns:
+            matches[col] = pd.to_datetime(matches[col], errors="coerce")
+
+    if "season" in matches.columns:
+        matches["season"] = parse_season(matches)
+
+    return matches
+
+
+def load_deliveries(file_path=None, chunksize=CHUNK_ROWS):
+    """Loads the ball-by-ball table with its declared dtypes."""
+    file_path = file_path or os.path.join(DATA_DIR, DELIVERIES_FILE)
+    return read_csv_typed(file_path, DELIVERIES_SCHEMA, chunksize=chunksize)
+
+
+def load_data(match_path=None, deliv_path=None):
+    """
+    Returns (matches, deliveries) parsed from the source CSVs, with team,
+    player and venue columns sharing one dictionary across both tables.
+    """
+    matches, deliveries, _ = encode_shared(load_matches(match_path), load_deliveries(deliv_path))
+    return matches, deliveries
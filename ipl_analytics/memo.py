@@ -0,0 +1,85 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+# Entries kept per process; IPL_RESULT_CACHE_SIZE overrides it per deployment.
+DEFAULT_MAXSIZE = int(os.environ.get("IPL_RESULT_CACHE_SIZE", "256"))
+
+
+def filter_key(version, seasons=None, team=None):
+    """
+    Canonical cache key for a dashboard filter. Season order does not
+    matter, and an empty selection means "all seasons".
+    """
+    return (version, tuple(sorted(int(s) for s in seasons or ())), team)
+
+
+def frame_hash(df):
+    """Content hash of a frame (values, index and column names), for keying what is built from it."""
+    digest = hashlib.sha256(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    digest.update(repr(list(df.columns)).encode())
+    return digest.hexdigest()[:16]
+
+
+class ResultCache:
+    """
+    Thread-safe LRU cache of computed results, shared by every session in a
+    process. Hits, misses and evictions are counted so the hit rate can be
+    shown in the dashboard.
+    """
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, compute):
+        """
+        Returns the cached value for `key`, calling `compute()` on a miss.
+        `compute` runs outside the lock, so concurrent misses on the same
+        key may both compute; the first stored result wins.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        value = compute()
+
+        with self._lock:
+            if key in self._entries:
+                return self._entries[key]
+            self._entries[key] = value
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
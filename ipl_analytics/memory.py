@@ -0,0 +1,176 @@
+import numpy as np
+import pandas as pd
+
+# --- SHARED, READ-ONLY DATA ---
+# The engine's frames and aggregate arrays are built once per process and
+# shared by every session. Their NumPy buffers are made read-only, so an
+# accidental in-place write raises instead of corrupting other sessions,
+# and per-session results are views or small derived tables.
+
+
+def _root(array):
+    """The array that owns the memory `array` views."""
+    while isinstance(getattr(array, "base", None), np.ndarray):
+        array = array.base
+    return array
+
+
+def _array_buffers(values):
+    """(address, nbytes) of the memory behind one column's values."""
+    if isinstance(values, np.ndarray):
+        root = _root(values)
+        if root.dtype == object:
+            # Python objects: count the pointer array plus a deep estimate
+            # (the root may be a 2-D block shared by several columns)
+            deep = pd.Series(root.ravel()).memory_usage(deep=True, index=False)
+            return [(root.__array_interface__["data"][0], int(deep))]
+        return [(root.__array_interface__["data"][0], root.nbytes)]
+    if isinstance(values, pd.Categorical):
+        return _array_buffers(values.codes) + _index_buffers(values.categories)
+    chunked = getattr(values, "_pa_array", None)
+    if chunked is not None:
+        return [
+            (buf.address, buf.size)
+            for chunk in chunked.chunks for buf in chunk.buffers() if buf is not None
+        ]
+    out = []
+    for attr in ("_ndarray", "_data", "_mask"):
+        inner = getattr(values, attr, None)
+        if isinstance(inner, np.ndarray):
+            out += _array_buffers(inner)
+    if out:
+        return out
+    return [(id(values), int(pd.Series(values).memory_usage(deep=True, index=False)))]
+
+
+def _column_values(series):
+    return series.values if isinstance(series.dtype, pd.CategoricalDtype) else series.array
+
+
+def _index_buffers(index):
+    if isinstance(index, pd.RangeIndex):
+        return []
+    if isinstance(index, pd.MultiIndex):
+        return [buf for level in index.levels for buf in _index_buffers(level)] + [
+            buf for codes in index.codes for buf in _array_buffers(np.asarray(codes))
+        ]
+    return _array_buffers(index.array if not isinstance(index, pd.CategoricalIndex) else index.values)
+
+
+def buffers(obj):
+    """
+    {address: nbytes} of every buffer reachable from `obj` (frames, series,
+    arrays, and dicts / lists / tuples / objects holding them). Views share
+    their base's address, so a buffer reached twice is counted once.
+    """
+    found = {}
+    # id -> object: holding the visited objects keeps temporary column
+    # series alive, so their ids are not reused within one walk
+    seen = {}
+
+    def visit(item):
+        if id(item) in seen or item is None or isinstance(item, (str, bytes, int, float, bool)):
+            return
+        seen[id(item)] = item
+        if isinstance(item, pd.DataFrame):
+            for col in range(item.shape[1]):
+                visit(item.iloc[:, col])
+            found.update(_index_buffers(item.index))
+        elif isinstance(item, pd.Series):
+            found.update(_array_buffers(_column_values(item)))
+            found.update(_index_buffers(item.index))
+        elif isinstance(item, pd.Index):
+            found.update(_index_buffers(item))
+        elif isinstance(item, np.ndarray):
+            found.update(_array_buffers(item))
+        elif isinstance(item, dict):
+            for value in item.values():
+                visit(value)
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            for value in item:
+                visit(value)
+        elif hasattr(item, "__dict__"):
+            visit(vars(item))
+    visit(obj)
+    return found
+
+
+def nbytes(obj, exclude=None):
+    """Bytes held by `obj`, not counting buffers in `exclude` (an address set or mapping)."""
+    exclude = exclude or ()
+    return sum(size for address, size in buffers(obj).items() if address not in exclude)
+
+
+def freeze(obj):
+    """
+    Marks every NumPy buffer of a frame / series / array / container (as
+    walked by `buffers`) read-only. Returns `obj` for chaining.
+    """
+    def lock(values):
+        if isinstance(values, np.ndarray):
+            values.flags.writeable = False
+            root = _root(values)
+            if root is not values:
+                root.flags.writeable = False
+        elif isinstance(values, pd.Categorical):
+            lock(values.codes)
+        else:
+            for attr in ("_ndarray", "_data", "_mask"):
+                inner = getattr(values, attr, None)
+                if isinstance(inner, np.ndarray):
+                    lock(inner)
+
+    def visit(item):
+        if isinstance(item, pd.DataFrame):
+            for col in range(item.shape[1]):
+                visit(item.iloc[:, col])
+        elif isinstance(item, pd.Series):
+            lock(_column_values(item))
+        elif isinstance(item, np.ndarray):
+            lock(item)
+        elif isinstance(item, dict):
+            for value in item.values():
+                visit(value)
+        elif isinstance(item, (list, tuple)):
+            for value in item:
+                visit(value)
+    visit(obj)
+    return obj
+
+
+class MemoryLedger:
+    """
+    Bytes of the process-wide shared resources (registered once) and of
+    any per-session objects beyond them. A session that only holds views
+    of shared data or shared cached results costs (close to) nothing.
+    """
+
+    def __init__(self):
+        self.resources = {}
+
+    def register(self, name, obj):
+        """Adds (or replaces) a shared resource; its buffers count once, for the first name."""
+        self.resources[name] = obj
+        return obj
+
+    def shared_buffers(self):
+        found = {}
+        for obj in self.resources.values():
+            for address, size in buffers(obj).items():
+                found.setdefault(address, size)
+        return found
+
+    def report(self):
+        """Bytes per shared resource, each buffer attributed to the first resource reaching it."""
+        claimed = set()
+        out = {}
+        for name, obj in self.resources.items():
+            found = buffers(obj)
+            out[name] = sum(size for address, size in found.items() if address not in claimed)
+            claimed.update(found)
+        out["total"] = sum(out.values())
+        return out
+
+    def session_bytes(self, objects):
+        """Bytes reachable from `objects` that are not part of any shared resource."""
+        return nbytes(objects, exclude=self.shared_buffers())
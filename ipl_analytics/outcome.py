@@ -0,0 +1,195 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from . import loader
+
+# --- MODEL ARTIFACTS ---
+# Trained outcome models are saved as versioned joblib files; the pointer
+# file names the one served by default. Artifacts are unpickled on load,
+# so only point IPL_MODEL_DIR at directories you trust.
+MODEL_DIR = os.environ.get("IPL_MODEL_DIR", os.path.join(loader.DATA_DIR, "models"))
+LATEST = "outcome-latest.json"
+
+# Bump when the feature set or encoding changes so old artifacts are rejected.
+ARTIFACT_FORMAT = 1
+
+CATEGORICAL_FEATURES = ["team1", "team2", "toss_winner", "toss_decision", "venue"]
+FEATURES = ["season"] + CATEGORICAL_FEATURES
+TARGET = "winner"
+
+# Code for a value the model never saw (a new team or venue). Trees split
+# on thresholds, so -1 routes unseen values consistently instead of
+# aliasing them onto the first known class as the notebook's 0 did.
+UNSEEN = -1
+
+
+def encode_column(values, classes):
+    """Codes of `values` in `classes` in one vectorized pass (UNSEEN when absent or missing)."""
+    # pd.Categorical with values outside its categories is deprecated in pandas 3
+    return pd.Index(classes).get_indexer(pd.Index(values, dtype=object)).astype(np.int32)
+
+
+class OutcomeModel:
+    """
+    A trained match-outcome classifier with the class lists its features
+    were encoded against. `predict` scores any number of matches in one
+    vectorized encode + one model call.
+    """
+
+    def __init__(self, model, classes, winner_classes, metadata=None):
+        self.model = model
+        self.classes = classes
+        self.winner_classes = np.asarray(winner_classes, dtype=object)
+        self.metadata = metadata or {}
+
+    @property
+    def version(self):
+        return self.metadata.get("version", "unversioned")
+
+    def encode(self, matches):
+        """Feature matrix for `matches` (season + encoded categoricals)."""
+        missing = [col for col in FEATURES if col not in matches.columns]
+        if missing:
+            raise ValueError(f"Matches are missing model features: {', '.join(missing)}")
+        X = np.empty((len(matches), len(FEATURES)), dtype=np.float32)
+        X[:, 0] = pd.to_numeric(matches["season"], errors="coerce").fillna(0).to_numpy(dtype=np.float32)
+        for i, col in enumerate(CATEGORICAL_FEATURES, start=1):
+            X[:, i] = encode_column(matches[col], self.classes[col])
+        return X
+
+    def predict(self, matches):
+        """
+        Frame of (id, predicted_winner, confidence) for every row of
+        `matches`, where confidence is the top class probability.
+        """
+        if len(matches) == 0:
+            return pd.DataFrame({"id": [], "predicted_winner": [], "confidence": []})
+        proba = self.model.predict_proba(self.encode(matches))
+        best = proba.argmax(axis=1)
+        winners = self.winner_classes[self.model.classes_[best]]
+        return pd.DataFrame({
+            "id": matches["id"].to_numpy() if "id" in matches.columns else np.arange(len(matches)),
+            "predicted_winner": winners,
+            "confidence": proba[np.arange(len(best)), best].round(4),
+        })
+
+    def win_probability(self, matches):
+        """
+        Probability that team1 beats team2 in each row of `matches`: the two
+        sides' class probabilities renormalized over each other (0.5 when
+        the model gives neither side any weight, e.g. two unseen teams).
+        """
+        if len(matches) == 0:
+            return np.zeros(0)
+        proba = self.model.predict_proba(self.encode(matches))
+        # Column of each winner class in predict_proba's output (-1: no column)
+        column = np.full(len(self.winner_classes), -1)
+        column[self.model.classes_] = np.arange(len(self.model.classes_))
+        padded = np.c_[proba, np.zeros(len(proba))]
+
+        def side(team):
+            code = encode_column(matches[team], self.winner_classes)
+            return padded[np.arange(len(proba)), np.where(code >= 0, column[np.maximum(code, 0)], -1)]
+
+        p1, p2 = side("team1"), side("team2")
+        total = p1 + p2
+        return np.where(total > 0, p1 / np.where(total > 0, total, 1), 0.5)
+
+    def save(self, directory=None):
+        """Writes the artifact and repoints LATEST at it; returns the artifact path."""
+        import joblib
+
+        directory = directory or MODEL_DIR
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"outcome-{self.version}.joblib")
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        os.close(fd)
+        joblib.dump({
+            "format": ARTIFACT_FORMAT,
+            "model": self.model,
+            "classes": self.classes,
+            "winner_classes": list(self.winner_classes),
+            "metadata": self.metadata,
+        }, tmp_path)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            json.dump({"artifact": os.path.basename(path), **self.metadata}, fh, indent=2)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, os.path.join(directory, LATEST))
+        return path
+
+    @classmethod
+    def load(cls, path):
+        import joblib
+
+        payload = joblib.load(path)
+        if payload.get("format") != ARTIFACT_FORMAT:
+            raise ValueError(
+                f"{path} is outcome artifact format {payload.get('format')}, expected {ARTIFACT_FORMAT}; retrain it."
+            )
+        return cls(payload["model"], payload["classes"], payload["winner_classes"], payload["metadata"])
+
+
+def training_frame(matches):
+    """Decided matches with every feature present."""
+    return matches.dropna(subset=FEATURES + [TARGET])
+
+
+def train_outcome_model(matches, dataset_version=None, n_estimators=200, random_state=42, test_size=0.2):
+    """
+    Fits the notebook's RandomForest on decided matches and returns an
+    OutcomeModel whose metadata records the data version, sizes and the
+    hold-out accuracy.
+    """
+    from sklearn import __version__ as sklearn_version
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.model_selection import train_test_split
+
+    data = training_frame(matches)
+    if data.empty:
+        raise ValueError("No decided matches with complete features to train on")
+
+    classes = {col: sorted(data[col].astype(str).unique()) for col in CATEGORICAL_FEATURES}
+    winner_classes = sorted(data[TARGET].astype(str).unique())
+    shell = OutcomeModel(None, classes, winner_classes)
+    X = shell.encode(data)
+    y = encode_column(data[TARGET], winner_classes)
+
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=test_size, random_state=random_state)
+    model = RandomForestClassifier(n_estimators=n_estimators, random_state=random_state, n_jobs=-1)
+    model.fit(X_train, y_train)
+    # Scoring a season is ~100 rows: thread start-up would dominate its latency
+    model.set_params(n_jobs=None)
+
+    params = f"{dataset_version}:{n_estimators}:{random_state}:{test_size}:{ARTIFACT_FORMAT}"
+    metadata = {
+        "version": hashlib.sha256(params.encode()).hexdigest()[:12],
+        "dataset_version": dataset_version,
+        "trained_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "sklearn": sklearn_version,
+        "n_estimators": n_estimators,
+        "train_rows": int(len(X_train)),
+        "test_rows": int(len(X_test)),
+        "test_accuracy": round(float((model.predict(X_test) == y_test).mean()), 4),
+    }
+    return OutcomeModel(model, classes, winner_classes, metadata)
+
+
+def load_model(directory=None):
+    """The model LATEST points at, or None when nothing was trained yet."""
+    directory = directory or MODEL_DIR
+    pointer = os.path.join(directory, LATEST)
+    if not os.path.exists(pointer):
+        return None
+    with open(pointer, encoding="utf-8") as fh:
+        artifact = json.load(fh)["artifact"]
+    return OutcomeModel.load(os.path.join(directory, artifact))
@@ -0,0 +1,147 @@
+import multiprocessing
+import os
+from collections import namedtuple
+
+import numpy as np
+
+from . import encoding as enc
+from .cube import build_player_cube
+from .index import build_delivery_index
+
+# --- EXECUTION MODE ---
+# Worker processes used for sharded aggregation; 1 (the default) keeps
+# everything in-process. IPL_WORKERS=0 means one worker per available core.
+WORKERS = int(os.environ.get("IPL_WORKERS", "1"))
+
+SHARD_BY = ("season", "match")
+# Deliveries per shard below which a pool costs more than it saves: starting
+# workers takes tens of ms, about what aggregating this many rows does.
+MIN_SHARD_ROWS = int(os.environ.get("IPL_MIN_SHARD_ROWS", "500000"))
+
+Aggregates = namedtuple("Aggregates", ["player_cube", "teams", "matches_home", "matches_away", "wins"])
+
+# Frames shared with the pool's workers: inherited on fork, pickled once
+# per worker (not per shard) on spawn.
+_shared = {}
+
+
+def resolve_workers(workers=None):
+    workers = WORKERS if workers is None else workers
+    if workers <= 0:
+        workers = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+    return max(1, workers)
+
+
+def _cuts(candidates, total, n_shards):
+    """Up to `n_shards` contiguous [start, end) ranges over `total` rows, cut only at `candidates`."""
+    candidates = np.unique(np.r_[0, candidates, total])
+    targets = np.linspace(0, total, n_shards + 1)[1:-1]
+    inner = candidates[np.clip(np.searchsorted(candidates, targets), 0, len(candidates) - 1)]
+    bounds = np.unique(np.r_[0, inner, total])
+    return [(int(a), int(b)) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+
+
+def shard_count(rows, workers):
+    """Shards for `rows` deliveries: one per worker, but none smaller than MIN_SHARD_ROWS."""
+    return max(1, min(workers, rows // max(MIN_SHARD_ROWS, 1)))
+
+
+def map_tasks(fn, tasks, workers, initializer=None, initargs=()):
+    """
+    [fn(task) for task in tasks], in order: in a pool of up to `workers`
+    processes (forked where available, each set up by
+    `initializer(*initargs)`) when there is more than one task, in-process
+    otherwise. One task per dispatch, so a worker holds one task's data at
+    a time. Falls back to serial when processes cannot be started.
+    """
+    if workers > 1 and len(tasks) > 1:
+        method = "fork" if "fork" in multiprocessing.get_all_start_methods() else None
+        try:
+            with multiprocessing.get_context(method).Pool(
+                min(workers, len(tasks)), initializer=initializer, initargs=initargs
+            ) as pool:
+                return pool.map(fn, tasks, chunksize=1)
+        except OSError:
+            # No process support (sandbox, missing /dev/shm): fall back to serial
+            pass
+    if initializer is not None:
+        initializer(*initargs)
+    return [fn(task) for task in tasks]
+
+
+def shard_ranges(index, n_shards, by="season"):
+    """
+    Row ranges of the index's sorted deliveries, balanced by row count and
+    cut only at season (or match) boundaries, so no group spans shards.
+    """
+    if by == "season":
+        candidates = index.season_starts
+    elif by == "match":
+        candidates = index.match_starts
+    else:
+        raise ValueError(f"Unknown shard key '{by}'; use one of {', '.join(SHARD_BY)}.")
+    return _cuts(np.sort(candidates), len(index), n_shards)
+
+
+def _init_worker(matches, deliveries):
+    _shared["matches"] = matches
+    _shared["deliveries"] = deliveries
+
+
+def _delivery_partial(bounds):
+    start, end = bounds
+    return build_player_cube(_shared["matches"], _shared["deliveries"].iloc[start:end])
+
+
+def _merge_cubes(cubes):
+    cube = cubes[0]
+    for part in cubes[1:]:
+        cube = cube.merge(part)
+    return cube
+
+
+def _run_shards(shards, matches, deliveries, workers):
+    """Player cube partials of delivery `shards`, merged."""
+    try:
+        return _merge_cubes(map_tasks(
+            _delivery_partial, shards, workers, initializer=_init_worker, initargs=(matches, deliveries)
+        ))
+    finally:
+        _shared.clear()
+
+
+def aggregate(matches, deliveries, workers=None, by="season", index=None):
+    """
+    Batter / bowler season totals (as a PlayerCube) and per-team matches
+    and wins. The cube is computed as partial aggregates over delivery
+    shards (see shard_count) and merged exactly (integer sums aligned by
+    season and player); the team counts are one bincount each over the
+    much smaller match table. Columns must share dictionaries (see
+    encoding.encode_shared).
+    """
+    workers = resolve_workers(workers)
+    index = index if index is not None else build_delivery_index(matches, deliveries)
+    shards = shard_ranges(index, shard_count(len(index), workers), by)
+    cube = (
+        _run_shards(shards, matches, index.deliveries, workers) if shards
+        else build_player_cube(matches, index.deliveries.iloc[0:0])
+    )
+    return Aggregates(
+        cube,
+        matches["team1"].cat.categories,
+        enc.count_by_code(matches["team1"]),
+        enc.count_by_code(matches["team2"]),
+        enc.count_by_code(matches["winner"]),
+    )
+
+
+def build_player_cube_sharded(matches, deliveries, workers=None, index=None):
+    """`cube.build_player_cube`, sharded by season over `workers` processes (see shard_count)."""
+    workers = resolve_workers(workers)
+    if shard_count(len(deliveries), workers) == 1:
+        return build_player_cube(matches, deliveries)
+    index = index if index is not None else build_delivery_index(matches, deliveries)
+    shards = shard_ranges(index, shard_count(len(index), workers), "season")
+    if not shards:
+        return build_player_cube(matches, deliveries)
+    return _run_shards(shards, matches, index.deliveries, workers)
@@ -0,0 +1,276 @@
+import numpy as np
+import pandas as pd
+
+from . import encoding as enc
+from .cube import delivery_seasons, legal_ball_mask
+from .index import season_slice
+
+# --- PHASES ---
+# First (0-based) over of each phase; the last phase runs to the end of
+# the innings. Super overs (innings 3+) are left out of every statistic.
+PHASES = ["powerplay", "middle", "death"]
+PHASE_STARTS = np.array([0, 6, 15])
+REGULATION_INNINGS = 2
+
+# Partnership milestones counted per pair / wicket
+FIFTY, HUNDRED = 50, 100
+
+
+def phase_of(over):
+    """Phase code (index into PHASES) of each 0-based over."""
+    return np.searchsorted(PHASE_STARTS, np.asarray(over), side="right") - 1
+
+
+def _ball_columns(matches, deliveries):
+    """
+    The columns the reductions need, as arrays in (season, match_id, inning,
+    over, ball) order, for regulation innings only.
+    """
+    keep = deliveries["inning"].to_numpy() <= REGULATION_INNINGS
+    season = delivery_seasons(matches, deliveries)[keep]
+    match_id = deliveries["match_id"].to_numpy()[keep]
+    inning = deliveries["inning"].to_numpy()[keep]
+    over = deliveries["over"].to_numpy()[keep]
+    ball = deliveries["ball"].to_numpy()[keep]
+    # Season first, so the reduced tables are season-sorted (see for_seasons)
+    order = np.lexsort((ball, over, inning, match_id, season))
+    runs = deliveries["batsman_runs"].to_numpy()[keep][order]
+    return {
+        "match_id": match_id[order],
+        "inning": inning[order],
+        "phase": phase_of(over[order]),
+        "season": season[order],
+        "batting_team": enc.codes(deliveries["batting_team"])[keep][order],
+        "bowling_team": enc.codes(deliveries["bowling_team"])[keep][order],
+        "batter": enc.codes(deliveries["batter"])[keep][order],
+        "non_striker": enc.codes(deliveries["non_striker"])[keep][order],
+        "dismissed": enc.codes(deliveries["player_dismissed"])[keep][order],
+        "batsman_runs": runs.astype(np.int64),
+        "total_runs": deliveries["total_runs"].to_numpy()[keep][order].astype(np.int64),
+        "legal": legal_ball_mask(deliveries)[keep][order].astype(np.int64),
+        # Any dismissal (as in features.over_totals) ends a partnership
+        "wicket": deliveries["player_dismissed"].notna().to_numpy()[keep][order],
+    }
+
+
+def _changes(*keys):
+    """True on every row where any of the (sorted) keys differs from the row before."""
+    n = len(keys[0])
+    new = np.zeros(n, dtype=bool)
+    if n:
+        new[0] = True
+        for key in keys:
+            new[1:] |= key[1:] != key[:-1]
+    return new
+
+
+def _decode(codes, dtype):
+    return pd.Categorical.from_codes(codes, dtype=dtype)
+
+
+def innings_phases(matches, deliveries):
+    """
+    One row per (match, innings, phase): runs, legal balls, wickets, fours,
+    sixes and dot balls. Each phase of an innings is a contiguous segment
+    of the sorted balls, reduced in one `np.add.reduceat` per column.
+    """
+    cols = _ball_columns(matches, deliveries)
+    starts = np.flatnonzero(_changes(cols["match_id"], cols["inning"], cols["phase"]))
+
+    def total(values):
+        return np.add.reduceat(values, starts) if len(starts) else np.zeros(0, dtype=np.int64)
+
+    runs = cols["batsman_runs"]
+    return pd.DataFrame({
+        "match_id": cols["match_id"][starts],
+        "inning": cols["inning"][starts],
+        "season": cols["season"][starts],
+        "phase": pd.Categorical.from_codes(cols["phase"][starts], categories=PHASES, ordered=True),
+        "batting_team": _decode(cols["batting_team"][starts], deliveries["batting_team"].dtype),
+        "bowling_team": _decode(cols["bowling_team"][starts], deliveries["bowling_team"].dtype),
+        "runs": total(cols["total_runs"]),
+        "balls": total(cols["legal"]),
+        "wickets": total(cols["wicket"].astype(np.int64)),
+        "fours": total((runs == 4).astype(np.int64)),
+        "sixes": total((runs == 6).astype(np.int64)),
+        "dots": total(((cols["total_runs"] == 0) & (cols["legal"] == 1)).astype(np.int64)),
+    })
+
+
+def partnerships(matches, deliveries):
+    """
+    One row per partnership. Within an innings every dismissal closes a
+    segment (the wicket ball belongs to the stand it ends), so a stand is
+    a contiguous run of balls and its totals are segment reductions.
+    `wicket` is the wicket the pair batted for (1 = opening stand);
+    `ended` is False for stands unbroken at the end of the innings.
+    """
+    cols = _ball_columns(matches, deliveries)
+    new_innings = _changes(cols["match_id"], cols["inning"])
+    after_wicket = np.r_[False, cols["wicket"][:-1]] if len(new_innings) else new_innings
+    starts = np.flatnonzero(new_innings | after_wicket)
+    ends = np.r_[starts[1:], len(new_innings)]
+    lengths = ends - starts
+
+    # Stand number within its innings: segments since the innings' first one
+    seg = np.arange(len(starts))
+    first = np.maximum.accumulate(np.where(new_innings[starts], seg, 0))
+
+    # The pair is fixed within a stand; order it by dictionary (name) code
+    batter, non_striker = cols["batter"][starts], cols["non_striker"][starts]
+    first_bat, second_bat = np.minimum(batter, non_striker), np.maximum(batter, non_striker)
+    by_first = cols["batter"] == np.repeat(first_bat, lengths)
+    by_second = cols["batter"] == np.repeat(second_bat, lengths)
+
+    def total(values):
+        return np.add.reduceat(values, starts) if len(starts) else np.zeros(0, dtype=np.int64)
+
+    players = deliveries["batter"].dtype
+    return pd.DataFrame({
+        "match_id": cols["match_id"][starts],
+        "inning": cols["inning"][starts],
+        "season": cols["season"][starts],
+        "batting_team": _decode(cols["batting_team"][starts], deliveries["batting_team"].dtype),
+        "wicket": seg - first + 1,
+        "batter_a": _decode(first_bat, players),
+        "batter_b": _decode(second_bat, players),
+        "runs": total(cols["total_runs"]),
+        "balls": total(cols["legal"]),
+        "runs_a": total(np.where(by_first, cols["batsman_runs"], 0)),
+        "runs_b": total(np.where(by_second, cols["batsman_runs"], 0)),
+        "ended": cols["wicket"][ends - 1] if len(starts) else np.zeros(0, dtype=bool),
+    })
+
+
+def batter_phases(matches, deliveries):
+    """
+    Long (season, batter, phase) frame of runs, balls faced, fours, sixes
+    and dismissals, counted into one dense season x player x phase array
+    per metric.
+    """
+    cols = _ball_columns(matches, deliveries)
+    season = cols["season"]
+    seasons = np.unique(season[season >= 0])
+    season_idx = np.searchsorted(seasons, season)
+    players = deliveries["batter"].cat.categories
+    shape = (len(seasons), len(players), len(PHASES))
+    runs = cols["batsman_runs"]
+
+    def cube(player_codes, weights=None, mask=None):
+        keep = (season >= 0) & (player_codes >= 0)
+        if mask is not None:
+            keep &= mask
+        flat = np.ravel_multi_index((season_idx[keep], player_codes[keep], cols["phase"][keep]), shape)
+        w = None if weights is None else weights[keep]
+        return np.bincount(flat, weights=w, minlength=int(np.prod(shape))).reshape(shape).astype(np.int64)
+
+    metrics = {
+        "runs": cube(cols["batter"], runs),
+        "balls": cube(cols["batter"]),
+        "fours": cube(cols["batter"], mask=runs == 4),
+        "sixes": cube(cols["batter"], mask=runs == 6),
+        "outs": cube(cols["dismissed"]),
+    }
+    s, p, ph = np.nonzero(metrics["balls"] + metrics["outs"])
+    frame = pd.DataFrame({
+        "season": seasons[s],
+        "batter": players[p],
+        "phase": pd.Categorical.from_codes(ph, categories=PHASES, ordered=True),
+    })
+    for name, values in metrics.items():
+        frame[name] = values[s, p, ph]
+    return frame
+
+
+# ----------------------------------------------------------------------
+## Summaries (over frames already restricted to the selected seasons)
+# ----------------------------------------------------------------------
+def for_seasons(frame, seasons):
+    """Rows of a (season-sorted) phase / partnership frame in `seasons`, as slices, not copies."""
+    return season_slice(frame, seasons)
+
+
+def _rates(frame):
+    innings = frame["innings"].where(frame["innings"] > 0)
+    balls = frame["balls"].where(frame["balls"] > 0)
+    frame["run_rate"] = (frame["runs"] * 6 / balls).fillna(0).round(2)
+    frame["runs_per_innings"] = (frame["runs"] / innings).fillna(0).round(1)
+    frame["wickets_per_innings"] = (frame["wickets"] / innings).fillna(0).round(2)
+    return frame
+
+
+def phase_summary(phases_f):
+    """Run rate, runs and wickets per innings, boundary % and dot % for each phase."""
+    summary = phases_f.groupby("phase", observed=False).agg(
+        innings=("runs", "size"),
+        runs=("runs", "sum"),
+        balls=("balls", "sum"),
+        wickets=("wickets", "sum"),
+        fours=("fours", "sum"),
+        sixes=("sixes", "sum"),
+        dots=("dots", "sum"),
+    ).reset_index()
+    balls = summary["balls"].where(summary["balls"] > 0)
+    summary["boundary_pct"] = ((summary["fours"] + summary["sixes"]) / balls * 100).fillna(0).round(1)
+    summary["dot_pct"] = (summary["dots"] / balls * 100).fillna(0).round(1)
+    return _rates(summary)
+
+
+def team_phases(phases_f, side="batting_team"):
+    """Run rate, runs and wickets per innings by team (batting or bowling side) and phase."""
+    table = phases_f.groupby([side, "phase"], observed=True).agg(
+        innings=("runs", "size"),
+        runs=("runs", "sum"),
+        balls=("balls", "sum"),
+        wickets=("wickets", "sum"),
+    ).reset_index().rename(columns={side: "team"})
+    return _rates(table)
+
+
+def batter_phase_table(batter_phases_f, phase, min_balls=60):
+    """Strike rate, average and boundary % of batters with `min_balls` in `phase`, fastest first."""
+    rows = batter_phases_f[batter_phases_f["phase"] == phase]
+    table = rows.groupby("batter", observed=True)[["runs", "balls", "fours", "sixes", "outs"]].sum().reset_index()
+    table = table[table["balls"] >= min_balls].copy()
+    table["strike_rate"] = (table["runs"] * 100 / table["balls"]).round(2)
+    table["average"] = (table["runs"] / table["outs"].where(table["outs"] > 0)).round(2)
+    table["boundary_pct"] = ((table["fours"] + table["sixes"]) * 100 / table["balls"]).round(1)
+    return table.sort_values(["strike_rate", "runs"], ascending=False)
+
+
+def wicket_partnerships(partnerships_f):
+    """Stands, average and best partnership and 50+ stands for each wicket."""
+    table = partnerships_f.assign(fifty=partnerships_f["runs"] >= FIFTY).groupby("wicket").agg(
+        stands=("runs", "size"),
+        runs=("runs", "sum"),
+        best=("runs", "max"),
+        fifties=("fifty", "sum"),
+    ).reset_index()
+    table["average"] = (table["runs"] / table["stands"]).round(1)
+    return table
+
+
+def pair_partnerships(partnerships_f, min_stands=5):
+    """Stands, runs, average, best and 50+ / 100+ stands per batting pair, most runs first."""
+    runs = partnerships_f["runs"]
+    table = partnerships_f.assign(
+        fifty=(runs >= FIFTY) & (runs < HUNDRED), hundred=runs >= HUNDRED
+    ).groupby(["batter_a", "batter_b"], observed=True).agg(
+        stands=("runs", "size"),
+        runs=("runs", "sum"),
+        balls=("balls", "sum"),
+        best=("runs", "max"),
+        fifties=("fifty", "sum"),
+        hundreds=("hundred", "sum"),
+    ).reset_index()
+    table = table[table["stands"] >= min_stands].copy()
+    table["average"] = (table["runs"] / table["stands"]).round(1)
+    table["pair"] = table["batter_a"].astype(str) + " & " + table["batter_b"].astype(str)
+    return table.sort_values("runs", ascending=False)
+
+
+def top_partnerships(partnerships_f, n=10):
+    """The `n` highest stands with their pair, team, season and wicket."""
+    top = partnerships_f.nlargest(n, "runs").copy()
+    top["pair"] = top["batter_a"].astype(str) + " & " + top["batter_b"].astype(str)
+    return top
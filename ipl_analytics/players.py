@@ -0,0 +1,409 @@
+import difflib
+import hashlib
+import io
+import os
+import re
+import tempfile
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+from . import cache
+from . import encoding as enc
+from . import loader
+from .cube import delivery_seasons
+
+# --- AUCTION DATA & PLAYER MAP ---
+AUCTION_FILE = "IPLPlayerAuctionData.csv"
+# Auction name -> deliveries name mapping. The map is derived data: it lives
+# in the cache directory (or IPL_PLAYER_MAP) and rows resolved against
+# another dataset version are resolved again. Curated rows live in the
+# overrides file next to the auction data and always win.
+MAP_FILE = "player_map.csv"
+PLAYER_MAP = os.environ.get("IPL_PLAYER_MAP")
+PLAYER_OVERRIDES = os.environ.get("IPL_PLAYER_OVERRIDES", os.path.join(loader.DATA_DIR, "player_overrides.csv"))
+MAP_COLUMNS = ["auction_name", "player", "player_id", "score", "method", "version"]
+
+# Scores below MATCH_THRESHOLD are never a match; between it and
+# STRONG_MATCH a match needs team / season evidence. Without evidence the
+# best candidate needs AMBIGUITY_MARGIN over the runner-up.
+MATCH_THRESHOLD = 0.75
+STRONG_MATCH = 0.9
+AMBIGUITY_MARGIN = 0.03
+# Per-part similarity floors: surname for "AJ Finch"-style names, every
+# token for names spelled out in full.
+SURNAME_MIN = 0.85
+TOKEN_MIN = 0.85
+# An initials-only name ("A Singh") fits many people, so without team /
+# season evidence it is only accepted for a candidate who played within
+# this many seasons of a purchase year.
+NEARBY_SEASONS = 3
+
+
+def load_auction(file_path=None):
+    """Auction rows with a numeric Amount (rupees) and integer Year; rows without a year are dropped."""
+    file_path = file_path or os.path.join(loader.DATA_DIR, AUCTION_FILE)
+    auction = pd.read_csv(file_path, encoding="utf-8-sig")
+    auction.columns = auction.columns.str.strip()
+    auction["Amount"] = pd.to_numeric(auction["Amount"], errors="coerce")
+    auction["Year"] = pd.to_numeric(auction["Year"], errors="coerce")
+    auction = auction.dropna(subset=["Year", "Amount"])
+    auction["Year"] = auction["Year"].astype(int)
+    auction["Player"] = auction["Player"].str.strip()
+    return auction.reset_index(drop=True)
+
+
+def player_id(name):
+    """Stable id of a deliveries player name."""
+    return hashlib.sha1(name.encode()).hexdigest()[:10]
+
+
+def _tokens(name):
+    return [t for t in re.split(r"[\s.]+", name.strip()) if t]
+
+
+def _is_initials(token):
+    return len(token) == 1 or (token.isupper() and len(token) <= 4)
+
+
+def name_parts(name):
+    """
+    (surname, initials, tokens, abbreviated) of a name in either style:
+    "AJ Finch" (initials block) or "Aaron Finch" / "R. Ashwin" (given
+    names). Everything is lowercased; `abbreviated` is True when a given
+    name is only an initial.
+    """
+    tokens = _tokens(name)
+    if not tokens:
+        return "", "", (), False
+    given = tokens[:-1]
+    abbreviated = any(_is_initials(t) for t in given)
+    if len(given) == 1 and _is_initials(given[0]):
+        initials = given[0].lower()
+    else:
+        initials = "".join(t[0].lower() for t in given)
+    return tokens[-1].lower(), initials, tuple(t.lower() for t in tokens), abbreviated
+
+
+def _trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _ratio(a, b):
+    return difflib.SequenceMatcher(None, a, b).ratio()
+
+
+def appearance_sets(frame):
+    """{player: {(team, season), ...}} from (player, team, season) rows."""
+    out = defaultdict(set)
+    for player, team, year in frame[["player", "team", "season"]].itertuples(index=False):
+        out[player].add((team, int(year)))
+    return dict(out)
+
+
+def appearances(matches, deliveries):
+    """(team, season) pairs of everyone who batted or bowled in `deliveries`."""
+    season = delivery_seasons(matches, deliveries)
+    pairs = pd.concat([
+        pd.DataFrame({
+            "player": enc.codes(deliveries[player_col]),
+            "team": enc.codes(deliveries[team_col]),
+            "season": season,
+        })
+        for player_col, team_col in [("batter", "batting_team"), ("bowler", "bowling_team")]
+    ]).drop_duplicates()
+    pairs = pairs[(pairs["player"] >= 0) & (pairs["team"] >= 0) & (pairs["season"] >= 0)]
+    return appearance_sets(pd.DataFrame({
+        "player": deliveries["batter"].cat.categories[pairs["player"]],
+        "team": deliveries["batting_team"].cat.categories[pairs["team"]],
+        "season": pairs["season"].to_numpy(),
+    }))
+
+
+class NameIndex:
+    """
+    Blocking index over deliveries names: any name token, plus surname
+    trigrams for spelling variants. A query is only scored against names
+    sharing a block, never against the whole roster.
+    """
+
+    def __init__(self, names, seen=None):
+        self.names = list(names)
+        self.parts = [name_parts(name) for name in self.names]
+        self.seen = seen or {}
+        self.by_token = defaultdict(set)
+        self.by_trigram = defaultdict(set)
+        for i, (surname, _, tokens, _) in enumerate(self.parts):
+            for token in tokens:
+                self.by_token[token].add(i)
+            for gram in _trigrams(surname):
+                self.by_trigram[gram].add(i)
+
+    def candidates(self, name, min_shared=3):
+        surname, _, tokens, _ = name_parts(name)
+        found = set()
+        for token in tokens:
+            found |= self.by_token.get(token, set())
+        # Spelling variants of the surname (Senanayaka / Senanayake)
+        counts = defaultdict(int)
+        for gram in _trigrams(surname):
+            for i in self.by_trigram.get(gram, ()):
+                counts[i] += 1
+        found |= {i for i, n in counts.items() if n >= min_shared}
+        return found
+
+    @staticmethod
+    def score(query, candidate):
+        """Similarity in [0, 1] of two `name_parts` tuples; 1 only for identical names."""
+        q_surname, q_initials, q_tokens, q_abbreviated = query
+        c_surname, c_initials, c_tokens, c_abbreviated = candidate
+        if q_tokens == c_tokens:
+            return 1.0
+
+        # Spelled-out given names of the candidate, matched against the query
+        spelled = [t for t in c_tokens[:-1] if len(t) > 1 and t != c_initials]
+        spelled_ratios = [max(_ratio(t, q) for q in q_tokens) for t in spelled]
+
+        best = 0.0
+        surname = _ratio(q_surname, c_surname)
+        if (
+            (q_abbreviated or c_abbreviated) and surname >= SURNAME_MIN
+            and q_initials and c_initials and all(r >= TOKEN_MIN for r in spelled_ratios)
+        ):
+            if c_initials.startswith(q_initials) or q_initials.startswith(c_initials):
+                shorter, longer = sorted([len(q_initials), len(c_initials)])
+                initials = 0.7 + 0.3 * shorter / longer
+            elif q_initials[0] in c_initials:
+                # Known by a middle name: "Lasith Malinga" is "SL Malinga"
+                initials = 0.55
+            else:
+                initials = 0.0
+            best = 0.55 * surname + 0.45 * initials if initials else 0.0
+
+        if spelled or not c_abbreviated:
+            # Names kept in full ("Rashid Khan", "M Shahrukh Khan"): every
+            # spelled-out token has to appear, give or take spelling, in the query.
+            ratios = spelled_ratios + [max(_ratio(c_surname, q) for q in q_tokens)]
+            if min(ratios) >= TOKEN_MIN:
+                coverage = len(ratios) / max(len(q_tokens), len(c_tokens))
+                best = max(best, sum(ratios) / len(ratios) * (0.9 + 0.1 * coverage))
+        return min(best, 0.99)
+
+    def played_near(self, player, years):
+        """True when `player` batted or bowled within NEARBY_SEASONS of any of `years`."""
+        return any(abs(season - year) <= NEARBY_SEASONS for _, season in self.seen.get(player, ()) for year in years)
+
+    def resolve(self, name, evidence=()):
+        """
+        (deliveries name or None, score, method) for one auction name.
+        `evidence` holds the (team, season) pairs the name was bought for;
+        a candidate who played for one of them is preferred over any other
+        and is the only way a weak match is accepted. A strong match where
+        either name gives only initials also needs the candidate to have
+        played near a purchase season ("nearby-season"); only names spelled
+        out in full on both sides are accepted on similarity alone ("fuzzy").
+        """
+        query = name_parts(name)
+        scored = sorted(
+            ((self.score(query, self.parts[i]), self.names[i], i) for i in self.candidates(name)),
+            key=lambda row: (-row[0], row[1])
+        )
+        above = [row for row in scored if row[0] >= MATCH_THRESHOLD]
+        if not above:
+            return None, round(scored[0][0], 3) if scored else 0.0, "unmatched"
+        best_score, best, best_i = above[0]
+        if best_score == 1.0:
+            return best, 1.0, "exact"
+
+        evidence = set(evidence)
+        played = [(score, player) for score, player, _ in above if self.seen.get(player, set()) & evidence]
+        if played:
+            return played[0][1], round(played[0][0], 3), "team-season"
+        if best_score < STRONG_MATCH:
+            return None, round(best_score, 3), "unmatched"
+        if len(above) > 1 and best_score - above[1][0] < AMBIGUITY_MARGIN:
+            return None, round(best_score, 3), "ambiguous"
+        if query[3] or self.parts[best_i][3]:
+            if self.played_near(best, {year for _, year in evidence}):
+                return best, round(best_score, 3), "nearby-season"
+            return None, round(best_score, 3), "unmatched"
+        return best, round(best_score, 3), "fuzzy"
+
+
+def resolve_names(auction, delivery_names, seen=None, version=None):
+    """
+    Mapping frame (MAP_COLUMNS) for every distinct auction name, using the
+    auction's Team / Year against `seen` (see `appearances`) as evidence.
+    When dissimilar auction names claim one player for the same team and
+    season, only the best supported claim is kept; the rest are marked
+    ambiguous.
+    """
+    index = NameIndex(delivery_names, seen)
+    evidence = auction.groupby("Player")[["Team", "Year"]].apply(
+        lambda rows: set(zip(rows["Team"], rows["Year"].astype(int)))
+    )
+    rows = []
+    for name, pairs in evidence.items():
+        player, score, method = index.resolve(name, pairs)
+        support = index.seen.get(player, set()) & pairs if player else set()
+        rows.append((name, player, score, method, frozenset(support)))
+
+    claims = defaultdict(list)
+    for row in rows:
+        if row[1] is not None:
+            claims[row[1]].append(row)
+    for player, claimants in claims.items():
+        claimants.sort(key=lambda row: (row[3] == "exact", len(row[4]), row[2]), reverse=True)
+        winner = name_parts(claimants[0][0])
+        taken = set(claimants[0][4])
+        for claimant in claimants[1:]:
+            other = name_parts(claimant[0])
+            alias = max(index.score(other, winner), index.score(winner, other)) >= MATCH_THRESHOLD
+            # A player is bought at most once per team and season
+            if alias or (claimant[4] and not claimant[4] & taken):
+                taken |= claimant[4]
+            else:
+                rows[rows.index(claimant)] = (claimant[0], None, claimant[2], "ambiguous", frozenset())
+
+    return pd.DataFrame(
+        [(name, player, player_id(player) if player else None, score, method, version)
+         for name, player, score, method, _ in rows],
+        columns=MAP_COLUMNS
+    )
+
+
+def _write_map(mapping, path):
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    os.close(fd)
+    mapping.to_csv(tmp_path, index=False)
+    os.chmod(tmp_path, 0o644)
+    os.replace(tmp_path, path)
+
+
+def map_path(path=None):
+    """Where the player map is read and written: `path`, IPL_PLAYER_MAP or the cache directory."""
+    return path or PLAYER_MAP or os.path.join(cache.CACHE_DIR, MAP_FILE)
+
+
+def load_overrides(path=None, version=None):
+    """
+    Curated rows (auction_name, player) from the overrides CSV as a mapping
+    frame with method "manual"; an empty player marks a name that must stay
+    unmatched. Empty when the file does not exist.
+    """
+    path = path or PLAYER_OVERRIDES
+    if not os.path.exists(path):
+        return pd.DataFrame(columns=MAP_COLUMNS)
+    rows = pd.read_csv(path, usecols=["auction_name", "player"], dtype=str)
+    rows = rows.dropna(subset=["auction_name"]).drop_duplicates("auction_name", keep="last")
+    names = [player if isinstance(player, str) else None for player in rows["player"]]
+    return pd.DataFrame({
+        "auction_name": rows["auction_name"].tolist(),
+        "player": names,
+        "player_id": [player_id(player) if player else None for player in names],
+        "score": 1.0,
+        "method": "manual",
+        "version": version,
+    }, columns=MAP_COLUMNS)
+
+
+def player_map(auction, delivery_names, seen=None, path=None, rebuild=False, version=None, overrides=None):
+    """
+    The auction -> deliveries mapping for dataset `version`. Rows saved for
+    the same version are reused; names missing from the map or resolved
+    against another version are resolved again, so a name whose deliveries
+    arrive in a later ingest is picked up. `rebuild` re-resolves every
+    name. Curated rows from `overrides` (see `load_overrides`) replace
+    resolved ones. `seen` may be a callable, so appearances are only
+    computed when something needs resolving.
+    """
+    path = map_path(path)
+    version = str(version or "unversioned")
+    manual = load_overrides(overrides, version)
+
+    text = ""
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as fh:
+            text = fh.read()
+    existing = (
+        pd.read_csv(io.StringIO(text), dtype={"player_id": str, "version": str}) if text and not rebuild
+        else pd.DataFrame(columns=MAP_COLUMNS)
+    )
+    if "version" not in existing:
+        existing["version"] = None
+    keep = existing[
+        (existing["version"] == version) & (existing["method"] != "manual")
+        & ~existing["auction_name"].isin(manual["auction_name"])
+    ]
+    missing = auction[~auction["Player"].isin(keep["auction_name"]) & ~auction["Player"].isin(manual["auction_name"])]
+    parts = [frame for frame in (manual, keep) if len(frame)]
+    if not missing.empty:
+        parts.append(resolve_names(missing, delivery_names, seen() if callable(seen) else seen, version))
+    mapping = pd.concat(parts, ignore_index=True)[MAP_COLUMNS] if parts else pd.DataFrame(columns=MAP_COLUMNS)
+    mapping = mapping.sort_values("auction_name").reset_index(drop=True)
+    if mapping.to_csv(index=False) != text:
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            _write_map(mapping, path)
+        except OSError:
+            pass
+    return mapping
+
+
+def load_auction_mapped(delivery_names, seen, file_path=None, path=None, version=None):
+    """
+    (auction rows, player map) for an engine's dataset `version`, or None
+    when there is no auction file.
+    """
+    file_path = file_path or os.path.join(loader.DATA_DIR, AUCTION_FILE)
+    if not os.path.exists(file_path):
+        return None
+    auction = load_auction(file_path)
+    return auction, player_map(auction, delivery_names, seen, path, version=version)
+
+
+def auction_value(auction, mapping, season_totals, seasons=None):
+    """
+    Amount paid per run and per wicket in the season of purchase, one row
+    per resolved auction buy in `seasons`. `season_totals` holds runs and
+    wickets per (season, player), e.g. from PlayerCube.season_totals.
+    """
+    rows = auction.merge(mapping[["auction_name", "player", "player_id"]], left_on="Player", right_on="auction_name")
+    rows = rows[rows["player"].notna()]
+    if seasons:
+        rows = rows[rows["Year"].isin(seasons)]
+    rows = rows.merge(
+        season_totals[["season", "player", "runs", "wickets"]],
+        left_on=["Year", "player"], right_on=["season", "player"], how="left"
+    )
+    runs = rows["runs"].fillna(0).to_numpy(dtype=np.int64)
+    wickets = rows["wickets"].fillna(0).to_numpy(dtype=np.int64)
+    amount = rows["Amount"].to_numpy(dtype=np.float64)
+    return pd.DataFrame({
+        "season": rows["Year"].to_numpy(),
+        "player": rows["player"].to_numpy(),
+        "player_id": rows["player_id"].to_numpy(),
+        "auction_name": rows["Player"].to_numpy(),
+        "team": rows["Team"].to_numpy(),
+        "role": rows["Role"].to_numpy(),
+        "amount": amount,
+        "runs": runs,
+        "wickets": wickets,
+        "cost_per_run": np.divide(amount, runs, out=np.full(len(rows), np.nan), where=runs > 0),
+        "cost_per_wicket": np.divide(amount, wickets, out=np.full(len(rows), np.nan), where=wickets > 0),
+    })
+
+
+def season_value(value):
+    """Spend, runs, wickets and overall cost per run / wicket of resolved buys, per season."""
+    grouped = value.groupby("season", sort=True).agg(
+        buys=("player", "size"), amount=("amount", "sum"), runs=("runs", "sum"), wickets=("wickets", "sum")
+    ).reset_index()
+    runs, wickets = grouped["runs"].to_numpy(), grouped["wickets"].to_numpy()
+    amount = grouped["amount"].to_numpy(dtype=np.float64)
+    grouped["cost_per_run"] = np.divide(amount, runs, out=np.full(len(grouped), np.nan), where=runs > 0)
+    grouped["cost_per_wicket"] = np.divide(amount, wickets, out=np.full(len(grouped), np.nan), where=wickets > 0)
+    return grouped
@@ -0,0 +1,253 @@
+import json
+import os
+import re
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from . import loader
+from .parallel import map_tasks, resolve_workers
+
+# --- PREPROCESSING ---
+# Replaces the Data Preprocessed notebook with a bounded-memory pipeline.
+# Pass 1 streams each source in chunks, cleans them, and appends every row
+# to a spill file keyed by (season, hash bucket): the row's content hash
+# picks the bucket, so duplicates from any two chunks land in the same
+# file. Pass 2 deduplicates one spill file at a time and writes it as a
+# season partition. Peak memory is one chunk or one bucket, whatever the
+# input size; raise the bucket count as inputs grow.
+PREPROCESS_DIR = os.environ.get("IPL_PREPROCESS_DIR", os.path.join(loader.DATA_DIR, "preprocessed"))
+TABLES = ("matches", "deliveries", "merged")
+MANIFEST = "manifest.json"
+# About this much source text per hash bucket and season (the default bucket count)
+BUCKET_BYTES = 256 << 20
+UNKNOWN_SEASON = "unknown"
+
+# Former franchises under their current names (the notebook's standardization;
+# like the notebook, Royal Challengers Bangalore keeps that name)
+TEAM_NAMES = {
+    "Delhi Daredevils": "Delhi Capitals",
+    "Kings XI Punjab": "Punjab Kings",
+    "Deccan Chargers": "Sunrisers Hyderabad",
+    "Rising Pune Supergiant": "Lucknow Super Giants",
+    "Rising Pune Supergiants": "Lucknow Super Giants",
+    "Pune Warriors": "Lucknow Super Giants",
+    "Gujarat Lions": "Gujarat Titans",
+    "Kochi Tuskers Kerala": "Lucknow Super Giants",
+}
+# Venues are compared without their ", City" suffix; these are the renamed
+# grounds and spelling variants that remain
+VENUE_NAMES = {
+    "Feroz Shah Kotla": "Arun Jaitley Stadium",
+    "M.Chinnaswamy Stadium": "M Chinnaswamy Stadium",
+    "Punjab Cricket Association Stadium": "Punjab Cricket Association IS Bindra Stadium",
+    "Sardar Patel Stadium": "Narendra Modi Stadium",
+    "Sheikh Zayed Stadium": "Zayed Cricket Stadium",
+}
+TEAM_COLUMNS = ["team1", "team2", "toss_winner", "winner", "batting_team", "bowling_team"]
+PLAYER_COLUMNS = ["player_of_match", "batter", "bowler", "non_striker", "player_dismissed", "fielder"]
+MATCH_FILL = {"city": "Unknown", "winner": "No Result", "player_of_match": "Unknown"}
+
+
+def team_name(name):
+    return TEAM_NAMES.get(name, name)
+
+
+def venue_name(name):
+    base = re.split(r"\s*,", name, maxsplit=1)[0].strip()
+    return VENUE_NAMES.get(base, base)
+
+
+def map_names(series, rename):
+    """
+    `rename` applied to every value of a categorical column by mapping its
+    (small) dictionary and re-pointing the codes; no per-row Python work.
+    Variants that map to one name are merged into one category.
+    """
+    series = series if isinstance(series.dtype, pd.CategoricalDtype) else series.astype("category")
+    categories = series.cat.categories
+    renamed = pd.Index([rename(str(value)) for value in categories])
+    codes, uniques = pd.factorize(renamed)
+    old = series.cat.codes.to_numpy()
+    new = np.where(old >= 0, codes[np.maximum(old, 0)], -1)
+    return pd.Series(pd.Categorical.from_codes(new, categories=uniques), index=series.index, name=series.name)
+
+
+def _fill(series, value):
+    if isinstance(series.dtype, pd.CategoricalDtype) and value not in series.cat.categories:
+        series = series.cat.add_categories([value])
+    return series.fillna(value)
+
+
+def clean_matches(chunk):
+    """The notebook's match cleaning: fills, standardized team / venue names, year and result flag."""
+    chunk = chunk.copy()
+    for col in loader.DATE_COLUMNS:
+        if col in chunk.columns:
+            chunk[col] = pd.to_datetime(chunk[col], errors="coerce")
+    if "season" in chunk.columns:
+        chunk["season"] = loader.parse_season(chunk)
+    for col in TEAM_COLUMNS:
+        if col in chunk.columns:
+            chunk[col] = map_names(chunk[col], team_name)
+    if "venue" in chunk.columns:
+        chunk["venue"] = map_names(chunk["venue"], venue_name)
+    for col in PLAYER_COLUMNS:
+        if col in chunk.columns:
+            chunk[col] = map_names(chunk[col], str.strip)
+    for col, value in MATCH_FILL.items():
+        if col in chunk.columns:
+            chunk[col] = _fill(chunk[col], value)
+    if "date" in chunk.columns:
+        chunk["year"] = chunk["date"].dt.year.astype("Int16")
+    if "winner" in chunk.columns:
+        chunk["match_result"] = np.where(chunk["winner"] == MATCH_FILL["winner"], "No Result", "Completed")
+    return chunk
+
+
+def clean_deliveries(chunk):
+    """
+    The notebook's delivery cleaning: standardized team names, stripped
+    player names and blank numbers as 0. Text columns keep their blanks,
+    since a missing player_dismissed / extras_type means "none".
+    """
+    chunk = chunk.copy()
+    for col in TEAM_COLUMNS:
+        if col in chunk.columns:
+            chunk[col] = map_names(chunk[col], team_name)
+    for col in PLAYER_COLUMNS:
+        if col in chunk.columns:
+            chunk[col] = map_names(chunk[col], str.strip)
+    for col, dtype in loader.DELIVERIES_SCHEMA.items():
+        if col in chunk.columns and dtype.startswith(("int", "float")):
+            chunk[col] = chunk[col].fillna(0).astype(dtype)
+    return chunk
+
+
+def _seasons_of(chunk, season_of_match):
+    """Season label of every row: its own season (matches) or its match's (deliveries)."""
+    if "season" in chunk.columns:
+        seasons = chunk["season"]
+    else:
+        seasons = chunk["match_id"].map(season_of_match)
+    return seasons.astype("string").fillna(UNKNOWN_SEASON).to_numpy(dtype=object)
+
+
+def _spill(chunk, spill_dir, table, buckets, season_of_match):
+    """Appends each row of a cleaned chunk to its (season, hash bucket) spill file; returns rows per file."""
+    bucket = pd.util.hash_pandas_object(chunk, index=False).to_numpy() % np.uint64(buckets)
+    seasons = _seasons_of(chunk, season_of_match)
+    keys = pd.DataFrame({"season": seasons, "bucket": bucket.astype(np.int64)})
+    written = {}
+    for (season, b), rows in keys.groupby(["season", "bucket"], sort=True).indices.items():
+        path = os.path.join(spill_dir, table, f"season={season}", f"bucket-{b:05d}.csv")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        chunk.iloc[rows].to_csv(path, mode="a", header=not os.path.exists(path), index=False)
+        written[path] = len(rows)
+    return written
+
+
+def _dedup_bucket(task):
+    """
+    Pass 2 for one spill file: exact duplicates (which always share a
+    bucket) dropped, first occurrence kept, written as a part of its
+    season partition, optionally with the season's matches joined on.
+    Returns (table, season_dir, rows_in, rows_out) for each part written.
+    """
+    spill, out_dir, table, merged_dir, matches_dir = task
+    schema = loader.MATCHES_SCHEMA if table == "matches" else loader.DELIVERIES_SCHEMA
+    rows = loader.read_csv_typed(spill, schema)
+    unique = rows.drop_duplicates(ignore_index=True)
+    season_dir = os.path.basename(os.path.dirname(spill))
+    part = os.path.basename(spill).replace("bucket-", "part-")
+    path = os.path.join(out_dir, table, season_dir, part)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    unique.to_csv(path, index=False)
+    counts = [(table, season_dir, len(rows), len(unique))]
+
+    if merged_dir and table == "deliveries":
+        matches_path = os.path.join(matches_dir, season_dir)
+        parts = sorted(os.listdir(matches_path)) if os.path.isdir(matches_path) else []
+        season_matches = loader.concat_frames([
+            loader.read_csv_typed(os.path.join(matches_path, name), loader.MATCHES_SCHEMA) for name in parts
+        ])
+        joined = unique.merge(season_matches, left_on="match_id", right_on="id", how="left") if parts else unique
+        merged_path = os.path.join(merged_dir, season_dir, part)
+        os.makedirs(os.path.dirname(merged_path), exist_ok=True)
+        joined.to_csv(merged_path, index=False)
+        counts.append(("merged", season_dir, len(unique), len(joined)))
+    os.remove(spill)
+    return counts
+
+
+def _tasks(spill_dir, out_dir, table, merged_dir):
+    root = os.path.join(spill_dir, table)
+    if not os.path.isdir(root):
+        return []
+    return [
+        (os.path.join(root, season_dir, name), out_dir, table, merged_dir, os.path.join(out_dir, "matches"))
+        for season_dir in sorted(os.listdir(root))
+        for name in sorted(os.listdir(os.path.join(root, season_dir)))
+    ]
+
+def default_buckets(*paths):
+    """Hash buckets per season so each holds about BUCKET_BYTES of source text."""
+    total = sum(os.path.getsize(path) for path in paths if path and os.path.exists(path))
+    return max(1, -(-total // BUCKET_BYTES))
+
+
+def preprocess(match_path=None, deliv_path=None, out_dir=None, chunksize=loader.CHUNK_ROWS,
+               buckets=None, workers=1, merged=False):
+    """
+    Cleans, deduplicates and season-partitions both sources into
+    `out_dir`/{matches,deliveries[,merged]}/season=YYYY/part-NNNNN.csv,
+    holding at most one chunk (pass 1) or one hash bucket per worker
+    (pass 2) in memory. Returns the manifest (rows in and out per table,
+    merged included, and season), also written to `out_dir`/manifest.json.
+    """
+    match_path, deliv_path = (
+        match_path or os.path.join(loader.DATA_DIR, loader.MATCHES_FILE),
+        deliv_path or os.path.join(loader.DATA_DIR, loader.DELIVERIES_FILE),
+    )
+    out_dir = out_dir or PREPROCESS_DIR
+    buckets = buckets or default_buckets(match_path, deliv_path)
+    workers = resolve_workers(workers)
+    os.makedirs(out_dir, exist_ok=True)
+    for table in TABLES:
+        shutil.rmtree(os.path.join(out_dir, table), ignore_errors=True)
+
+    manifest = {"buckets": buckets, "chunk_rows": chunksize, "tables": {}}
+    spill_dir = tempfile.mkdtemp(prefix=".spill-", dir=out_dir)
+    try:
+        # Pass 1 (matches): the id -> season lookup is the only state kept
+        # across chunks, one entry per match
+        season_of_match = {}
+        for chunk in loader.iter_csv_typed(match_path, loader.MATCHES_SCHEMA, chunksize):
+            chunk = clean_matches(chunk)
+            season_of_match.update(zip(chunk["id"].to_numpy(), chunk["season"].astype("string").to_numpy()))
+            _spill(chunk, spill_dir, "matches", 1, None)
+        # Matches first: the merged deliveries partitions read them
+        results = map_tasks(_dedup_bucket, _tasks(spill_dir, out_dir, "matches", None), workers)
+
+        season_of_match = pd.Series(season_of_match, dtype="string")
+        for chunk in loader.iter_csv_typed(deliv_path, loader.DELIVERIES_SCHEMA, chunksize):
+            _spill(clean_deliveries(chunk), spill_dir, "deliveries", buckets, season_of_match)
+        results += map_tasks(
+            _dedup_bucket,
+            _tasks(spill_dir, out_dir, "deliveries", os.path.join(out_dir, "merged") if merged else None),
+            workers
+        )
+    finally:
+        shutil.rmtree(spill_dir, ignore_errors=True)
+
+    for table, season_dir, rows_in, rows_out in (count for counts in results for count in counts):
+        seasons = manifest["tables"].setdefault(table, {})
+        counts = seasons.setdefault(season_dir.split("=", 1)[1], {"rows_in": 0, "rows_out": 0})
+        counts["rows_in"] += rows_in
+        counts["rows_out"] += rows_out
+    with open(os.path.join(out_dir, MANIFEST), "w", encoding="utf-8") as fh:
+        json.dump(manifest, fh, indent=2, sort_keys=True)
+    return manifest
+
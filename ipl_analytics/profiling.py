@@ -0,0 +1,87 @@
+import json
+import logging
+import os
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+
+# Stage records are logged as one JSON object per line on this logger.
+# IPL_PROFILE_LOG sends them to a file ("-" for stderr); unset, they only
+# reach whatever handlers the host application configured.
+PROFILE_LOG = os.environ.get("IPL_PROFILE_LOG")
+
+logger = logging.getLogger("ipl_analytics.profile")
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def configure_log(target=None):
+    """Attaches a JSON-lines handler for `target` (default PROFILE_LOG) once per process."""
+    target = target or PROFILE_LOG
+    if not target or any(getattr(h, "_ipl_profile", False) for h in logger.handlers):
+        return
+    handler = logging.StreamHandler(sys.stderr) if target == "-" else logging.FileHandler(target, encoding="utf-8")
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    handler._ipl_profile = True
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+
+
+def rss_bytes():
+    """Resident set size of this process, or None where it cannot be read cheaply."""
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open("/proc/self/statm", encoding="ascii") as fh:
+            return int(fh.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class RunProfiler:
+    """
+    Records wall time, rows processed and RSS delta for each named stage of
+    one run (a dashboard rerun, a batch job). Every finished stage is kept
+    in `records` and logged as a JSON line tagged with the run id.
+    """
+
+    def __init__(self, run_id=None, **context):
+        self.run_id = run_id or uuid.uuid4().hex[:12]
+        self.context = context
+        self.records = []
+
+    @contextmanager
+    def stage(self, name, rows=None):
+        """
+        Times the enclosed block. Yields the stage record, so `rows` can be
+        filled in once the block knows how much it processed.
+        """
+        record = {"stage": name, "rows": rows}
+        rss_before = rss_bytes()
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record["seconds"] = round(time.perf_counter() - start, 6)
+            rss_after = rss_bytes()
+            record["rss_mb"] = round(rss_after / 2**20, 1) if rss_after is not None else None
+            record["mem_delta_mb"] = (
+                round((rss_after - rss_before) / 2**20, 2)
+                if rss_after is not None and rss_before is not None else None
+            )
+            if record["rows"] is not None:
+                record["rows"] = int(record["rows"])
+            self.records.append(record)
+            self._log(record)
+
+    def _log(self, record):
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(json.dumps({"run_id": self.run_id, "ts": time.time(), **self.context, **record}))
+
+    def total_seconds(self):
+        return sum(record["seconds"] for record in self.records)
@@ -0,0 +1,87 @@
+"""
+Minimal local HTTP endpoint for batch outcome predictions.
+
+    GET  /predict?season=2024[&season=2023]   predictions for stored matches
+    POST /predict  {"matches": [{...}, ...]}  predictions for ad-hoc rows
+    GET  /health                              model version
+
+Every response carries the server-side latency and throughput.
+"""
+
+import json
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+
+
+def _timed_predict(model, matches):
+    start = time.perf_counter()
+    predictions = model.predict(matches)
+    elapsed = time.perf_counter() - start
+    return {
+        "model_version": model.version,
+        "rows": len(predictions),
+        "latency_ms": round(elapsed * 1000, 3),
+        "rows_per_s": round(len(predictions) / elapsed, 1) if elapsed > 0 else None,
+        "predictions": json.loads(predictions.to_json(orient="records")),
+    }
+
+
+def make_handler(engine, model):
+    class PredictionHandler(BaseHTTPRequestHandler):
+        def _send(self, status, payload):
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path == "/health":
+                self._send(200, {"status": "ok", "model_version": model.version})
+            elif url.path == "/predict":
+                try:
+                    seasons = [int(s) for s in parse_qs(url.query).get("season", [])]
+                except ValueError:
+                    self._send(400, {"error": "season must be an integer"})
+                    return
+                self._send(200, _timed_predict(model, engine.matches_for(seasons)))
+            else:
+                self._send(404, {"error": f"Unknown path {url.path}"})
+
+        def do_POST(self):
+            if urlparse(self.path).path != "/predict":
+                self._send(404, {"error": f"Unknown path {self.path}"})
+                return
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                rows = json.loads(self.rfile.read(length) or b"{}").get("matches", [])
+                self._send(200, _timed_predict(model, pd.DataFrame(rows)))
+            except (ValueError, AttributeError) as e:
+                self._send(400, {"error": str(e)})
+
+        def log_message(self, format, *args):
+            pass
+
+    return PredictionHandler
+
+
+def make_server(engine, model, host="127.0.0.1", port=8765):
+    """The bound (not yet serving) HTTP server; port 0 picks a free port."""
+    return ThreadingHTTPServer((host, port), make_handler(engine, model))
+
+
+def serve(engine, model, host="127.0.0.1", port=8765):
+    server = make_server(engine, model, host, port)
+    host, port = server.server_address[:2]
+    print(f"Serving outcome model {model.version} on http://{host}:{port}/predict")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,183 @@
+import numpy as np
+import pandas as pd
+
+from . import encoding as enc
+from .cube import bowler_wicket_mask, legal_ball_mask
+from .phases import PHASES, REGULATION_INNINGS, phase_of
+
+# --- SIMILAR PLAYERS ---
+# Every batter and bowler with enough career volume gets a vector of rate
+# statistics (strike rate, boundary and dot %, phase split, economy, ...).
+# Columns are z-scored so no single scale dominates, and the normalized
+# matrix is the nearest-neighbour index: a query is one matrix-vector
+# product against precomputed row norms.
+ROLES = ("batting", "bowling")
+MIN_BALLS = {"batting": 120, "bowling": 120}
+
+# Per (player, phase) counts each role's features are derived from
+BATTING_COUNTS = ["balls", "runs", "fours", "sixes", "dots", "outs"]
+BOWLING_COUNTS = ["balls", "runs", "wickets", "dots", "boundaries", "extras"]
+
+
+def _phase_counts(player_codes, phase, columns, n_players):
+    """Long (player, phase, *columns) frame from per-ball weights, one bincount per column."""
+    keep = player_codes >= 0
+    flat = player_codes[keep] * len(PHASES) + phase[keep]
+    size = n_players * len(PHASES)
+    counts = {
+        name: np.bincount(flat, weights=np.asarray(weight, dtype=np.float64)[keep], minlength=size).astype(np.int64)
+        for name, weight in columns.items()
+    }
+    p, ph = np.divmod(np.arange(size), len(PHASES))
+    frame = pd.DataFrame({"player": p, "phase": ph, **counts})
+    return frame[frame["balls"] > 0].reset_index(drop=True)
+
+
+def player_counts(deliveries, role):
+    """
+    Per (player, phase code) totals of regulation-innings balls for
+    `role`: batters' balls faced, runs, boundaries, dots and dismissals,
+    or bowlers' legal balls, runs conceded, wickets, dots, boundaries
+    conceded and wides / no-balls.
+    """
+    if role not in ROLES:
+        raise ValueError(f"Unknown role '{role}'; use one of {', '.join(ROLES)}.")
+    regular = deliveries["inning"].to_numpy() <= REGULATION_INNINGS
+    phase = phase_of(deliveries["over"].to_numpy())
+    players = deliveries["batter"].cat.categories
+    n_players = len(players)
+    runs = deliveries["batsman_runs"].to_numpy()
+    total = deliveries["total_runs"].to_numpy()
+    legal = legal_ball_mask(deliveries)
+
+    if role == "batting":
+        batter = np.where(regular, enc.codes(deliveries["batter"]), -1)
+        counts = _phase_counts(batter, phase, {
+            "balls": np.ones(len(runs)),
+            "runs": runs,
+            "fours": runs == 4,
+            "sixes": runs == 6,
+            "dots": runs == 0,
+        }, n_players)
+        # Dismissals are credited to whoever was out, not the striker
+        dismissed = np.where(regular, enc.codes(deliveries["player_dismissed"]), -1)
+        outs = _phase_counts(dismissed, phase, {"balls": np.ones(len(runs))}, n_players)
+        counts = counts.merge(outs.rename(columns={"balls": "outs"}), on=["player", "phase"], how="left")
+        counts["outs"] = counts["outs"].fillna(0).astype(np.int64)
+        counts["player"] = players[counts["player"]]
+        return counts[["player", "phase"] + BATTING_COUNTS]
+
+    bowler = np.where(regular, enc.codes(deliveries["bowler"]), -1)
+    counts = _phase_counts(bowler, phase, {
+        "balls": legal,
+        "runs": total,
+        "wickets": bowler_wicket_mask(deliveries),
+        "dots": legal & (total == 0),
+        "boundaries": (runs == 4) | (runs == 6),
+        "extras": ~legal,
+    }, n_players)
+    counts["player"] = players[counts["player"]]
+    return counts[["player", "phase"] + BOWLING_COUNTS]
+
+
+def _ratio(num, den, scale=1.0):
+    return np.where(den > 0, num * scale / np.where(den > 0, den, 1), 0.0)
+
+
+def player_features(counts, role, min_balls=None):
+    """
+    One row of rate features per player with at least `min_balls` (balls
+    faced / legal balls bowled), indexed by player name. Phase rates of a
+    player who never batted or bowled in a phase fall back to their overall
+    rate, so a missing phase does not look like an extreme one.
+    """
+    min_balls = MIN_BALLS[role] if min_balls is None else min_balls
+    wide = counts.pivot_table(index="player", columns="phase", values=counts.columns[2:].tolist(),
+                              aggfunc="sum", fill_value=0)
+    totals = {name: wide[name].sum(axis=1).to_numpy() for name in wide.columns.levels[0]}
+    keep = totals["balls"] >= min_balls
+    by_phase = {
+        name: wide[name].reindex(columns=range(len(PHASES)), fill_value=0).to_numpy()[keep]
+        for name in wide.columns.levels[0]
+    }
+    totals = {name: values[keep] for name, values in totals.items()}
+    balls, runs = totals["balls"], totals["runs"]
+
+    if role == "batting":
+        overall = _ratio(runs, balls, 100)
+        features = {
+            "strike_rate": overall,
+            "average": _ratio(runs, np.maximum(totals["outs"], 1)),
+            "boundary_pct": _ratio(totals["fours"] + totals["sixes"], balls, 100),
+            "six_share_pct": _ratio(totals["sixes"], totals["fours"] + totals["sixes"], 100),
+            "dot_pct": _ratio(totals["dots"], balls, 100),
+        }
+        phase_rate, rate_name = _ratio(by_phase["runs"], by_phase["balls"], 100), "strike_rate"
+    else:
+        overall = _ratio(runs, balls, 6)
+        features = {
+            "economy": overall,
+            "wicket_rate_pct": _ratio(totals["wickets"], balls, 100),
+            "dot_pct": _ratio(totals["dots"], balls, 100),
+            "boundary_pct": _ratio(totals["boundaries"], balls, 100),
+            "extras_pct": _ratio(totals["extras"], balls, 100),
+        }
+        phase_rate, rate_name = _ratio(by_phase["runs"], by_phase["balls"], 6), "economy"
+
+    for k, phase in enumerate(PHASES):
+        features[f"{phase}_share_pct"] = _ratio(by_phase["balls"][:, k], balls, 100)
+        features[f"{phase}_{rate_name}"] = np.where(by_phase["balls"][:, k] > 0, phase_rate[:, k], overall)
+    index = pd.Index(wide.index[keep], name="player")
+    frame = pd.DataFrame(features, index=index).round(2)
+    frame.insert(0, "balls", balls)
+    return frame
+
+
+class PlayerIndex:
+    """
+    Nearest-neighbour index over one role's player feature vectors: the
+    z-scored feature matrix with its squared row norms, so the k nearest
+    players to any indexed player come from one matrix-vector product.
+    """
+
+    def __init__(self, role, features):
+        self.role = role
+        self.features = features
+        values = features.drop(columns="balls").to_numpy(dtype=np.float64)
+        self.mean = values.mean(axis=0) if len(values) else np.zeros(values.shape[1])
+        std = values.std(axis=0) if len(values) else np.ones(values.shape[1])
+        self.std = np.where(std > 0, std, 1.0)
+        self.matrix = (values - self.mean) / self.std
+        self.norms = np.einsum("ij,ij->i", self.matrix, self.matrix)
+
+    @property
+    def players(self):
+        return self.features.index
+
+    def __contains__(self, player):
+        return player in self.features.index
+
+    def similar(self, player, k=5):
+        """
+        The `k` players closest to `player` (Euclidean distance between the
+        normalized vectors), nearest first, with their raw features.
+        Empty when `player` is not indexed (too few balls).
+        """
+        if player not in self.features.index:
+            return self.features.iloc[0:0].assign(distance=[]).reset_index()
+        row = self.features.index.get_loc(player)
+        query = self.matrix[row]
+        # |a - b|^2 = |a|^2 + |b|^2 - 2 a.b
+        dist = np.sqrt(np.maximum(self.norms + self.norms[row] - 2 * (self.matrix @ query), 0))
+        dist[row] = np.inf
+        k = min(k, len(dist) - 1)
+        if k <= 0:
+            return self.features.iloc[0:0].assign(distance=[]).reset_index()
+        nearest = np.argpartition(dist, k - 1)[:k]
+        nearest = nearest[np.argsort(dist[nearest], kind="stable")]
+        return self.features.iloc[nearest].assign(distance=dist[nearest].round(3)).reset_index()
+
+
+def build_player_index(deliveries, role, min_balls=None):
+    """PlayerIndex for `role` ("batting" or "bowling") over every indexed player's career."""
+    return PlayerIndex(role, player_features(player_counts(deliveries, role), role, min_balls))
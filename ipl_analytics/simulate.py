@@ -0,0 +1,251 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from .parallel import map_tasks, resolve_workers
+
+# --- SEASON SIMULATION ---
+# Every simulated season is one row of a (simulations x fixtures) array:
+# league results are drawn against the model's per-match probabilities,
+# the points table is a bincount, ties are broken by a net run rate proxy
+# and the top four play the IPL playoffs (Qualifier 1, Eliminator,
+# Qualifier 2, Final). Simulations run in fixed-size chunks, each with its
+# own seed spawned from the base seed, so a seed gives the same forecast
+# for any number of workers.
+CHUNK = 25_000
+PLAYOFF_TEAMS = 4
+WIN_POINTS, NO_RESULT_POINTS = 2, 1
+# Fixed results of fixtures already played (`state` below); UNPLAYED are drawn
+UNPLAYED, TEAM2_WON, TEAM1_WON, NO_RESULT = -1, 0, 1, 2
+# Toss scenarios a future fixture is averaged over (winner side, decision)
+TOSS_SCENARIOS = [("team1", "bat"), ("team1", "field"), ("team2", "bat"), ("team2", "field")]
+
+# Problem arrays shared with the pool's workers (inherited on fork)
+_shared = {}
+
+
+def league_fixtures(matches, season):
+    """League-stage fixtures of `season` (every match when there is no match_type)."""
+    rows = matches[matches["season"] == season]
+    if "match_type" in rows.columns:
+        rows = rows[rows["match_type"].astype(str) == "League"]
+    return rows
+
+
+def fixture_states(fixtures, as_of=None):
+    """
+    State of each fixture: its known result when it was played before
+    `as_of` (a date) and has a winner or no-result, else UNPLAYED. Without
+    `as_of` every fixture is simulated.
+    """
+    state = np.full(len(fixtures), UNPLAYED)
+    if as_of is None or "winner" not in fixtures.columns:
+        return state
+    played = (pd.to_datetime(fixtures["date"]) < pd.Timestamp(as_of)).to_numpy()
+    winner = fixtures["winner"].astype(object)
+    state[played & (winner == fixtures["team1"].astype(object)).to_numpy()] = TEAM1_WON
+    state[played & (winner == fixtures["team2"].astype(object)).to_numpy()] = TEAM2_WON
+    if "result" in fixtures.columns:
+        state[played & (fixtures["result"].astype(str) == "no result").to_numpy()] = NO_RESULT
+    return state
+
+
+def run_rate_margins(innings_phases_f):
+    """
+    Absolute run-rate gap between the two innings of every completed
+    match, the pool tiebreak margins are drawn from.
+    """
+    innings = innings_phases_f.groupby(["match_id", "inning"], observed=True)[["runs", "balls"]].sum()
+    innings = innings[innings["balls"] > 0]
+    rate = (innings["runs"] * 6 / innings["balls"]).unstack("inning")
+    if rate.shape[1] < 2:
+        return np.zeros(0)
+    return (rate.iloc[:, 0] - rate.iloc[:, 1]).abs().dropna().to_numpy()
+
+
+def _scenarios(pairs, season):
+    """`pairs` (team1, team2, venue) repeated once per toss scenario."""
+    frames = []
+    for side, decision in TOSS_SCENARIOS:
+        frames.append(pairs.assign(season=season, toss_winner=pairs[side], toss_decision=decision))
+    return pd.concat(frames, ignore_index=True)
+
+
+def match_probabilities(model, fixtures, teams, season, playoff_venue=None):
+    """
+    P(team1 wins) of each fixture and the team x team playoff matrix
+    (P[i, j] = P(teams[i] beats teams[j])), scored in one batch. Each
+    fixture is averaged over the four toss scenarios; each playoff pair
+    over both home sides as well, at `playoff_venue` (default: the venue
+    hosting the most fixtures).
+    """
+    teams = list(teams)
+    league = pd.DataFrame({
+        "team1": fixtures["team1"].astype(str).to_numpy(),
+        "team2": fixtures["team2"].astype(str).to_numpy(),
+        "venue": fixtures["venue"].astype(str).to_numpy(),
+    })
+    if playoff_venue is None:
+        playoff_venue = league["venue"].mode().iloc[0] if len(league) else ""
+    i, j = np.nonzero(~np.eye(len(teams), dtype=bool))
+    names = np.asarray(teams, dtype=object)
+    pairs = pd.DataFrame({"team1": names[i], "team2": names[j], "venue": playoff_venue})
+
+    batch = _scenarios(pd.concat([league, pairs], ignore_index=True), season)
+    p = model.win_probability(batch).reshape(len(TOSS_SCENARIOS), -1).mean(axis=0)
+
+    fixture_p = p[:len(league)]
+    home = np.full((len(teams), len(teams)), 0.5)
+    home[i, j] = p[len(league):]
+    # Average i-at-home with (1 - j-at-home) so the matrix is complementary
+    pairwise = (home + (1 - home.T)) / 2
+    np.fill_diagonal(pairwise, 0.5)
+    return fixture_p, pairwise
+
+
+def _chunk(args):
+    """Tallies of `n_sims` seasons drawn with `seed` (one pool task)."""
+    n_sims, seed = args
+    p = _shared["p"]
+    t1, t2, state = _shared["team1"], _shared["team2"], _shared["state"]
+    pairwise, margins, n_teams = _shared["pairwise"], _shared["margins"], _shared["n_teams"]
+    rng = np.random.default_rng(seed)
+    sims = np.arange(n_sims)[:, None]
+
+    # League: one uniform per (season, fixture); known results overwrite it
+    team1_won = rng.random((n_sims, len(p))) < p
+    team1_won[:, state == TEAM1_WON] = True
+    team1_won[:, state == TEAM2_WON] = False
+    decided = state != NO_RESULT
+    winner = np.where(team1_won, t1, t2)[:, decided]
+    loser = np.where(team1_won, t2, t1)[:, decided]
+
+    flat = n_sims * n_teams
+    wins = np.bincount((sims * n_teams + winner).ravel(), minlength=flat).reshape(n_sims, n_teams)
+    shared = np.bincount(np.r_[t1[~decided], t2[~decided]], minlength=n_teams) * NO_RESULT_POINTS
+    points = wins * WIN_POINTS + shared
+
+    # Net run rate proxy: winners gain, losers give up a historical margin
+    if len(margins):
+        margin = margins[rng.integers(len(margins), size=winner.shape)]
+    else:
+        margin = rng.random(winner.shape)
+    net = (
+        np.bincount((sims * n_teams + winner).ravel(), weights=margin.ravel(), minlength=flat)
+        - np.bincount((sims * n_teams + loser).ravel(), weights=margin.ravel(), minlength=flat)
+    ).reshape(n_sims, n_teams)
+
+    # Standings: points, then net run rate, then lots (lexsort's last key is primary)
+    order = np.lexsort((rng.random((n_sims, n_teams)), -net, -points))
+    positions = np.bincount(
+        (order * n_teams + np.arange(n_teams)).ravel(), minlength=n_teams * n_teams
+    ).reshape(n_teams, n_teams)
+
+    # Playoffs: Q1 (1 v 2), Eliminator (3 v 4), Q2 (Q1 loser v Eliminator winner), Final
+    first, second, third, fourth = (order[:, k] for k in range(PLAYOFF_TEAMS))
+
+    def play(a, b):
+        a_won = rng.random(n_sims) < pairwise[a, b]
+        return np.where(a_won, a, b), np.where(a_won, b, a)
+
+    q1_winner, q1_loser = play(first, second)
+    eliminator_winner, _ = play(third, fourth)
+    q2_winner, _ = play(q1_loser, eliminator_winner)
+    champion, runner_up = play(q1_winner, q2_winner)
+
+    max_points = WIN_POINTS * len(p)
+    points_hist = np.bincount(
+        (np.arange(n_teams) * (max_points + 1) + points).ravel(), minlength=n_teams * (max_points + 1)
+    ).reshape(n_teams, max_points + 1)
+    return {
+        "positions": positions,
+        "points": points_hist,
+        "finals": np.bincount(np.r_[champion, runner_up], minlength=n_teams),
+        "titles": np.bincount(champion, minlength=n_teams),
+    }
+
+
+def _merge(tallies):
+    return {key: sum(part[key] for part in tallies) for key in tallies[0]}
+
+
+def simulate_seasons(team1, team2, p, pairwise, n_sims, state=None, margins=None, seed=None, workers=1,
+                     chunk=CHUNK):
+    """
+    Tallies over `n_sims` simulated seasons of fixtures (team1[k] v
+    team2[k], team codes into the `pairwise` matrix, P(team1 wins) = p[k]):
+    `positions[team, rank]`, the `points[team, points]` histogram and
+    per-team `finals` and `titles` counts. Chunks run in a process pool
+    when `workers` > 1; results depend only on `seed` and `chunk`.
+    """
+    n_teams = len(pairwise)
+    if n_teams < PLAYOFF_TEAMS:
+        raise ValueError(f"Need at least {PLAYOFF_TEAMS} teams for the playoffs, got {n_teams}")
+    problem = {
+        "team1": np.asarray(team1, dtype=np.int64),
+        "team2": np.asarray(team2, dtype=np.int64),
+        "p": np.asarray(p, dtype=np.float64),
+        "state": np.full(len(p), UNPLAYED) if state is None else np.asarray(state),
+        "pairwise": np.asarray(pairwise, dtype=np.float64),
+        "margins": np.zeros(0) if margins is None else np.asarray(margins, dtype=np.float64),
+        "n_teams": n_teams,
+    }
+    sizes = [min(chunk, n_sims - start) for start in range(0, n_sims, chunk)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = list(zip(sizes, seeds))
+
+    try:
+        return _merge(map_tasks(
+            _chunk, tasks, resolve_workers(workers), initializer=_shared.update, initargs=(problem,)
+        ))
+    finally:
+        _shared.clear()
+
+
+def forecast_table(teams, tallies, n_sims):
+    """Per-team expected points and rank and playoff, top-two, final and title odds (%), best first."""
+    positions, points = tallies["positions"], tallies["points"]
+    ranks = np.arange(1, len(teams) + 1)
+    table = pd.DataFrame({
+        "team": list(teams),
+        "expected_points": (points @ np.arange(points.shape[1]) / n_sims).round(2),
+        "expected_rank": (positions @ ranks / n_sims).round(2),
+        "top_two_pct": (positions[:, :2].sum(axis=1) / n_sims * 100).round(2),
+        "playoffs_pct": (positions[:, :PLAYOFF_TEAMS].sum(axis=1) / n_sims * 100).round(2),
+        "final_pct": (tallies["finals"] / n_sims * 100).round(2),
+        "title_pct": (tallies["titles"] / n_sims * 100).round(2),
+    })
+    return table.sort_values(["title_pct", "playoffs_pct"], ascending=False, ignore_index=True)
+
+
+def forecast_season(model, fixtures, season, n_sims=100_000, seed=None, workers=1,
+                    margins=None, as_of=None, playoff_venue=None):
+    """
+    Playoff and title odds for the teams of `fixtures` (team1, team2,
+    venue[, date, winner, result]): probabilities from `model` in one
+    batch, then `n_sims` seasons simulated (see `simulate_seasons`).
+    """
+    teams = sorted(set(fixtures["team1"].astype(str)) | set(fixtures["team2"].astype(str)))
+    fixture_p, pairwise = match_probabilities(model, fixtures, teams, season, playoff_venue)
+    lookup = pd.Index(teams)
+    tallies = simulate_seasons(
+        lookup.get_indexer(fixtures["team1"].astype(str)),
+        lookup.get_indexer(fixtures["team2"].astype(str)),
+        fixture_p, pairwise, n_sims,
+        state=fixture_states(fixtures, as_of), margins=margins, seed=seed, workers=workers,
+    )
+    return forecast_table(teams, tallies, n_sims)
+
+
+def throughput(team1, team2, p, pairwise, sizes, seed=None, workers=1, repeat=3, **kwargs):
+    """[(n_sims, best seconds, simulated seasons per second)] for each of `sizes`."""
+    report = []
+    for n_sims in sizes:
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            simulate_seasons(team1, team2, p, pairwise, n_sims, seed=seed, workers=workers, **kwargs)
+            best = min(best, time.perf_counter() - start)
+        report.append((n_sims, best, n_sims / best))
+    return report
@@ -0,0 +1,611 @@
+import os
+import sqlite3
+import tempfile
+import threading
+
+import numpy as np
+import pandas as pd
+
+from . import cache, features, loader, outcome, phases, players, similar, simulate, stats
+from .cube import ILLEGAL_EXTRAS, NON_BOWLER_DISMISSALS, delivery_seasons
+from .memo import ResultCache, filter_key
+from .memory import MemoryLedger
+from .tensors import build_match_tensors
+
+# --- ON-DISK STORE ---
+# One SQLite file holds both tables, tagged with the dataset version it was
+# built from; every dashboard worker opens it read-only and shares it.
+SQL_PATH = os.environ.get("IPL_SQL_PATH", os.path.join(loader.DATA_DIR, "ipl.sqlite"))
+
+INDEXES = {
+    "matches": [["id"], ["season"], ["venue"]],
+    "deliveries": [["match_id"], ["season"], ["batter", "season"], ["bowler", "season"]],
+}
+
+# Predicates shared with cube.legal_ball_mask / cube.bowler_wicket_mask
+_ILLEGAL = ", ".join(f"'{kind}'" for kind in ILLEGAL_EXTRAS)
+_NON_BOWLER = ", ".join(f"'{kind}'" for kind in NON_BOWLER_DISMISSALS)
+LEGAL_BALL = f"(extras_type IS NULL OR extras_type NOT IN ({_ILLEGAL}))"
+BOWLER_WICKET = f"(is_wicket = 1 AND (dismissal_kind IS NULL OR dismissal_kind NOT IN ({_NON_BOWLER})))"
+# Phase code of a ball, as phases.phase_of
+PHASE = "CASE " + " ".join(
+    f"WHEN over < {start} THEN {code}" for code, start in enumerate(phases.PHASE_STARTS[1:])
+) + f" ELSE {len(phases.PHASES) - 1} END"
+
+
+def _sql_frame(df):
+    """Columns SQLite can store: categoricals as text, timestamps as ISO dates."""
+    out = pd.DataFrame(index=df.index)
+    for col in df.columns:
+        series = df[col]
+        if isinstance(series.dtype, pd.CategoricalDtype) or pd.api.types.is_string_dtype(series.dtype):
+            out[col] = series.astype(object).where(series.notna(), None)
+        elif pd.api.types.is_datetime64_any_dtype(series.dtype):
+            out[col] = series.dt.strftime("%Y-%m-%d").where(series.notna(), None)
+        else:
+            out[col] = series
+    return out
+
+
+def build_store(matches, deliveries, version, path=None):
+    """
+    Writes matches and deliveries (with each ball's season denormalised for
+    indexing) to a new SQLite file, then swaps it into place atomically.
+    """
+    path = path or SQL_PATH
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".sqlite.tmp")
+    os.close(fd)
+
+    season = delivery_seasons(matches, deliveries)
+    deliveries = deliveries.assign(season=np.where(season >= 0, season, None))
+    with sqlite3.connect(tmp_path) as conn:
+        for name, df in (("matches", matches), ("deliveries", deliveries)):
+            _sql_frame(df).to_sql(name, conn, index=False, chunksize=50_000)
+            for columns in INDEXES[name]:
+                conn.execute(
+                    f"CREATE INDEX idx_{name}_{'_'.join(columns)} ON {name} ({', '.join(columns)})"
+                )
+        conn.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+        conn.execute("INSERT INTO meta VALUES ('version', ?)", (version,))
+        conn.execute("ANALYZE")
+    conn.close()
+    os.chmod(tmp_path, 0o644)
+    os.replace(tmp_path, path)
+    return path
+
+
+class SQLStore:
+    """Read-only access to the SQLite store, one connection per thread."""
+
+    def __init__(self, path=None):
+        self.path = path or SQL_PATH
+        self._local = threading.local()
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+            self._local.conn = conn
+        return conn
+
+    def version(self):
+        if not os.path.exists(self.path):
+            return None
+        try:
+            row = self._conn().execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        except sqlite3.DatabaseError:
+            return None
+        return row[0] if row else None
+
+    def query(self, sql, params=()):
+        return pd.read_sql_query(sql, self._conn(), params=list(params))
+
+    def scalar(self, sql, params=()):
+        return self._conn().execute(sql, list(params)).fetchone()[0]
+
+    def columns(self, table):
+        return [row[1] for row in self._conn().execute(f"PRAGMA table_info({table})")]
+
+
+def open_store(match_path=None, deliv_path=None, path=None):
+    """
+    SQLStore for the current sources (plus ingested segments), rebuilt from
+    the Arrow cache when its recorded dataset version is out of date.
+    """
+    version = cache.dataset_version(match_path, deliv_path)
+    store = SQLStore(path)
+    if store.version() != version:
+        matches, deliveries = cache.load_cached_data(match_path, deliv_path)
+        build_store(matches, deliveries, version, store.path)
+        store = SQLStore(store.path)
+    return store
+
+
+def _season_filter(seasons, column="season"):
+    """(SQL condition, params) restricting `column` to `seasons` (no-op when empty)."""
+    if not seasons:
+        return "1 = 1", []
+    seasons = sorted(int(s) for s in seasons)
+    return f"{column} IN ({', '.join('?' * len(seasons))})", seasons
+
+
+class SQLEngine:
+    """
+    IPLEngine's query surface answered by SQL over the on-disk store:
+    season filters and aggregations run inside SQLite, so a process holds
+    only query results, and several workers can share one file.
+    Results are memoized per (version, seasons[, key]) like IPLEngine.
+    """
+
+    def __init__(self, store, version=None, result_cache=None):
+        self.store = store
+        self.version = version or store.version() or "sqlite"
+        self.results = result_cache if result_cache is not None else ResultCache()
+        self._outcome_model = None
+        self._score_model = None
+        self._auction = None
+        self._match_tensors = None
+        self._player_indexes = {}
+        # Only query results live in the process; the data stays on disk
+        self.memory = MemoryLedger()
+        self.memory.register("similarity", self._player_indexes)
+        self.memory.register("results", self.results)
+
+    @classmethod
+    def load(cls, match_path=None, deliv_path=None, result_cache=None, path=None):
+        store = open_store(match_path, deliv_path, path)
+        return cls(store, store.version(), result_cache)
+
+    def _cached(self, name, seasons, compute, extra=None):
+        key = ("sql", name) + filter_key(self.version, seasons, extra)
+        return self.results.get(key, compute)
+
+    # --- memory ---
+    def memory_report(self):
+        return self.memory.report()
+
+    def session_bytes(self, objects):
+        return self.memory.session_bytes(objects)
+
+    # --- filters ---
+    @property
+    def seasons(self):
+        return self._cached(
+            "seasons", None,
+            lambda: self.store.query("SELECT DISTINCT season FROM matches WHERE season IS NOT NULL ORDER BY season")
+            ["season"].astype(int).tolist()
+        )
+
+    @property
+    def teams(self):
+        return self._cached("teams", None, lambda: self.store.query(
+            "SELECT team1 AS team FROM matches UNION SELECT team2 FROM matches "
+            "UNION SELECT winner FROM matches WHERE winner IS NOT NULL ORDER BY team"
+        )["team"].tolist())
+
+    @property
+    def delivery_columns(self):
+        return [col for col in self.store.columns("deliveries") if col != "season"]
+
+    def delivery_count(self, seasons=None):
+        where, params = _season_filter(seasons)
+        return self._cached(
+            "delivery_count", seasons,
+            lambda: int(self.store.scalar(f"SELECT COUNT(*) FROM deliveries WHERE {where}", params))
+        )
+
+    def matches_for(self, seasons=None):
+        """Matches of `seasons` (all matches when empty), fetched with an indexed filter."""
+        def compute():
+            where, params = _season_filter(seasons)
+            matches = self.store.query(f"SELECT * FROM matches WHERE {where} ORDER BY rowid", params)
+            matches["date"] = pd.to_datetime(matches["date"], errors="coerce")
+            return matches
+        return self._cached("matches", seasons, compute)
+
+    def deliveries_for(self, seasons=None):
+        """Balls of `seasons`. Loads rows into memory: prefer the aggregate methods."""
+        where, params = _season_filter(seasons)
+        return self.store.query(f"SELECT * FROM deliveries WHERE {where} ORDER BY rowid", params)
+
+    # --- overview ---
+    def overview(self, seasons=None):
+        def compute():
+            where, params = _season_filter(seasons)
+            totals = self.store.query(
+                f"SELECT COUNT(*) AS matches, COUNT(DISTINCT season) AS seasons, "
+                f"COUNT(DISTINCT venue) AS venues FROM matches WHERE {where}", params
+            ).iloc[0]
+            return {
+                "totals": {key: int(value) for key, value in totals.items()},
+                "matches_per_season": self.store.query(
+                    f"SELECT season, COUNT(*) AS matches FROM matches WHERE {where} "
+                    f"GROUP BY season ORDER BY season", params
+                ).astype({"season": int}),
+                "toss_counts": self.store.query(
+                    f"SELECT toss_decision AS decision, COUNT(*) AS toss_count FROM matches "
+                    f"WHERE {where} AND toss_decision IS NOT NULL "
+                    f"GROUP BY toss_decision ORDER BY toss_count DESC", params
+                ),
+                "result_counts": self.store.query(
+                    f"SELECT result AS result_type, COUNT(*) AS result_count FROM matches "
+                    f"WHERE {where} AND result IS NOT NULL "
+                    f"GROUP BY result ORDER BY result_count DESC", params
+                ),
+            }
+        return self._cached("overview", seasons, compute)
+
+    def victory_margins(self, seasons=None):
+        def compute():
+            where, params = _season_filter(seasons)
+            margins = self.store.query(
+                f"SELECT result, result_margin FROM matches WHERE {where} "
+                f"AND result IN ('runs', 'wickets') AND result_margin > 0", params
+            )
+            return {
+                kind: stats.binned_counts(margins.loc[margins["result"] == kind, "result_margin"], bins)
+                for kind, bins in (("runs", 30), ("wickets", 10))
+            }
+        return self._cached("victory_margins", seasons, compute)
+
+    # --- teams & venues ---
+    def team_stats(self, seasons=None):
+        def compute():
+            where, params = _season_filter(seasons)
+            counts = self.store.query(
+                f"""
+                SELECT team,
+                       SUM(home) AS matches_home,
+                       SUM(away) AS matches_away,
+                       SUM(won) AS wins
+                FROM (
+                    SELECT team1 AS team, 1 AS home, 0 AS away, 0 AS won FROM matches WHERE {where}
+                    UNION ALL SELECT team2, 0, 1, 0 FROM matches WHERE {where}
+                    UNION ALL SELECT winner, 0, 0, 1 FROM matches WHERE {where} AND winner IS NOT NULL
+                )
+                GROUP BY team ORDER BY team
+                """, params * 3
+            )
+            return stats.team_table(
+                counts["team"], counts["matches_home"], counts["matches_away"], counts["wins"]
+            )
+        return self._cached("team_stats", seasons, compute)
+
+    def team_toss_tables(self, team, seasons=None):
+        def compute():
+            where, params = _season_filter(seasons)
+            base = f"FROM matches WHERE {where} AND toss_winner = ? AND (team1 = ? OR team2 = ?)"
+            args = params + [team, team, team]
+            decision_counts = self.store.query(
+                f"SELECT toss_decision AS decision, COUNT(*) AS count {base} "
+                f"GROUP BY toss_decision ORDER BY count DESC", args
+            )
+            toss_perf = self.store.query(
+                f"SELECT toss_decision, SUM(winner IS ? AND winner IS NOT NULL) AS Wins, "
+                f"COUNT(*) AS \"Total Matches\" {base} GROUP BY toss_decision ORDER BY toss_decision",
+                [team] + args
+            )
+            toss_perf["win_pct"] = (toss_perf["Wins"] / toss_perf["Total Matches"]) * 100
+            return decision_counts, toss_perf[["toss_decision", "Wins", "Total Matches", "win_pct"]]
+        return self._cached("team_toss", seasons, compute, extra=team)
+
+    def venue_stats(self, seasons=None):
+        where, params = _season_filter(seasons)
+        return self._cached("venue_match_count", seasons, lambda: self.store.query(
+            f"SELECT venue, COUNT(*) AS matches FROM matches WHERE {where} AND venue IS NOT NULL "
+            f"GROUP BY venue ORDER BY matches DESC", params
+        ))
+
+    def venue_team_wins(self, venue, seasons=None):
+        where, params = _season_filter(seasons)
+        return self._cached("venue_team_wins", seasons, lambda: self.store.query(
+            f"SELECT winner AS team, COUNT(*) AS wins_at_venue FROM matches "
+            f"WHERE {where} AND venue = ? AND winner IS NOT NULL "
+            f"GROUP BY winner ORDER BY wins_at_venue DESC", params + [venue]
+        ), extra=venue)
+
+    @property
+    def match_tensors(self):
+        """Per-season outcome tensors, built once from the (small) matches table."""
+        if self._match_tensors is None:
+            self._match_tensors = self.memory.register("aggregates", build_match_tensors(self.store.query(
+                "SELECT season, team1, team2, toss_winner, toss_decision, winner, venue, result FROM matches"
+            )))
+        return self._match_tensors
+
+    def head_to_head(self, seasons=None):
+        return self._cached("head_to_head", seasons, lambda: self.match_tensors.head_to_head(seasons))
+
+    def team_record(self, team, seasons=None):
+        return self._cached(
+            "team_record", seasons, lambda: self.match_tensors.team_record(team, seasons), extra=team
+        )
+
+    def toss_outcomes(self, seasons=None):
+        return self._cached("toss_outcomes", seasons, lambda: self.match_tensors.toss_outcomes(seasons))
+
+    def venue_results(self, seasons=None):
+        return self._cached("venue_results", seasons, lambda: self.match_tensors.venue_results(seasons))
+
+    # --- phases & partnerships ---
+    def _phase_frame(self, frame):
+        frame["phase"] = pd.Categorical.from_codes(frame["phase"], categories=phases.PHASES, ordered=True)
+        return frame
+
+    def innings_phases(self, seasons=None):
+        where, params = _season_filter(seasons)
+        return self._cached("innings_phases", seasons, lambda: self._phase_frame(self.store.query(
+            f"SELECT match_id, inning, COALESCE(season, -1) AS season, {PHASE} AS phase, "
+            f"MIN(batting_team) AS batting_team, MIN(bowling_team) AS bowling_team, "
+            f"SUM(total_runs) AS runs, SUM({LEGAL_BALL}) AS balls, "
+            f"SUM(player_dismissed IS NOT NULL) AS wickets, "
+            f"SUM(batsman_runs = 4) AS fours, SUM(batsman_runs = 6) AS sixes, "
+            f"SUM(total_runs = 0 AND {LEGAL_BALL}) AS dots "
+            f"FROM deliveries WHERE {where} AND inning <= {phases.REGULATION_INNINGS} "
+            f"GROUP BY match_id, inning, phase ORDER BY match_id, inning, phase", params
+        )))
+
+    def partnerships(self, seasons=None):
+        """Stands via a running count of earlier dismissals per innings (a window function)."""
+        where, params = _season_filter(seasons)
+        # The pair, season and team are bare columns next to the single MIN()
+        # aggregate, which SQLite takes from the stand's first ball
+        return self._cached("partnerships", seasons, lambda: self.store.query(
+            f"""
+            WITH balls AS MATERIALIZED (
+                SELECT match_id, inning, over, ball, season, batting_team, batter, non_striker,
+                       batsman_runs, total_runs, extras_type, player_dismissed,
+                       COALESCE(SUM(player_dismissed IS NOT NULL) OVER (
+                           PARTITION BY match_id, inning ORDER BY over, ball
+                           ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
+                       ), 0) AS stand
+                FROM deliveries WHERE {where} AND inning <= {phases.REGULATION_INNINGS}
+            ), stands AS (
+                SELECT match_id, inning, stand, MIN(over * 100 + ball) AS first_ball,
+                       COALESCE(season, -1) AS season, batting_team,
+                       MIN(batter, non_striker) AS batter_a, MAX(batter, non_striker) AS batter_b,
+                       SUM(total_runs) AS runs, SUM({LEGAL_BALL}) AS balls,
+                       SUM(player_dismissed IS NOT NULL) > 0 AS ended
+                FROM balls GROUP BY match_id, inning, stand
+            ), batter_runs AS (
+                SELECT match_id, inning, stand, batter, SUM(batsman_runs) AS runs
+                FROM balls GROUP BY match_id, inning, stand, batter
+            )
+            SELECT s.match_id, s.inning, s.season, s.batting_team, s.stand + 1 AS wicket,
+                   s.batter_a, s.batter_b, s.runs, s.balls,
+                   COALESCE(a.runs, 0) AS runs_a, COALESCE(b.runs, 0) AS runs_b, s.ended
+            FROM stands s
+            LEFT JOIN batter_runs a ON a.match_id = s.match_id AND a.inning = s.inning
+                                   AND a.stand = s.stand AND a.batter = s.batter_a
+            LEFT JOIN batter_runs b ON b.match_id = s.match_id AND b.inning = s.inning
+                                   AND b.stand = s.stand AND b.batter = s.batter_b
+            ORDER BY s.match_id, s.inning, s.stand
+            """, params
+        ).astype({"ended": bool}))
+
+    def batter_phases(self, seasons=None):
+        where, params = _season_filter(seasons)
+        base = f"FROM deliveries WHERE {where} AND inning <= {phases.REGULATION_INNINGS} AND season IS NOT NULL"
+        return self._cached("batter_phases", seasons, lambda: self._phase_frame(self.store.query(
+            f"SELECT season, player AS batter, phase, SUM(runs) AS runs, SUM(balls) AS balls, "
+            f"SUM(fours) AS fours, SUM(sixes) AS sixes, SUM(outs) AS outs FROM ("
+            f"SELECT season, batter AS player, {PHASE} AS phase, batsman_runs AS runs, 1 AS balls, "
+            f"batsman_runs = 4 AS fours, batsman_runs = 6 AS sixes, 0 AS outs {base} AND batter IS NOT NULL "
+            f"UNION ALL SELECT season, player_dismissed, {PHASE}, 0, 0, 0, 0, 1 "
+            f"{base} AND player_dismissed IS NOT NULL"
+            f") GROUP BY season, player, phase ORDER BY season, player, phase", params + params
+        )))
+
+    def phase_summary(self, seasons=None):
+        return self._cached("phase_summary", seasons, lambda: phases.phase_summary(self.innings_phases(seasons)))
+
+    def team_phases(self, seasons=None, side="batting_team"):
+        return self._cached(
+            "team_phases", seasons, lambda: phases.team_phases(self.innings_phases(seasons), side), extra=side
+        )
+
+    def batter_phase_table(self, phase, seasons=None, min_balls=60):
+        return self._cached(
+            "batter_phase", seasons,
+            lambda: phases.batter_phase_table(self.batter_phases(seasons), phase, min_balls),
+            extra=(phase, min_balls)
+        )
+
+    def wicket_partnerships(self, seasons=None):
+        return self._cached(
+            "wicket_partnerships", seasons, lambda: phases.wicket_partnerships(self.partnerships(seasons))
+        )
+
+    def top_partnerships(self, seasons=None, n=10):
+        return phases.top_partnerships(self.partnerships(seasons), n)
+
+    def pair_partnerships(self, seasons=None, min_stands=5):
+        return self._cached(
+            "pair_partnerships", seasons,
+            lambda: phases.pair_partnerships(self.partnerships(seasons), min_stands),
+            extra=min_stands
+        )
+
+    # --- players ---
+    def batter_runs(self, seasons=None):
+        where, params = _season_filter(seasons)
+        return self._cached("batter_runs", seasons, lambda: self.store.query(
+            f"SELECT batter, SUM(batsman_runs) AS batsman_runs, COUNT(*) AS balls, "
+            f"SUM(batsman_runs = 4) AS fours, SUM(batsman_runs = 6) AS sixes "
+            f"FROM deliveries WHERE {where} AND batter IS NOT NULL "
+            f"GROUP BY batter ORDER BY batsman_runs DESC, batter", params
+        ))
+
+    def bowler_wickets(self, seasons=None):
+        where, params = _season_filter(seasons)
+        return self._cached("bowler_wk", seasons, lambda: self.store.query(
+            f"SELECT bowler, SUM({LEGAL_BALL}) AS legal_balls, SUM(total_runs) AS runs_conceded, "
+            f"SUM({BOWLER_WICKET}) AS wickets_taken "
+            f"FROM deliveries WHERE {where} AND bowler IS NOT NULL "
+            f"GROUP BY bowler HAVING wickets_taken > 0 ORDER BY wickets_taken DESC, bowler", params
+        ))
+
+    def top_batters(self, seasons=None, n=10):
+        return self.batter_runs(seasons).head(n)
+
+    def top_bowlers(self, seasons=None, n=10):
+        return self.bowler_wickets(seasons).head(n)
+
+    def batter_profile(self, name, seasons=None):
+        where, params = _season_filter(seasons)
+        by_season = self.store.query(
+            f"SELECT season, SUM(batsman_runs) AS runs, COUNT(*) AS balls, "
+            f"SUM(batsman_runs = 4) AS fours, SUM(batsman_runs = 6) AS sixes "
+            f"FROM deliveries WHERE batter = ? AND {where} AND season IS NOT NULL "
+            f"GROUP BY season ORDER BY season", [name] + params
+        )
+        profile = {metric: int(by_season[metric].sum()) for metric in ["runs", "balls", "fours", "sixes"]}
+        balls = profile["balls"]
+        profile["strike_rate"] = round((profile["runs"] / balls) * 100, 2) if balls > 0 else 0
+        profile["season_runs"] = (
+            by_season[["season", "runs"]].rename(columns={"runs": "season_runs"}).reset_index(drop=True)
+        )
+        return profile
+
+    def bowler_profile(self, name, seasons=None):
+        where, params = _season_filter(seasons)
+        by_season = self.store.query(
+            f"SELECT season, SUM({LEGAL_BALL}) AS legal_balls, SUM(total_runs) AS runs_conceded, "
+            f"SUM({BOWLER_WICKET}) AS wickets "
+            f"FROM deliveries WHERE bowler = ? AND {where} AND season IS NOT NULL "
+            f"GROUP BY season ORDER BY season", [name] + params
+        )
+        profile = {metric: int(by_season[metric].sum()) for metric in ["legal_balls", "runs_conceded", "wickets"]}
+        overs = profile["legal_balls"] / 6 if profile["legal_balls"] > 0 else 0
+        profile["economy"] = round(profile["runs_conceded"] / overs, 2) if overs > 0 else 0
+        season_wickets = by_season[by_season["wickets"] > 0]
+        profile["season_wickets"] = (
+            season_wickets[["season", "wickets"]].rename(columns={"wickets": "season_wickets"}).reset_index(drop=True)
+        )
+        return profile
+
+    # --- similar players ---
+    def _player_counts(self, role):
+        """similar.player_counts as GROUP BY (player, phase) queries."""
+        regular = f"inning <= {phases.REGULATION_INNINGS}"
+        if role == "batting":
+            counts = self.store.query(
+                f"SELECT batter AS player, {PHASE} AS phase, COUNT(*) AS balls, SUM(batsman_runs) AS runs, "
+                f"SUM(batsman_runs = 4) AS fours, SUM(batsman_runs = 6) AS sixes, SUM(batsman_runs = 0) AS dots "
+                f"FROM deliveries WHERE {regular} AND batter IS NOT NULL GROUP BY player, phase"
+            )
+            outs = self.store.query(
+                f"SELECT player_dismissed AS player, {PHASE} AS phase, COUNT(*) AS outs "
+                f"FROM deliveries WHERE {regular} AND player_dismissed IS NOT NULL GROUP BY player, phase"
+            )
+            counts = counts.merge(outs, on=["player", "phase"], how="left")
+            counts["outs"] = counts["outs"].fillna(0).astype(np.int64)
+            return counts[["player", "phase"] + similar.BATTING_COUNTS]
+        if role not in similar.ROLES:
+            raise ValueError(f"Unknown role '{role}'; use one of {', '.join(similar.ROLES)}.")
+        counts = self.store.query(
+            f"SELECT bowler AS player, {PHASE} AS phase, SUM({LEGAL_BALL}) AS balls, SUM(total_runs) AS runs, "
+            f"SUM({BOWLER_WICKET}) AS wickets, SUM({LEGAL_BALL} AND total_runs = 0) AS dots, "
+            f"SUM(batsman_runs IN (4, 6)) AS boundaries, SUM(NOT {LEGAL_BALL}) AS extras "
+            f"FROM deliveries WHERE {regular} AND bowler IS NOT NULL GROUP BY player, phase"
+        )
+        return counts[counts["balls"] > 0][["player", "phase"] + similar.BOWLING_COUNTS]
+
+    def player_index(self, role):
+        if role not in self._player_indexes:
+            counts = self._player_counts(role)
+            self._player_indexes[role] = similar.PlayerIndex(role, similar.player_features(counts, role))
+        return self._player_indexes[role]
+
+    def similar_players(self, name, role, k=5):
+        return self._cached(
+            f"similar_{role}", None, lambda: self.player_index(role).similar(name, k), extra=(name, k)
+        )
+
+    # --- model features ---
+    def innings_features(self, seasons=None):
+        """Per-over totals in SQL, made cumulative by the same `features.accumulate` as the frame engine."""
+        where, params = _season_filter(seasons)
+        return self._cached("innings_features", seasons, lambda: features.accumulate(self.store.query(
+            f"SELECT match_id, inning, over, SUM(total_runs) AS runs, "
+            f"SUM(player_dismissed IS NOT NULL) AS wickets, SUM({LEGAL_BALL}) AS legal_balls, "
+            f"MIN(batting_team) AS batting_team, MIN(bowling_team) AS bowling_team "
+            f"FROM deliveries WHERE {where} GROUP BY match_id, inning, over ORDER BY match_id, inning, over", params
+        )))
+
+    @property
+    def score_model(self):
+        if self._score_model is None:
+            self._score_model = features.train_score_model(self.innings_features())
+        return self._score_model
+
+    # --- outcome model ---
+    @property
+    def outcome_model(self):
+        if self._outcome_model is None:
+            self._outcome_model = outcome.load_model() or False
+        return self._outcome_model or None
+
+    def predict_outcomes(self, seasons=None, model=None):
+        model = model or self.outcome_model
+        if model is None:
+            return None
+
+        def compute():
+            matches_f = self.matches_for(seasons)
+            predictions = model.predict(matches_f)
+            predictions["winner"] = matches_f["winner"].to_numpy()
+            return predictions
+        return self._cached("outcomes", seasons, compute, extra=model.version)
+
+    def season_forecast(self, season, n_sims=100_000, seed=None, as_of=None, workers=1, model=None):
+        model = model or self.outcome_model
+        if model is None:
+            return None
+
+        def compute():
+            return simulate.forecast_season(
+                model, simulate.league_fixtures(self.matches_for([season]), season), season, n_sims,
+                seed=seed, workers=workers, as_of=as_of,
+                margins=simulate.run_rate_margins(self.innings_phases()),
+            )
+        return self._cached("forecast", [season], compute, extra=(model.version, n_sims, seed, as_of))
+
+    # --- auction ---
+    def _appearances(self):
+        return players.appearance_sets(self.store.query(
+            "SELECT batter AS player, batting_team AS team, season FROM deliveries "
+            "WHERE batter IS NOT NULL AND season IS NOT NULL "
+            "UNION SELECT bowler, bowling_team, season FROM deliveries "
+            "WHERE bowler IS NOT NULL AND season IS NOT NULL"
+        ))
+
+    @property
+    def auction(self):
+        if self._auction is None:
+            names = self.store.query(
+                "SELECT batter AS player FROM deliveries WHERE batter IS NOT NULL "
+                "UNION SELECT bowler FROM deliveries WHERE bowler IS NOT NULL"
+            )["player"]
+            self._auction = players.load_auction_mapped(names, self._appearances, version=self.version) or False
+        return self._auction or None
+
+    def auction_value(self, seasons=None):
+        if self.auction is None:
+            return None
+        auction, mapping = self.auction
+        where, params = _season_filter(seasons)
+
+        def compute():
+            totals = self.store.query(
+                f"SELECT season, player, SUM(runs) AS runs, SUM(wickets) AS wickets FROM ("
+                f"SELECT season, batter AS player, batsman_runs AS runs, 0 AS wickets "
+                f"FROM deliveries WHERE {where} AND batter IS NOT NULL AND season IS NOT NULL "
+                f"UNION ALL SELECT season, bowler, 0, {BOWLER_WICKET} "
+                f"FROM deliveries WHERE {where} AND bowler IS NOT NULL AND season IS NOT NULL"
+                f") GROUP BY season, player", params + params
+            )
+            return players.auction_value(auction, mapping, totals, seasons)
+        return self._cached("auction_value", seasons, compute)
@@ -0,0 +1,160 @@
+"""
+Pure per-tab computations. Each function depends only on its arguments,
+so results can be memoized by the filter that produced those arguments.
+Returned frames may be shared between sessions: treat them as read-only.
+"""
+
+import numpy as np
+import pandas as pd
+
+from . import encoding as enc
+
+
+# ----------------------------------------------------------------------
+## Overview
+# ----------------------------------------------------------------------
+def overview_totals(matches_f):
+    """Headline counts for the Overview KPIs."""
+    return {
+        "matches": len(matches_f),
+        "seasons": matches_f["season"].nunique() if "season" in matches_f.columns else 0,
+        "venues": matches_f["venue"].nunique() if "venue" in matches_f.columns else 0,
+    }
+
+
+def matches_per_season(matches_f):
+    counts = (
+        matches_f.groupby("season", observed=True)["id"]
+        .count()
+        .reset_index()
+        .rename(columns={"id": "matches"})
+    )
+    # Ensure x-axis values are integers for display
+    counts["season"] = counts["season"].astype(int)
+    return counts
+
+
+def toss_decision_counts(matches_f):
+    counts = matches_f["toss_decision"].value_counts().reset_index()
+    counts.columns = ["decision", "toss_count"]
+    return counts
+
+
+def result_type_counts(matches_f):
+    counts = matches_f["result"].value_counts().reset_index()
+    counts.columns = ["result_type", "result_count"]
+    return counts
+
+
+def binned_counts(values, bins):
+    """
+    Histogram of `values` as (bin_start, bin_end, bin_mid, count) rows, so
+    a chart receives one row per bin instead of one per observation.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    values = values[~np.isnan(values)]
+    if len(values) == 0:
+        return pd.DataFrame({"bin_start": [], "bin_end": [], "bin_mid": [], "count": []})
+    counts, edges = np.histogram(values, bins=bins)
+    return pd.DataFrame({
+        "bin_start": edges[:-1],
+        "bin_end": edges[1:],
+        "bin_mid": (edges[:-1] + edges[1:]) / 2,
+        "count": counts,
+    })
+
+
+def victory_margin_bins(matches_f, kind, bins):
+    """Binned `result_margin` of matches won by `kind` ("runs" or "wickets")."""
+    margin = matches_f["result_margin"].to_numpy(dtype=np.float64, na_value=np.nan)
+    won = (matches_f["result"] == kind).to_numpy() & (margin > 0)
+    return binned_counts(margin[won], bins)
+
+
+# ----------------------------------------------------------------------
+## Teams & venues
+# ----------------------------------------------------------------------
+def team_stats(matches_f):
+    """Matches played, wins and win % per team, sorted by wins."""
+    # team1, team2 and winner share one team dictionary, so per-team counts
+    # are bincounts over the same codes and line up without any merge
+    return team_table(
+        matches_f["team1"].cat.categories,
+        enc.count_by_code(matches_f["team1"]),
+        enc.count_by_code(matches_f["team2"]),
+        enc.count_by_code(matches_f["winner"]),
+    )
+
+
+def team_table(teams, matches_home, matches_away, wins):
+    """The `team_stats` frame from per-team-code count arrays (e.g. merged shard partials)."""
+    stats = pd.DataFrame({
+        "team": teams,
+        "matches_home": matches_home,
+        "matches_away": matches_away,
+        "matches_played": matches_home + matches_away,
+        "wins": wins,
+    })
+    stats["win_pct"] = np.where(
+        stats["matches_played"] > 0,
+        (stats["wins"] / stats["matches_played"]) * 100,
+        0
+    )
+    stats = stats[stats["matches_played"] > 0]
+    return stats.sort_values("wins", ascending=False)
+
+
+def team_toss_tables(matches_f, team):
+    """
+    (toss decision counts, win % after winning the toss) for one team.
+    """
+    team_code = enc.code_of(matches_f["team1"], team)
+    played = (enc.codes(matches_f["team1"]) == team_code) | (enc.codes(matches_f["team2"]) == team_code)
+    toss_wins = matches_f[played & (enc.codes(matches_f["toss_winner"]) == team_code)]
+
+    decision_counts = toss_wins["toss_decision"].value_counts().reset_index()
+    decision_counts.columns = ["decision", "count"]
+
+    match_won = pd.Series(enc.codes(toss_wins["winner"]) == team_code, index=toss_wins.index)
+    toss_perf = match_won.groupby(toss_wins["toss_decision"], observed=True).agg(["sum", "count"]).reset_index()
+    toss_perf["win_pct"] = (toss_perf["sum"] / toss_perf["count"]) * 100
+    toss_perf = toss_perf.rename(columns={"sum": "Wins", "count": "Total Matches"})
+
+    return decision_counts, toss_perf
+
+
+def venue_match_count(matches_f):
+    return enc.decode(
+        matches_f["venue"].cat.categories,
+        enc.count_by_code(matches_f["venue"]),
+        "venue",
+        "matches"
+    ).sort_values("matches", ascending=False)
+
+
+def venue_team_wins(matches_f, venue):
+    venue_df = matches_f[enc.codes(matches_f["venue"]) == enc.code_of(matches_f["venue"], venue)]
+    return enc.decode(
+        venue_df["winner"].cat.categories,
+        enc.count_by_code(venue_df["winner"]),
+        "team",
+        "wins_at_venue"
+    ).sort_values("wins_at_venue", ascending=False)
+
+
+# ----------------------------------------------------------------------
+## Players
+# ----------------------------------------------------------------------
+def batter_runs(player_cube, seasons):
+    """Runs per batter over `seasons`, highest first."""
+    return (
+        player_cube.batting(seasons)
+        .rename(columns={"runs": "batsman_runs"})
+        .sort_values("batsman_runs", ascending=False)
+    )
+
+
+def bowler_wickets(player_cube, seasons):
+    """Wickets per wicket-taking bowler over `seasons`, highest first."""
+    wickets = player_cube.bowling(seasons).rename(columns={"wickets": "wickets_taken"})
+    return wickets[wickets["wickets_taken"] > 0].sort_values("wickets_taken", ascending=False)
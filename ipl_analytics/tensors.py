@@ -0,0 +1,205 @@
+import numpy as np
+import pandas as pd
+
+from . import encoding as enc
+from .stats import team_table
+
+# Last axis of `venue_results`: which innings the winner batted in, read
+# from the result type (ties and no-results count as neither)
+INNINGS_RESULTS = ["bat_first", "chase"]
+# Last axis of `toss`: what happened to the toss winner
+TOSS_OUTCOMES = ["won", "lost", "no_result"]
+
+
+def _labels(matches, columns):
+    """One sorted dictionary for `columns` (the shared categories when already encoded)."""
+    first = matches[columns[0]]
+    if isinstance(first.dtype, pd.CategoricalDtype):
+        return first.cat.categories
+    values = pd.concat([matches[col] for col in columns if col in matches.columns]).dropna().unique()
+    return pd.Index(sorted(values))
+
+
+def _codes_in(series, labels):
+    """Positions of `series` values in `labels` (-1 for missing or unknown)."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        lookup = labels.get_indexer(series.cat.categories)
+        c = enc.codes(series)
+        return np.where(c >= 0, lookup[np.maximum(c, 0)], -1)
+    return labels.get_indexer(series)
+
+
+class MatchTensors:
+    """
+    Dense per-season outcome counts of every match, built once at load:
+
+    - played[season, team1, team2] and wins[season, winner, loser]
+    - venue_matches[season, venue] and venue_wins[season, venue, team]
+    - venue_results[season, venue, INNINGS_RESULTS]
+    - toss[season, toss_winner, decision, TOSS_OUTCOMES]
+
+    Team, venue, toss and head-to-head views are slices of these summed
+    over the selected seasons, so they never touch the match rows again.
+    """
+
+    def __init__(self, seasons, teams, venues, decisions, arrays):
+        self.seasons = np.asarray(seasons)
+        self.teams = pd.Index(teams)
+        self.venues = pd.Index(venues)
+        self.decisions = pd.Index(decisions)
+        self.arrays = arrays
+
+    def _season_rows(self, seasons):
+        if seasons is None or len(seasons) == 0:
+            return np.ones(len(self.seasons), dtype=bool)
+        return np.isin(self.seasons, np.asarray(list(seasons), dtype=self.seasons.dtype))
+
+    def total(self, name, seasons=None):
+        """Tensor `name` summed over `seasons` (all seasons when empty)."""
+        return self.arrays[name][self._season_rows(seasons)].sum(axis=0)
+
+    # --- teams ---
+    def team_stats(self, seasons=None):
+        """Matches played, wins and win % per team, sorted by wins (as stats.team_stats)."""
+        played = self.total("played", seasons)
+        return team_table(
+            self.teams, played.sum(axis=1), played.sum(axis=0), self.total("wins", seasons).sum(axis=1)
+        )
+
+    def head_to_head(self, seasons=None):
+        """
+        (wins, played) team x team frames over the teams that played in
+        `seasons`: wins.loc[a, b] is how often a beat b.
+        """
+        played = self.total("played", seasons)
+        played = played + played.T
+        wins = self.total("wins", seasons)
+        present = np.flatnonzero(played.sum(axis=1) > 0)
+        teams = self.teams[present]
+        grid = np.ix_(present, present)
+        return (
+            pd.DataFrame(wins[grid], index=teams, columns=teams),
+            pd.DataFrame(played[grid], index=teams, columns=teams),
+        )
+
+    def team_record(self, team, seasons=None):
+        """Played, won, lost and win % of `team` against each opponent it met."""
+        wins, played = self.head_to_head(seasons)
+        if team not in wins.index:
+            return pd.DataFrame({"opponent": [], "played": [], "won": [], "lost": [], "win_pct": []})
+        record = pd.DataFrame({
+            "opponent": played.columns,
+            "played": played.loc[team].to_numpy(),
+            "won": wins.loc[team].to_numpy(),
+            "lost": wins[team].to_numpy(),
+        })
+        record = record[record["played"] > 0]
+        record["win_pct"] = record["won"] / record["played"] * 100
+        return record.sort_values("played", ascending=False, kind="stable")
+
+    # --- toss ---
+    def team_toss_tables(self, team, seasons=None):
+        """(toss decision counts, win % after winning the toss) for `team` (as stats.team_toss_tables)."""
+        code = int(self.teams.get_loc(team)) if team in self.teams else -1
+        toss = (
+            self.total("toss", seasons)[code] if code >= 0
+            else np.zeros((len(self.decisions), len(TOSS_OUTCOMES)), dtype=np.int64)
+        )
+        counts = toss.sum(axis=1)
+
+        decision_counts = pd.DataFrame({"decision": self.decisions, "count": counts})
+        decision_counts = decision_counts.sort_values("count", ascending=False, kind="stable")
+
+        made = counts > 0
+        toss_perf = pd.DataFrame({
+            "toss_decision": self.decisions[made],
+            "Wins": toss[made, 0],
+            "Total Matches": counts[made],
+        })
+        toss_perf["win_pct"] = (toss_perf["Wins"] / toss_perf["Total Matches"]) * 100
+        return decision_counts.reset_index(drop=True), toss_perf
+
+    def toss_outcomes(self, seasons=None):
+        """How often the toss winner went on to win, per toss decision, over all teams."""
+        toss = self.total("toss", seasons).sum(axis=0)
+        frame = pd.DataFrame(toss, columns=TOSS_OUTCOMES)
+        frame.insert(0, "decision", self.decisions)
+        decided = frame["won"] + frame["lost"]
+        frame["win_pct"] = np.where(decided > 0, frame["won"] * 100 / np.maximum(decided, 1), 0)
+        return frame
+
+    # --- venues ---
+    def venue_match_count(self, seasons=None):
+        """Matches per venue, most used first (as stats.venue_match_count)."""
+        return enc.decode(
+            self.venues, self.total("venue_matches", seasons), "venue", "matches"
+        ).sort_values("matches", ascending=False)
+
+    def venue_team_wins(self, venue, seasons=None):
+        """Wins per team at `venue` (as stats.venue_team_wins)."""
+        wins = (
+            self.total("venue_wins", seasons)[self.venues.get_loc(venue)] if venue in self.venues
+            else np.zeros(len(self.teams), dtype=np.int64)
+        )
+        return enc.decode(self.teams, wins, "team", "wins_at_venue").sort_values("wins_at_venue", ascending=False)
+
+    def venue_results(self, seasons=None):
+        """Matches, bat-first wins, chasing wins and bat-first win % per venue used in `seasons`."""
+        matches = self.total("venue_matches", seasons)
+        results = self.total("venue_results", seasons)
+        present = np.flatnonzero(matches > 0)
+        frame = pd.DataFrame({
+            "venue": self.venues[present],
+            "matches": matches[present],
+            "bat_first_wins": results[present, 0],
+            "chase_wins": results[present, 1],
+        })
+        decided = frame["bat_first_wins"] + frame["chase_wins"]
+        frame["bat_first_pct"] = np.where(decided > 0, frame["bat_first_wins"] * 100 / np.maximum(decided, 1), 0)
+        return frame.sort_values("matches", ascending=False, kind="stable")
+
+
+def build_match_tensors(matches):
+    """
+    Counts every match once into a MatchTensors. Works on shared-dictionary
+    categoricals (see encoding.encode_shared) or plain string columns.
+    """
+    season = matches["season"].to_numpy(dtype="float64", na_value=np.nan)
+    valid = ~np.isnan(season)
+    seasons = np.unique(season[valid]).astype(np.int32)
+    season_idx = np.searchsorted(seasons, np.where(valid, season, -1))
+
+    teams = _labels(matches, ["team1", "team2", "toss_winner", "winner"])
+    venues = _labels(matches, ["venue"])
+    decisions = _labels(matches, ["toss_decision"])
+    team1 = _codes_in(matches["team1"], teams)
+    team2 = _codes_in(matches["team2"], teams)
+    winner = _codes_in(matches["winner"], teams)
+    toss_winner = _codes_in(matches["toss_winner"], teams)
+    venue = _codes_in(matches["venue"], venues)
+    decision = _codes_in(matches["toss_decision"], decisions)
+    result = matches["result"].astype(object).to_numpy()
+
+    def count(shape, *idx, mask=None):
+        keep = valid.copy()
+        for i in idx:
+            keep &= i >= 0
+        if mask is not None:
+            keep &= mask
+        flat = np.ravel_multi_index([season_idx[keep]] + [i[keep] for i in idx], (len(seasons),) + shape)
+        return np.bincount(flat, minlength=len(seasons) * int(np.prod(shape))).reshape((len(seasons),) + shape)
+
+    n_teams, n_venues = len(teams), len(venues)
+    loser = np.where(winner == team1, team2, np.where(winner == team2, team1, -1))
+    innings = np.select([result == "runs", result == "wickets"], [0, 1], -1)
+    outcome = np.where(winner < 0, 2, np.where(winner == toss_winner, 0, 1))
+
+    arrays = {
+        "played": count((n_teams, n_teams), team1, team2),
+        "wins": count((n_teams, n_teams), winner, loser),
+        "venue_matches": count((n_venues,), venue),
+        "venue_wins": count((n_venues, n_teams), venue, winner),
+        "venue_results": count((n_venues, len(INNINGS_RESULTS)), venue, innings),
+        "toss": count((n_teams, len(decisions), len(TOSS_OUTCOMES)), toss_winner, decision, outcome),
+    }
+    return MatchTensors(seasons, teams, venues, decisions, arrays)
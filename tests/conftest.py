@@ -0,0 +1,85 @@
+import csv
+import os
+
+import pytest
+
+from ipl_analytics import cache, ingest, loader, players, sqlstore
+
+# Matches per season kept in the slice; a few seasons so season shards,
+# season filters and cross-season merges all have something to cut
+MATCHES_PER_SEASON = 4
+SEASONS = [2008, 2013, 2019, 2023]
+
+
+def _source_lines(file_path):
+    """Header and data lines of a bundled export, decompressed, in file order."""
+    with loader._open_binary(file_path) as raw:
+        text = raw.read().decode("utf-8-sig")
+    lines = text.splitlines(keepends=True)
+    return lines[0], lines[1:]
+
+
+def _row_id(line):
+    """First field of a line in the bundled (whole-row quoted) layout."""
+    return int(next(csv.reader([line]))[0].split(",", 1)[0])
+
+
+def write_lines(path, header, lines):
+    with open(path, "w", encoding="utf-8", newline="") as fh:
+        fh.write(header)
+        fh.writelines(lines)
+    return str(path)
+
+
+def pytest_addoption(parser):
+    parser.addoption("--request", action="append", default=[], help="Only run tests marked for this request id")
+
+
+def pytest_collection_modifyitems(config, items):
+    wanted = set(config.getoption("request"))
+    if not wanted:
+        return
+    selected, deselected = [], []
+    for item in items:
+        marker = item.get_closest_marker("request")
+        (selected if marker and marker.args[0] in wanted else deselected).append(item)
+    config.hook.pytest_deselected(items=deselected)
+    items[:] = selected
+
+
+@pytest.fixture(scope="session")
+def slice_ids():
+    matches = loader.load_matches()
+    picked = matches[matches["season"].isin(SEASONS)].groupby("season").head(MATCHES_PER_SEASON)
+    return picked["id"].tolist()
+
+
+@pytest.fixture(scope="session")
+def source_slice(tmp_path_factory, slice_ids):
+    """
+    (matches, deliveries) CSV paths holding the slice's rows exactly as
+    they appear in the bundled exports (same layout, header and quoting).
+    """
+    keep = set(slice_ids)
+    directory = tmp_path_factory.mktemp("source")
+    paths = []
+    for name in (loader.MATCHES_FILE, loader.DELIVERIES_FILE):
+        header, lines = _source_lines(os.path.join(loader.DATA_DIR, name))
+        rows = [line for line in lines if _row_id(line) in keep]
+        paths.append(write_lines(directory / name.replace(" ", "_"), header, rows))
+    return tuple(paths)
+
+
+@pytest.fixture(scope="session")
+def data(source_slice):
+    """The slice loaded and encoded as the app loads the full sources."""
+    return loader.load_data(*source_slice)
+
+
+@pytest.fixture(autouse=True)
+def isolated_stores(tmp_path, monkeypatch):
+    """Keeps the Arrow cache, ingest store, player map and SQLite file out of the repository."""
+    monkeypatch.setattr(cache, "CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(players, "PLAYER_MAP", None)
+    monkeypatch.setattr(ingest, "INGEST_DIR", str(tmp_path / "ingested"))
+    monkeypatch.setattr(sqlstore, "SQL_PATH", str(tmp_path / "ipl.sqlite"))
@@ -0,0 +1,25 @@
+import pandas as pd
+import pytest
+
+from ipl_analytics import cache, loader
+
+pytestmark = pytest.mark.request("user-002")
+
+
+def test_cache_hit_equals_the_parse_and_maps_numeric_columns(source_slice):
+    deliv_path = source_slice[1]
+    parsed = loader.load_deliveries(deliv_path)
+    cache.cached_table("deliveries", deliv_path, loader.load_deliveries)
+    hit = cache.cached_table("deliveries", deliv_path, loader.load_deliveries)
+
+    pd.testing.assert_frame_equal(hit, parsed)
+    for col in ["match_id", "over", "total_runs"]:
+        values = hit[col].to_numpy()
+        assert not values.flags.owndata and not values.flags.writeable, col
+    assert isinstance(hit["batter"].dtype, pd.CategoricalDtype)
+
+
+def test_cached_data_loads_like_the_sources(source_slice, data):
+    matches, deliveries = cache.load_cached_data(*source_slice)
+    pd.testing.assert_frame_equal(matches, data[0])
+    pd.testing.assert_frame_equal(deliveries, data[1])
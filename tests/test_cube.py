@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from ipl_analytics import cube
+
+pytestmark = pytest.mark.request("user-004")
+
+
+def _seasons(matches, deliveries):
+    return deliveries["match_id"].map(matches.set_index("id")["season"])
+
+
+def _flat(frame, keys):
+    """`frame` indexed by plain (non-categorical) `keys`, rows in key order."""
+    frame = frame.reset_index() if keys[0] not in frame.columns else frame
+    frame = frame.astype({key: object for key in keys if key != "season"})
+    return frame.sort_values(keys).set_index(keys)
+
+
+def test_batting_totals_match_groupby(data):
+    matches, deliveries = data
+    player_cube = cube.build_player_cube(matches, deliveries)
+    runs = deliveries["batsman_runs"]
+    expected = (
+        deliveries.assign(season=_seasons(matches, deliveries), fours=runs == 4, sixes=runs == 6)
+        .groupby(["season", "batter"], observed=True)
+        .agg(runs=("batsman_runs", "sum"), balls=("batsman_runs", "size"), fours=("fours", "sum"),
+             sixes=("sixes", "sum"))
+    )
+    totals = player_cube.season_totals(cube.BATTING_METRICS).rename(columns={"player": "batter"})
+    totals = totals[totals["balls"] > 0]
+    pd.testing.assert_frame_equal(
+        _flat(totals, ["season", "batter"]), _flat(expected.astype(np.int64), ["season", "batter"]),
+        check_index_type=False
+    )
+
+
+def test_bowling_totals_match_groupby(data):
+    matches, deliveries = data
+    player_cube = cube.build_player_cube(matches, deliveries)
+    expected = (
+        deliveries.assign(
+            legal_balls=cube.legal_ball_mask(deliveries),
+            wickets=cube.bowler_wicket_mask(deliveries),
+        )
+        .groupby("bowler", observed=True)
+        .agg(legal_balls=("legal_balls", "sum"), runs_conceded=("total_runs", "sum"), wickets=("wickets", "sum"))
+        .astype(np.int64)
+    )
+    pd.testing.assert_frame_equal(_flat(player_cube.bowling(), ["bowler"]), _flat(expected, ["bowler"]))
+
+
+def test_season_filter_sums_only_selected_seasons(data):
+    matches, deliveries = data
+    player_cube = cube.build_player_cube(matches, deliveries)
+    season = int(matches["season"].iloc[0])
+    ids = matches.loc[matches["season"] == season, "id"]
+    expected = deliveries[deliveries["match_id"].isin(ids)].groupby("batter", observed=True)["batsman_runs"].sum()
+    batting = _flat(player_cube.batting([season]), ["batter"])["runs"]
+    pd.testing.assert_series_equal(
+        batting, _flat(expected.astype(np.int64).rename("runs").to_frame(), ["batter"])["runs"]
+    )
+
+
+def test_merge_equals_one_cube_over_both_halves(data):
+    matches, deliveries = data
+    half = len(deliveries) // 2
+    merged = cube.build_player_cube(matches, deliveries.iloc[:half]).merge(
+        cube.build_player_cube(matches, deliveries.iloc[half:])
+    )
+    whole = cube.build_player_cube(matches, deliveries)
+    for metric in whole.metrics:
+        left = merged.season_totals([metric]).sort_values(["season", "player"], ignore_index=True)
+        right = whole.season_totals([metric]).sort_values(["season", "player"], ignore_index=True)
+        pd.testing.assert_frame_equal(left.astype({"player": object}), right.astype({"player": object}))
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from ipl_analytics import encoding, loader
+
+pytestmark = pytest.mark.request("user-003")
+
+
+def _slice():
+    matches = loader.load_matches().head(60)
+    deliveries = loader.load_deliveries()
+    deliveries = deliveries[deliveries["match_id"].isin(matches["id"])].reset_index(drop=True)
+    return matches, deliveries
+
+
+def test_domain_columns_share_one_dictionary():
+    matches, deliveries, dictionaries = encoding.encode_shared(*_slice())
+    for domain, columns_by_table in encoding.DOMAINS.items():
+        expected = dictionaries[domain].categories
+        for table_name, columns in columns_by_table.items():
+            table = matches if table_name == "matches" else deliveries
+            for col in columns:
+                if col in table.columns:
+                    assert table[col].cat.categories.equals(expected), col
+
+
+def test_equal_names_have_equal_codes_across_tables():
+    raw_matches, raw_deliveries = _slice()
+    matches, deliveries, _ = encoding.encode_shared(raw_matches, raw_deliveries)
+    assert matches["team1"].cat.categories.equals(deliveries["batting_team"].cat.categories)
+
+    categories = matches["team1"].cat.categories
+    pairs = [(matches["team1"], raw_matches["team1"]), (deliveries["batting_team"], raw_deliveries["batting_team"])]
+    for encoded, raw in pairs:
+        codes = encoding.codes(encoded)
+        # Every code decodes back to the original name
+        assert np.array_equal(np.asarray(categories)[codes], raw.astype(str).to_numpy())
+    for name in set(raw_matches["team1"].astype(str)) & set(raw_deliveries["batting_team"].astype(str)):
+        assert encoding.code_of(matches["team1"], name) == encoding.code_of(deliveries["batting_team"], name)
@@ -0,0 +1,55 @@
+import asyncio
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ipl_analytics import features, live, sqlstore
+from ipl_analytics.engine import IPLEngine
+
+pytestmark = pytest.mark.request("user-013")
+
+
+def _feature_frame(frame):
+    return frame.sort_values(features.KEYS).reset_index(drop=True)[features.KEYS + features.FEATURE_COLUMNS]
+
+
+def test_stream_over_by_over_equals_batch(data):
+    _, deliveries = data
+    stream = features.InningsFeatureStream()
+    # Every live match advances one over per update, as a feed delivers them
+    rows = [stream.update(over) for _, over in deliveries.groupby("over", sort=True, observed=True)]
+    pd.testing.assert_frame_equal(
+        _feature_frame(pd.concat(rows)), _feature_frame(features.innings_features(deliveries)), check_dtype=False
+    )
+
+
+def test_sql_features_equal_frame_features(data, tmp_path):
+    path = sqlstore.build_store(*data, "test", str(tmp_path / "ipl.sqlite"))
+    pd.testing.assert_frame_equal(
+        _feature_frame(sqlstore.SQLEngine(sqlstore.SQLStore(path)).innings_features()),
+        _feature_frame(IPLEngine(*data).innings_features()),
+        check_dtype=False,
+    )
+
+
+def test_live_projection_scores_the_training_rows(data, tmp_path):
+    _, deliveries = data
+    batch = features.innings_features(deliveries)
+    model = features.train_score_model(batch, n_estimators=10)
+
+    path = tmp_path / "feed.csv"
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write(",".join(live.FEED_COLUMNS) + "\n")
+        for row in deliveries[live.FEED_COLUMNS].to_dict("records"):
+            fh.write(live.format_ball(row))
+    feed = live.LiveFeed(str(path), push_interval=0, score_model=model)
+    asyncio.run(feed.run(max_balls=len(deliveries)))
+
+    # Each first innings' projection comes from its last streamed over (SCORE_OVERS)
+    last = batch[(batch["inning"] == 1) & (batch["over"] <= features.SCORE_OVERS)]
+    last = last.groupby(features.INNINGS).tail(1)
+    expected = np.round(model.predict(last[features.FEATURE_COLUMNS].to_numpy(dtype=np.float64))).astype(int)
+    projected = {(s["match_id"], s["inning"]): s["projected"] for s in feed.snapshot["innings"]}
+    assert [projected[(m, i)] for m, i in zip(last["match_id"], last["inning"])] == expected.tolist()
+    assert all(projected[key] is None for key in projected if key[1] != 1)
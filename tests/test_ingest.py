@@ -0,0 +1,115 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ipl_analytics import cache, cube, ingest, loader
+
+from conftest import _row_id, _source_lines, write_lines
+
+pytestmark = pytest.mark.request("user-007")
+
+
+@pytest.fixture
+def split(source_slice, tmp_path):
+    """
+    The slice cut into base sources (written in the export layout) and a
+    batch of its last two matches, as typed frames.
+    """
+    batch_ids = set(loader.load_matches(source_slice[0])["id"].tail(2))
+    base_paths = []
+    for path in source_slice:
+        header, lines = _source_lines(path)
+        base = [line for line in lines if _row_id(line) not in batch_ids]
+        base_paths.append(write_lines(tmp_path / f"base-{len(base_paths)}.csv", header, base))
+    batch_matches = loader.read_csv_typed(source_slice[0], loader.MATCHES_SCHEMA)
+    batch_deliveries = loader.read_csv_typed(source_slice[1], loader.DELIVERIES_SCHEMA)
+    return (
+        tuple(base_paths),
+        batch_matches[batch_matches["id"].isin(batch_ids)].reset_index(drop=True),
+        batch_deliveries[batch_deliveries["match_id"].isin(batch_ids)].reset_index(drop=True),
+    )
+
+
+def _cells(player_cube):
+    """Non-zero (season, player) cells of every metric, keyed by player name."""
+    frame = player_cube.season_totals(list(player_cube.metrics)).astype({"player": object})
+    return frame.sort_values(["season", "player"], ignore_index=True)
+
+
+def test_ingest_then_merge_equals_full_rebuild(split, source_slice, tmp_path):
+    (match_path, deliv_path), batch_matches, batch_deliveries = split
+    store = ingest.IngestStore(str(tmp_path / "store"))
+    version = ingest.ingest_batch(batch_matches, batch_deliveries, store, match_path, deliv_path)
+
+    assert version == cache.dataset_version(match_path, deliv_path, ingest_dir=store.directory)
+    merged = cache.load_cube(version)
+    assert merged is not None
+
+    matches, deliveries = cache.load_cached_data(match_path, deliv_path, ingest_dir=store.directory)
+    rebuilt = cube.build_player_cube(matches, deliveries)
+    pd.testing.assert_frame_equal(_cells(merged), _cells(rebuilt))
+    # ... and both equal the cube of the unsplit slice
+    pd.testing.assert_frame_equal(_cells(merged), _cells(cube.build_player_cube(*loader.load_data(*source_slice))))
+    assert np.array_equal(np.sort(matches["id"]), np.sort(loader.load_matches(source_slice[0])["id"]))
+
+
+def test_duplicate_batch_is_rejected(split, tmp_path):
+    (match_path, deliv_path), batch_matches, batch_deliveries = split
+    store = ingest.IngestStore(str(tmp_path / "store"))
+    version = ingest.ingest_batch(batch_matches, batch_deliveries, store, match_path, deliv_path)
+
+    with pytest.raises(ValueError, match="already ingested"):
+        ingest.ingest_batch(batch_matches, batch_deliveries, store, match_path, deliv_path)
+    assert len(store.segments()) == 1
+    assert cache.dataset_version(match_path, deliv_path, ingest_dir=store.directory) == version
+
+
+def test_orphan_deliveries_are_rejected(split, tmp_path):
+    (match_path, deliv_path), batch_matches, batch_deliveries = split
+    store = ingest.IngestStore(str(tmp_path / "store"))
+    with pytest.raises(ValueError, match="unknown match ids"):
+        ingest.ingest_batch(batch_matches.iloc[:1], batch_deliveries, store, match_path, deliv_path)
+    assert store.segments() == []
+
+
+def test_rewritten_segment_changes_the_version(split, tmp_path):
+    (match_path, deliv_path), batch_matches, batch_deliveries = split
+    store = ingest.IngestStore(str(tmp_path / "store"))
+    ingest.ingest_batch(batch_matches, batch_deliveries, store, match_path, deliv_path)
+
+    for table in ("matches", "deliveries"):
+        before = {key: cache.dataset_version(match_path, deliv_path, key, store.directory) for key in ("mtime", "sha256")}
+        path = os.path.join(store.directory, store.segments()[0][table])
+        frame = store.load_segments(table)[0]
+        # Same file name, different contents
+        cache.write_table_atomic(frame.iloc[:-1], path)
+        for key, version in before.items():
+            assert cache.dataset_version(match_path, deliv_path, key, store.directory) != version, (table, key)
+
+
+def test_build_cache_ignores_the_ingest_store(split, tmp_path, monkeypatch):
+    (match_path, deliv_path), batch_matches, batch_deliveries = split
+    store = ingest.IngestStore(str(tmp_path / "store"))
+    ingest.ingest_batch(batch_matches, batch_deliveries, store, match_path, deliv_path)
+    monkeypatch.setattr(ingest, "INGEST_DIR", store.directory)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("build_cache read the ingest store")
+
+    monkeypatch.setattr(ingest.IngestStore, "load_segments", fail)
+    paths = cache.build_cache(match_path, deliv_path, str(tmp_path / "fresh-cache"))
+    assert all(os.path.exists(path) for path in paths)
+
+
+def test_cubes_are_cached_per_version_outside_the_ingest_store(split, tmp_path):
+    (match_path, deliv_path), batch_matches, batch_deliveries = split
+    store = ingest.IngestStore(str(tmp_path / "store"))
+    old_version = cache.dataset_version(match_path, deliv_path, ingest_dir=store.directory)
+    cache.cached_cube(old_version, *cache.load_cached_data(match_path, deliv_path, ingest_dir=store.directory))
+    new_version = ingest.ingest_batch(batch_matches, batch_deliveries, store, match_path, deliv_path)
+
+    # Replicas still on the old version keep their cube after the ingest
+    assert cache.load_cube(old_version) is not None and cache.load_cube(new_version) is not None
+    assert not [name for name in os.listdir(store.directory) if name.endswith(".npz")]
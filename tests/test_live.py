@@ -0,0 +1,56 @@
+import asyncio
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ipl_analytics import cube, live
+
+pytestmark = pytest.mark.request("user-018")
+
+
+def _feed_file(deliveries, path):
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write(",".join(live.FEED_COLUMNS) + "\n")
+        for row in deliveries[live.FEED_COLUMNS].to_dict("records"):
+            fh.write(live.format_ball(row))
+    return str(path)
+
+
+def _expected_innings(deliveries):
+    return (
+        deliveries.assign(
+            wickets=deliveries["player_dismissed"].notna(),
+            legal_balls=cube.legal_ball_mask(deliveries),
+        )
+        .groupby(["match_id", "inning"])
+        .agg(runs=("total_runs", "sum"), wickets=("wickets", "sum"), legal_balls=("legal_balls", "sum"))
+        .astype(np.int64)
+    )
+
+
+def test_live_innings_totals_match_groupby(data, tmp_path):
+    _, deliveries = data
+    feed = live.LiveFeed(_feed_file(deliveries, tmp_path / "feed.csv"), push_interval=0)
+    asyncio.run(feed.run(max_balls=len(deliveries)))
+
+    snapshot = feed.snapshot
+    assert snapshot["balls"] == len(deliveries)
+    innings = pd.DataFrame(snapshot["innings"]).set_index(["match_id", "inning"])
+    expected = _expected_innings(deliveries)
+    pd.testing.assert_frame_equal(
+        innings[expected.columns].astype(np.int64).sort_index(), expected.sort_index(), check_index_type=False
+    )
+
+
+def test_live_player_totals_match_the_cube(data):
+    matches, deliveries = data
+    aggregates = live.LiveAggregates()
+    for row in deliveries[live.FEED_COLUMNS].to_dict("records"):
+        aggregates.update(live.parse_ball(live.format_ball(row)))
+
+    player_cube = cube.build_player_cube(matches, deliveries)
+    for name, stats in aggregates.batters.items():
+        assert player_cube.player_totals(name, cube.BATTING_METRICS) == stats, name
+    for name, stats in aggregates.bowlers.items():
+        assert player_cube.player_totals(name, cube.BOWLING_METRICS) == stats, name
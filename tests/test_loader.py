@@ -0,0 +1,47 @@
+import csv
+
+import pandas as pd
+import pytest
+
+from ipl_analytics import loader
+
+pytestmark = pytest.mark.request("user-001")
+
+
+def _unwrapped(path, out_path):
+    """The slice as ordinary CSV: every whole-row quoted line parsed down to its row text."""
+    with open(path, encoding="utf-8", newline="") as src, open(out_path, "w", encoding="utf-8", newline="") as out:
+        for fields in csv.reader(src):
+            out.write(fields[0] + "\n")
+    return out_path
+
+
+def _comparable(frame):
+    return frame.astype({
+        col: object for col in frame.columns if isinstance(frame[col].dtype, pd.CategoricalDtype)
+    })
+
+
+@pytest.mark.parametrize("table, schema", [(0, loader.MATCHES_SCHEMA), (1, loader.DELIVERIES_SCHEMA)])
+def test_typed_loader_matches_read_csv(source_slice, tmp_path, table, schema):
+    plain = _unwrapped(source_slice[table], tmp_path / "plain.csv")
+    expected = pd.read_csv(plain, dtype={col: dtype for col, dtype in schema.items() if dtype != "string"})
+    # Small chunks, so categoricals are unified across several of them
+    for path in (source_slice[table], plain):
+        loaded = loader.read_csv_typed(path, schema, chunksize=500)
+        assert list(loaded.dtypes.astype(str)) == list(expected.dtypes.astype(str))
+        pd.testing.assert_frame_equal(_comparable(loaded), _comparable(expected))
+
+
+def test_chunk_size_does_not_change_the_frame(source_slice):
+    whole = loader.read_csv_typed(source_slice[1], loader.DELIVERIES_SCHEMA)
+    chunked = loader.read_csv_typed(source_slice[1], loader.DELIVERIES_SCHEMA, chunksize=333)
+    pd.testing.assert_frame_equal(_comparable(chunked), _comparable(whole))
+
+
+def test_load_data_parses_dates_and_seasons(data):
+    matches, deliveries = data
+    assert pd.api.types.is_datetime64_any_dtype(matches["date"])
+    # '2007/08' is the 2008 season; the date is authoritative
+    assert (matches["season"] == matches["date"].dt.year).all()
+    assert deliveries["match_id"].isin(matches["id"]).all()
@@ -0,0 +1,76 @@
+import json
+import os
+import threading
+import urllib.request
+
+import numpy as np
+import pytest
+
+from ipl_analytics import outcome, service
+from ipl_analytics.engine import IPLEngine
+
+pytestmark = pytest.mark.request("user-012")
+
+
+@pytest.fixture(scope="module")
+def model(data):
+    return outcome.train_outcome_model(data[0], dataset_version="slice", n_estimators=20)
+
+
+def test_saved_model_round_trips_through_latest(model, data, tmp_path):
+    path = model.save(str(tmp_path))
+    loaded = outcome.load_model(str(tmp_path))
+    assert loaded.version == model.version
+    with open(tmp_path / outcome.LATEST, encoding="utf-8") as fh:
+        assert json.load(fh)["artifact"] == os.path.basename(path)
+
+    matches = outcome.training_frame(data[0])
+    expected = model.predict(matches)
+    got = loaded.predict(matches)
+    assert got["predicted_winner"].tolist() == expected["predicted_winner"].tolist()
+    assert np.allclose(got["confidence"], expected["confidence"])
+    assert set(got["predicted_winner"]) <= set(model.winner_classes)
+
+
+def test_nothing_trained_loads_none(tmp_path):
+    assert outcome.load_model(str(tmp_path)) is None
+
+
+def test_unseen_team_and_venue_encode_as_unseen(model, data):
+    matches = outcome.training_frame(data[0]).head(3).copy()
+    matches["team1"] = matches["team1"].astype(str)
+    matches["venue"] = matches["venue"].astype(str)
+    matches.loc[matches.index[0], "team1"] = "Expansion XI"
+    matches.loc[matches.index[1], "venue"] = "New Stadium"
+
+    X = model.encode(matches)
+    team1, venue = 1 + outcome.CATEGORICAL_FEATURES.index("team1"), 1 + outcome.CATEGORICAL_FEATURES.index("venue")
+    assert X[0, team1] == outcome.UNSEEN and X[1, venue] == outcome.UNSEEN
+    assert X[1, team1] >= 0 and X[0, venue] >= 0
+
+    predictions = model.predict(matches)
+    assert len(predictions) == 3
+    assert predictions["confidence"].between(0, 1).all()
+    assert 0 <= model.win_probability(matches)[0] <= 1
+
+
+def test_predict_endpoint_serves_stored_and_posted_matches(model, data):
+    server = service.make_server(IPLEngine(*data), model, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = "http://{}:{}/predict".format(*server.server_address[:2])
+    try:
+        with urllib.request.urlopen(f"{url}?season=2019") as response:
+            stored = json.load(response)
+        assert stored["model_version"] == model.version
+        assert stored["rows"] == int((data[0]["season"] == 2019).sum())
+
+        row = outcome.training_frame(data[0]).head(1)
+        body = json.dumps({"matches": json.loads(row[outcome.FEATURES + ["id"]].to_json(orient="records"))})
+        request = urllib.request.Request(url, data=body.encode(), headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(request) as response:
+            posted = json.load(response)
+        assert posted["predictions"][0]["predicted_winner"] == model.predict(row)["predicted_winner"].iloc[0]
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from ipl_analytics import cube, encoding, parallel
+
+pytestmark = pytest.mark.request("user-014")
+
+
+@pytest.mark.parametrize("by", parallel.SHARD_BY)
+@pytest.mark.parametrize("workers", [2, 3])
+def test_sharded_aggregate_is_exact(data, workers, by, monkeypatch):
+    # The slice is far below the default shard floor; shard it anyway
+    monkeypatch.setattr(parallel, "MIN_SHARD_ROWS", 1)
+    matches, deliveries = data
+    result = parallel.aggregate(matches, deliveries, workers=workers, by=by)
+    serial = cube.build_player_cube(matches, deliveries)
+
+    assert np.array_equal(result.player_cube.seasons, serial.seasons)
+    for metric, values in serial.metrics.items():
+        # Shard cubes are merged by player name; compare player by player
+        cols = result.player_cube.players.get_indexer(serial.players)
+        present = values.any(axis=0)
+        assert (cols[present] >= 0).all()
+        assert np.array_equal(result.player_cube.metrics[metric][:, cols[present]], values[:, present]), metric
+
+    assert np.array_equal(result.matches_home, encoding.count_by_code(matches["team1"]))
+    assert np.array_equal(result.matches_away, encoding.count_by_code(matches["team2"]))
+    assert np.array_equal(result.wins, encoding.count_by_code(matches["winner"]))
+
+
+def test_shards_never_split_a_season(data):
+    matches, deliveries = data
+    from ipl_analytics.index import build_delivery_index
+
+    index = build_delivery_index(matches, deliveries)
+    ranges = parallel.shard_ranges(index, 3, "season")
+    assert ranges[0][0] == 0 and ranges[-1][1] == len(index)
+    starts = set(index.season_starts.tolist()) | {len(index)}
+    assert all(end in starts for _, end in ranges)
+
+
+def _square(x):
+    return x * x
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_map_tasks_keeps_task_order(workers):
+    assert parallel.map_tasks(_square, list(range(7)), workers) == [x * x for x in range(7)]
+
+
+def test_small_inputs_are_not_sharded(monkeypatch):
+    monkeypatch.setattr(parallel, "MIN_SHARD_ROWS", 1000)
+    assert parallel.shard_count(999, 4) == 1
+    assert parallel.shard_count(2500, 4) == 2
+    assert parallel.shard_count(10_000, 4) == 4
@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from ipl_analytics import cube, phases
+
+pytestmark = pytest.mark.request("user-020")
+
+
+def test_innings_phase_totals_match_groupby(data):
+    matches, deliveries = data
+    table = phases.innings_phases(matches, deliveries)
+    regular = deliveries[deliveries["inning"] <= phases.REGULATION_INNINGS]
+    legal = cube.legal_ball_mask(regular)
+    expected = (
+        regular.assign(
+            phase=phases.phase_of(regular["over"].to_numpy()),
+            legal=legal,
+            wicket=regular["player_dismissed"].notna(),
+            four=regular["batsman_runs"] == 4,
+            six=regular["batsman_runs"] == 6,
+            dot=(regular["total_runs"] == 0) & legal,
+        )
+        .groupby(["match_id", "inning", "phase"])
+        .agg(runs=("total_runs", "sum"), balls=("legal", "sum"), wickets=("wicket", "sum"),
+             fours=("four", "sum"), sixes=("six", "sum"), dots=("dot", "sum"))
+        .astype(np.int64)
+    )
+    got = table.assign(phase=table["phase"].cat.codes).set_index(["match_id", "inning", "phase"])
+    pd.testing.assert_frame_equal(
+        got[expected.columns].sort_index(), expected.sort_index(), check_index_type=False
+    )
+
+
+def test_partnerships_add_up_to_innings_totals(data):
+    matches, deliveries = data
+    stands = phases.partnerships(matches, deliveries)
+    regular = deliveries[deliveries["inning"] <= phases.REGULATION_INNINGS]
+    expected = regular.groupby(["match_id", "inning"])["total_runs"].sum().astype(np.int64)
+    got = stands.groupby(["match_id", "inning"])["runs"].sum()
+    pd.testing.assert_series_equal(got, expected, check_names=False, check_index_type=False)
+    # Batters' shares never exceed the stand, and only the last stand of an innings may be unbroken
+    assert (stands["runs_a"] + stands["runs_b"] <= stands["runs"]).all()
+    assert (stands.groupby(["match_id", "inning"])["ended"].apply(lambda e: e.iloc[:-1].all())).all()
+
+
+def test_for_seasons_is_the_season_subset(data):
+    matches, deliveries = data
+    table = phases.innings_phases(matches, deliveries)
+    seasons = sorted(matches["season"].unique())[1:3]
+    subset = phases.for_seasons(table, seasons)
+    pd.testing.assert_frame_equal(
+        subset.reset_index(drop=True), table[table["season"].isin(seasons)].reset_index(drop=True)
+    )
@@ -0,0 +1,103 @@
+import os
+
+import pandas as pd
+import pytest
+
+from ipl_analytics import cache, players
+
+pytestmark = pytest.mark.request("user-017")
+
+# Deliveries names and where they played, as in the bundled data
+SEEN = {
+    "A Singh": {("Rajasthan Royals", season) for season in range(2009, 2013)},
+    "A Zampa": {("Rising Pune Supergiants", 2016)},
+    "AD Hales": {("Sunrisers Hyderabad", 2018)},
+}
+
+
+def _index():
+    return players.NameIndex(list(SEEN), SEEN)
+
+
+def test_initials_match_far_from_the_auction_year_is_rejected():
+    # Anunay Singh (RR 2022, never played) is not Amit Singh (RR 2009-2012)
+    assert _index().resolve("Anunay Singh", {("Rajasthan Royals", 2022)}) == (None, 0.99, "unmatched")
+
+
+def test_initials_match_needs_season_evidence():
+    assert _index().resolve("Adam Zampa")[2] == "unmatched"
+
+
+def test_initials_match_near_the_auction_year_is_accepted():
+    player, _, method = _index().resolve("Adam Zampa", {("Gujarat Lions", 2017)})
+    assert (player, method) == ("A Zampa", "nearby-season")
+
+
+def test_team_season_evidence_accepts_an_initials_match():
+    player, _, method = _index().resolve("Alex Hales", {("Sunrisers Hyderabad", 2018)})
+    assert (player, method) == ("AD Hales", "team-season")
+
+
+def test_exact_and_weak_matches():
+    index = players.NameIndex(["R Sharma", "RG Sharma"], {"RG Sharma": {("Mumbai Indians", 2013)}})
+    assert index.resolve("R Sharma") == ("R Sharma", 1.0, "exact")
+    assert index.resolve("Rohit Sharma", {("Mumbai Indians", 2013)})[::2] == ("RG Sharma", "team-season")
+
+
+def test_close_candidates_are_ambiguous():
+    index = players.NameIndex(["Mohammed Shami", "Mohammad Shami"], {})
+    assert index.resolve("Mohammud Shami")[::2] == (None, "ambiguous")
+
+
+def _auction(rows):
+    return pd.DataFrame(rows, columns=["Player", "Team", "Year"])
+
+
+def test_dissimilar_names_cannot_share_a_player_in_one_season():
+    seen = {"R Sharma": {("Mumbai Indians", 2015), ("Mumbai Indians", 2016)}}
+    auction = _auction([
+        ("Rohit Sharma", "Mumbai Indians", 2015),
+        ("Rohit Sharma", "Mumbai Indians", 2016),
+        ("Rahul Sharma", "Mumbai Indians", 2015),
+    ])
+    mapping = players.resolve_names(auction, list(seen), seen).set_index("auction_name")
+    assert mapping.loc["Rohit Sharma", "player"] == "R Sharma"
+    assert mapping.loc["Rahul Sharma", "method"] == "ambiguous"
+
+    # Bought in another season, the second claim has its own support
+    auction = auction.drop(index=1)
+    auction.loc[2, "Year"] = 2016
+    mapping = players.resolve_names(auction, list(seen), seen).set_index("auction_name")
+    assert mapping["player"].tolist() == ["R Sharma", "R Sharma"]
+
+
+def test_map_is_reused_per_version_and_resolved_again_on_a_new_one():
+    auction = _auction([("Adam Zampa", "Gujarat Lions", 2017)])
+    calls = []
+
+    def seen(names):
+        def appearances():
+            calls.append(names)
+            return {name: {("Rising Pune Supergiants", 2016)} for name in names}
+        return appearances
+
+    first = players.player_map(auction, [], seen([]), version="v1")
+    assert first["method"].tolist() == ["unmatched"]
+    assert os.path.exists(os.path.join(cache.CACHE_DIR, players.MAP_FILE))
+
+    players.player_map(auction, ["A Zampa"], seen(["A Zampa"]), version="v1")
+    assert len(calls) == 1
+
+    # The player's deliveries arrived with a new dataset version
+    second = players.player_map(auction, ["A Zampa"], seen(["A Zampa"]), version="v2")
+    assert second[["player", "version"]].values.tolist() == [["A Zampa", "v2"]]
+    assert len(calls) == 2
+
+
+def test_overrides_replace_resolved_rows(tmp_path):
+    overrides = tmp_path / "overrides.csv"
+    overrides.write_text("auction_name,player\nAnunay Singh,\nAdam Zampa,A Zampa\n")
+    auction = _auction([("Anunay Singh", "Rajasthan Royals", 2022), ("Adam Zampa", "Gujarat Lions", 2017)])
+    mapping = players.player_map(auction, list(SEEN), SEEN, version="v1", overrides=str(overrides))
+    assert mapping["method"].tolist() == ["manual", "manual"]
+    assert mapping.set_index("auction_name")["player"].isna().tolist() == [False, True]
@@ -0,0 +1,64 @@
+import glob
+import os
+
+import pandas as pd
+import pytest
+
+from ipl_analytics import loader, preprocess
+
+from conftest import _source_lines, write_lines
+
+pytestmark = pytest.mark.request("user-024")
+
+DUPLICATES = 300
+
+
+def _partitions(out_dir, table):
+    """Every row of a preprocessed table, order-independent."""
+    schema = loader.MATCHES_SCHEMA if table == "matches" else loader.DELIVERIES_SCHEMA
+    parts = sorted(glob.glob(os.path.join(out_dir, table, "season=*", "part-*.csv")))
+    frame = pd.concat([pd.read_csv(part, dtype=str) for part in parts], ignore_index=True)
+    return frame.sort_values([col for col in frame.columns if col in schema], ignore_index=True)
+
+
+def test_duplicates_across_chunks_are_dropped(source_slice, tmp_path):
+    match_path, deliv_path = source_slice
+    header, lines = _source_lines(deliv_path)
+    # The first rows again at the end of the file: chunks apart from their originals
+    doubled = write_lines(tmp_path / "doubled.csv", header, lines + lines[:DUPLICATES])
+
+    clean = preprocess.preprocess(match_path, deliv_path, str(tmp_path / "clean"), chunksize=500, buckets=3)
+    deduped = preprocess.preprocess(match_path, doubled, str(tmp_path / "deduped"), chunksize=500, buckets=3)
+
+    pd.testing.assert_frame_equal(
+        _partitions(tmp_path / "deduped", "deliveries"), _partitions(tmp_path / "clean", "deliveries")
+    )
+    seasons = deduped["tables"]["deliveries"].values()
+    assert sum(counts["rows_in"] for counts in seasons) == len(lines) + DUPLICATES
+    assert sum(counts["rows_out"] for counts in seasons) == len(lines)
+    assert clean["tables"]["matches"] == deduped["tables"]["matches"]
+
+
+def test_partitions_hold_one_season_each(source_slice, tmp_path):
+    manifest = preprocess.preprocess(*source_slice, str(tmp_path / "out"), chunksize=500, buckets=2)
+    matches = _partitions(tmp_path / "out", "matches")
+    for season, counts in manifest["tables"]["matches"].items():
+        parts = glob.glob(os.path.join(tmp_path, "out", "matches", f"season={season}", "*.csv"))
+        rows = pd.concat([pd.read_csv(part, dtype=str) for part in parts])
+        assert (rows["season"] == season).all()
+        assert len(rows) == counts["rows_out"]
+    assert len(matches) == len(loader.load_matches(source_slice[0]))
+
+
+def test_manifest_counts_merged_rows(source_slice, tmp_path):
+    manifest = preprocess.preprocess(*source_slice, str(tmp_path / "out"), chunksize=500, buckets=2, merged=True)
+    merged, deliveries = manifest["tables"]["merged"], manifest["tables"]["deliveries"]
+    assert merged.keys() == deliveries.keys()
+    for season, counts in merged.items():
+        assert counts["rows_in"] == counts["rows_out"] == deliveries[season]["rows_out"]
+    assert sum(counts["rows_out"] for counts in merged.values()) == len(_partitions(tmp_path / "out", "merged"))
+
+
+def test_team_names_follow_the_notebook():
+    assert preprocess.team_name("Delhi Daredevils") == "Delhi Capitals"
+    assert preprocess.team_name("Royal Challengers Bangalore") == "Royal Challengers Bangalore"
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from ipl_analytics import similar
+
+pytestmark = pytest.mark.request("user-023")
+
+# The slice is a few matches per season: a lower volume floor keeps enough players indexed
+MIN_BALLS = 20
+
+
+@pytest.fixture(scope="module", params=similar.ROLES)
+def index(request, data):
+    return similar.build_player_index(data[1], request.param, MIN_BALLS)
+
+
+def test_batting_features_match_groupby(data):
+    deliveries = data[1]
+    regular = deliveries[deliveries["inning"] <= 2]
+    totals = regular.groupby("batter", observed=True).agg(
+        balls=("batsman_runs", "size"),
+        runs=("batsman_runs", "sum"),
+        boundaries=("batsman_runs", lambda runs: runs.isin([4, 6]).sum()),
+    )
+    totals = totals[totals["balls"] >= MIN_BALLS].astype(np.int64)
+    features = similar.player_features(similar.player_counts(deliveries, "batting"), "batting", MIN_BALLS)
+
+    assert sorted(features.index.astype(str)) == sorted(totals.index.astype(str))
+    totals.index = totals.index.astype(str)
+    features.index = features.index.astype(str)
+    totals = totals.loc[features.index]
+    assert np.array_equal(features["balls"], totals["balls"])
+    assert np.allclose(features["strike_rate"], (totals["runs"] * 100 / totals["balls"]).round(2))
+    assert np.allclose(features["boundary_pct"], (totals["boundaries"] * 100 / totals["balls"]).round(2))
+
+
+def test_similar_equals_a_brute_force_distance_sort(index):
+    values = index.features.drop(columns="balls").to_numpy(dtype=np.float64)
+    std = values.std(axis=0)
+    normalized = (values - values.mean(axis=0)) / np.where(std > 0, std, 1)
+    names = index.players.astype(str)
+    assert len(names) > 6
+
+    for row, player in enumerate(index.players):
+        dist = np.sqrt(((normalized - normalized[row]) ** 2).sum(axis=1))
+        order = [i for i in np.argsort(dist, kind="stable") if i != row][:5]
+        got = index.similar(player, k=5)
+        assert np.allclose(got["distance"], dist[order].round(3), atol=1e-3), player
+        # ... and each is that player's own distance (ties may come back in either order)
+        assert np.allclose(dist[names.get_indexer(got["player"].astype(str))], got["distance"], atol=1e-3), player
+
+
+def test_unknown_player_has_no_neighbours(index):
+    assert index.similar("Not A Player").empty
+    assert len(index.similar(index.players[0], k=len(index.players) + 10)) == len(index.players) - 1
@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from ipl_analytics import simulate
+
+pytestmark = pytest.mark.request("user-022")
+
+N_TEAMS = 6
+
+
+@pytest.fixture(scope="module")
+def season():
+    """A double round robin of six teams with fixed, uneven win probabilities."""
+    rng = np.random.default_rng(7)
+    team1, team2 = np.nonzero(~np.eye(N_TEAMS, dtype=bool))
+    strength = rng.random(N_TEAMS)
+    p = strength[team1] / (strength[team1] + strength[team2])
+    pairwise = strength[:, None] / (strength[:, None] + strength[None, :])
+    return team1, team2, p, pairwise
+
+
+def _run(season, **kwargs):
+    team1, team2, p, pairwise = season
+    return simulate.simulate_seasons(team1, team2, p, pairwise, 5_000, seed=42, chunk=1_000, **kwargs)
+
+
+def test_pool_and_serial_runs_are_identical(season):
+    serial = _run(season, workers=1)
+    pooled = _run(season, workers=2)
+    assert serial.keys() == pooled.keys()
+    for key in serial:
+        assert np.array_equal(serial[key], pooled[key]), key
+
+
+def test_tallies_are_consistent(season):
+    tallies = _run(season)
+    n_sims = 5_000
+    # Every season has one team per rank, one champion and two finalists
+    assert (tallies["positions"].sum(axis=0) == n_sims).all()
+    assert (tallies["positions"].sum(axis=1) == n_sims).all()
+    assert tallies["titles"].sum() == n_sims
+    assert tallies["finals"].sum() == 2 * n_sims
+    assert (tallies["points"].sum(axis=1) == n_sims).all()
+
+
+def test_known_results_are_kept(season):
+    team1, team2, p, pairwise = season
+    # Team 0 wins every fixture it plays: always top of the table
+    state = np.full(len(p), simulate.UNPLAYED)
+    state[team1 == 0] = simulate.TEAM1_WON
+    state[team2 == 0] = simulate.TEAM2_WON
+    tallies = simulate.simulate_seasons(team1, team2, p, pairwise, 1_000, state=state, seed=1)
+    assert tallies["positions"][0, 0] == 1_000
+
+
+class StubModel:
+    """Win probabilities from fixed team strengths, whatever the venue or toss."""
+
+    def __init__(self, strength):
+        self.strength = strength
+
+    def win_probability(self, batch):
+        s1 = batch["team1"].map(self.strength).to_numpy(dtype=float)
+        s2 = batch["team2"].map(self.strength).to_numpy(dtype=float)
+        return s1 / (s1 + s2)
+
+
+@pytest.fixture(scope="module")
+def fixtures():
+    """A double round robin of four teams, the first half played on 1-6 April."""
+    names = ["A", "B", "C", "D"]
+    team1, team2 = np.nonzero(~np.eye(len(names), dtype=bool))
+    frame = pd.DataFrame({
+        "team1": np.asarray(names)[team1],
+        "team2": np.asarray(names)[team2],
+        "venue": "Ground",
+        "date": pd.date_range("2024-04-01", periods=len(team1)),
+        "result": "runs",
+    })
+    # D wins every match it plays; the rest go to team1
+    frame["winner"] = np.where(frame["team2"] == "D", "D", frame["team1"])
+    return frame
+
+
+def test_match_probabilities_come_from_the_model(fixtures):
+    model = StubModel({"A": 4.0, "B": 3.0, "C": 2.0, "D": 1.0})
+    teams = ["A", "B", "C", "D"]
+    fixture_p, pairwise = simulate.match_probabilities(model, fixtures, teams, 2024)
+    expected = model.win_probability(fixtures)
+    assert np.allclose(fixture_p, expected)
+    assert np.allclose(pairwise + pairwise.T, 1)
+    assert pairwise[0, 3] == pytest.approx(0.8)
+
+
+def test_forecast_keeps_results_played_before_as_of(fixtures):
+    # The model rates D weakest, but D won every one of its (all played) fixtures
+    model = StubModel({"A": 4.0, "B": 3.0, "C": 2.0, "D": 1.0})
+    after = fixtures["date"].max() + pd.Timedelta(days=1)
+    forecast = simulate.forecast_season(model, fixtures, 2024, 2_000, seed=0, as_of=after).set_index("team")
+    assert forecast.loc["D", "top_two_pct"] == 100
+    assert forecast.loc["D", "expected_rank"] == 1
+    # Without as_of every fixture is drawn from the model: D rarely tops the table
+    drawn = simulate.forecast_season(model, fixtures, 2024, 2_000, seed=0).set_index("team")
+    assert drawn.loc["D", "expected_rank"] > 2
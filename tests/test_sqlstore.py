@@ -0,0 +1,73 @@
+import pandas as pd
+import pytest
+
+from ipl_analytics import sqlstore
+from ipl_analytics.engine import IPLEngine
+
+pytestmark = pytest.mark.request("user-016")
+
+
+@pytest.fixture(scope="module")
+def engines(data, tmp_path_factory):
+    matches, deliveries = data
+    path = sqlstore.build_store(matches, deliveries, "test", str(tmp_path_factory.mktemp("sql") / "ipl.sqlite"))
+    return IPLEngine(matches, deliveries), sqlstore.SQLEngine(sqlstore.SQLStore(path))
+
+
+def _comparable(frame):
+    """Row order, index and dtype differences removed (categories / strings as objects, numbers as floats)."""
+    frame = frame.reset_index(drop=True)
+    frame = frame.astype({
+        col: (float if pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype) else object)
+        for col, dtype in frame.dtypes.items()
+    })
+    return frame.sort_values(list(frame.columns), ignore_index=True)
+
+
+def _assert_same(pandas_result, sql_result):
+    if isinstance(pandas_result, dict):
+        assert pandas_result.keys() == sql_result.keys()
+        for key in pandas_result:
+            _assert_same(pandas_result[key], sql_result[key])
+        return
+    pd.testing.assert_frame_equal(_comparable(pandas_result), _comparable(sql_result), check_dtype=False)
+
+
+QUERIES = [
+    ("team_stats", {}),
+    ("victory_margins", {}),
+    ("venue_stats", {}),
+    ("batter_runs", {}),
+    ("bowler_wickets", {}),
+    ("innings_phases", {}),
+    ("batter_phases", {}),
+    ("phase_summary", {}),
+    ("team_phases", {}),
+    ("wicket_partnerships", {}),
+    ("pair_partnerships", {"min_stands": 1}),
+]
+
+
+@pytest.mark.parametrize("name, kwargs", QUERIES, ids=[name for name, _ in QUERIES])
+@pytest.mark.parametrize("seasons", [None, (2013, 2023)], ids=["all", "filtered"])
+def test_sql_engine_matches_pandas_engine(engines, name, kwargs, seasons):
+    pandas_engine, sql_engine = engines
+    _assert_same(
+        getattr(pandas_engine, name)(seasons=seasons, **kwargs), getattr(sql_engine, name)(seasons=seasons, **kwargs)
+    )
+
+
+@pytest.mark.parametrize("seasons", [None, (2008, 2019)], ids=["all", "filtered"])
+def test_partnerships_match(engines, seasons):
+    # The SQL stands take their pair, season and team from SQLite's bare
+    # columns next to MIN(); every stand must still match the segment reduction
+    pandas_engine, sql_engine = engines
+    _assert_same(pandas_engine.partnerships(seasons), sql_engine.partnerships(seasons))
+
+
+def test_overview_matches(engines):
+    pandas_engine, sql_engine = engines
+    expected, got = pandas_engine.overview(), sql_engine.overview()
+    assert expected["totals"] == got["totals"]
+    for key in ("matches_per_season", "toss_counts", "result_counts"):
+        _assert_same(expected[key], got[key])
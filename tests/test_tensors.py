@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from ipl_analytics import stats, tensors
+
+pytestmark = pytest.mark.request("user-019")
+
+SELECTIONS = [None, [2013], [2008, 2023]]
+
+
+@pytest.fixture(scope="module")
+def match_tensors(data):
+    return tensors.build_match_tensors(data[0])
+
+
+def _filtered(matches, seasons):
+    return matches if not seasons else matches[matches["season"].isin(seasons)]
+
+
+def _nonzero(frame, key, value):
+    """{key: value} for rows with a non-zero value, keys as strings."""
+    frame = frame[frame[value] > 0]
+    return dict(zip(frame[key].astype(str), frame[value].astype(np.int64)))
+
+
+@pytest.mark.parametrize("seasons", SELECTIONS)
+def test_team_stats_match_the_frame_path(match_tensors, data, seasons):
+    expected = stats.team_stats(_filtered(data[0], seasons))
+    got = match_tensors.team_stats(seasons)
+    columns = ["matches_home", "matches_away", "matches_played", "wins", "win_pct"]
+
+    def by_team(frame):
+        return frame.assign(team=frame["team"].astype(str)).set_index("team")[columns].astype(float).sort_index()
+
+    pd.testing.assert_frame_equal(by_team(got), by_team(expected))
+
+
+@pytest.mark.parametrize("seasons", SELECTIONS)
+def test_toss_tables_match_the_frame_path(match_tensors, data, seasons):
+    matches_f = _filtered(data[0], seasons)
+    for team in matches_f["toss_winner"].dropna().astype(str).unique():
+        expected_counts, expected_perf = stats.team_toss_tables(matches_f, team)
+        got_counts, got_perf = match_tensors.team_toss_tables(team, seasons)
+        assert _nonzero(got_counts, "decision", "count") == _nonzero(expected_counts, "decision", "count"), team
+        for value in ["Wins", "Total Matches"]:
+            assert _nonzero(got_perf, "toss_decision", value) == _nonzero(expected_perf, "toss_decision", value), team
+
+
+@pytest.mark.parametrize("seasons", SELECTIONS)
+def test_venue_views_match_the_frame_path(match_tensors, data, seasons):
+    matches_f = _filtered(data[0], seasons)
+    assert _nonzero(match_tensors.venue_match_count(seasons), "venue", "matches") == _nonzero(
+        stats.venue_match_count(matches_f), "venue", "matches"
+    )
+    for venue in matches_f["venue"].dropna().astype(str).unique():
+        assert _nonzero(match_tensors.venue_team_wins(venue, seasons), "team", "wins_at_venue") == _nonzero(
+            stats.venue_team_wins(matches_f, venue), "team", "wins_at_venue"
+        ), venue
+
+
+@pytest.mark.parametrize("seasons", SELECTIONS)
+def test_head_to_head_counts_every_pairing(match_tensors, data, seasons):
+    matches_f = _filtered(data[0], seasons)
+    wins, played = match_tensors.head_to_head(seasons)
+    team1, team2 = matches_f["team1"].astype(str), matches_f["team2"].astype(str)
+    winner = matches_f["winner"].astype(object)
+    for a, b in {tuple(sorted(pair)) for pair in zip(team1, team2)}:
+        meetings = ((team1 == a) & (team2 == b)) | ((team1 == b) & (team2 == a))
+        assert played.loc[a, b] == played.loc[b, a] == meetings.sum()
+        assert wins.loc[a, b] == (meetings & (winner == a)).sum()
+        assert wins.loc[b, a] == (meetings & (winner == b)).sum()